@@ -9,3 +9,25 @@ class AbstractTimeSeriesGenerator(ABC):
             Abstract method to generate a time series
         """
         pass
+
+    @abstractmethod
+    def generate_batch(self, n, plan=None):
+        """
+            Abstract method to generate several time series at once
+        Args:
+            n: the number of time series to generate.
+            plan: the configurations of the time series, drawn by the configuration manager if not given.
+        """
+        pass
+
+    @abstractmethod
+    def generate_time_series_window(self, first_point, last_point, config=None, seed=None):
+        """
+            Abstract method to generate a window of a time series without generating the points before it
+        Args:
+            first_point: the position of the first point of the window.
+            last_point: the position after the last point of the window.
+            config: the configuration of the time series.
+            seed: the seed of the time series.
+        """
+        pass
@@ -0,0 +1,187 @@
+import copy
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from data_producer import DataProducer
+from configuration_manager import ConfigurationManager
+
+_END_OF_CHUNKS = object()
+
+
+class BackgroundDataProducer(DataProducer):
+    """
+        Wraps a data producer so that its writes run on a background thread, overlapping the generation of the
+        next time series with the write of the previous one. At most max_pending writes can be queued, after
+        which produce_data blocks until the writer catches up. A failed write is raised by the next call to
+        produce_data, produce_chunks, flush or generate_metadata_file.
+    """
+
+    def __init__(self, data_producer: DataProducer, max_pending: int = 4):
+        super().__init__()
+        self.__data_producer = data_producer
+        self.__max_pending = max_pending
+        self.__slots = threading.BoundedSemaphore(max_pending)
+        self.__pending = deque()
+        self.__error = None
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='data-producer')
+
+    @property
+    def data_producer(self):
+        return self.__data_producer
+
+    @property
+    def metadata(self):
+        return self.__data_producer.metadata
+
+    @metadata.setter
+    def metadata(self, value):
+        self.__data_producer.metadata = value
+
+    @property
+    def profiler(self):
+        return self.__data_producer.profiler
+
+    @profiler.setter
+    def profiler(self, value):
+        self.__data_producer.profiler = value
+
+    @property
+    def manifest(self):
+        return self.__data_producer.manifest
+
+    @manifest.setter
+    def manifest(self, value):
+        self.__data_producer.manifest = value
+
+    @property
+    def layout(self):
+        return self.__data_producer.layout
+
+    @layout.setter
+    def layout(self, value):
+        self.__data_producer.layout = value
+
+    def __raise_error(self) -> None:
+        """
+            Raises the error of the first failed write, if any
+        """
+        if self.__error is not None:
+            raise self.__error
+
+    def __on_done(self, future) -> None:
+        """
+            Frees the slot of a finished write and keeps its error, if it failed
+        Args:
+            future: the future of the finished write.
+        """
+        if future.exception() is not None and self.__error is None:
+            self.__error = future.exception()
+        self.__slots.release()
+
+    def __submit(self, write, *args):
+        """
+            Queues a write, blocking while max_pending writes are already queued
+        Args:
+            write: the method of the wrapped producer to call.
+            *args: the arguments of the call.
+
+        Returns:
+            the future of the write.
+        """
+        self.__raise_error()
+        while self.__pending and self.__pending[0].done():
+            self.__pending.popleft()
+        self.__slots.acquire()
+        future = self.__executor.submit(write, *args)
+        future.add_done_callback(self.__on_done)
+        self.__pending.append(future)
+        return future
+
+    def produce_data(self, time_series, date_range, anomaly_mask, config_manager: ConfigurationManager,
+                     filename=None) -> None:
+        """
+            Queues the production of a time series by the wrapped producer
+        Args:
+            time_series: the time series to be saved to file, it must not be modified afterwards.
+            date_range: the timestamps of the data points in the time series.
+            anomaly_mask: indicates whether each point is an anomaly or not.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename: the name of the file to be created, if applicable.
+        """
+        # the configuration manager is usually re-configured right after, the writer gets its own copy
+        self.__submit(self.__data_producer.produce_data, time_series, date_range, anomaly_mask,
+                      copy.copy(config_manager), filename)
+
+    def produce_chunks(self, chunks, config_manager: ConfigurationManager, filename=None) -> None:
+        """
+            Produces a time series generated as a stream of chunks, the chunks are pulled from the stream on the
+            calling thread and handed to the writer through a queue of max_pending chunks
+        Args:
+            chunks: an iterable of (timestamps, values, anomaly mask) chunks, as yielded by
+                TimeSeriesGenerator.generate_time_series_chunks.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename: the name of the file to be created, if applicable.
+        """
+        chunk_queue = queue.Queue(maxsize=self.__max_pending)
+
+        def queued_chunks():
+            while (chunk := chunk_queue.get()) is not _END_OF_CHUNKS:
+                yield chunk
+
+        def put(item) -> bool:
+            while not future.done():
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        future = self.__submit(self.__data_producer.produce_chunks, queued_chunks(), copy.copy(config_manager),
+                               filename)
+        try:
+            for chunk in chunks:
+                if not put(chunk):  # the write failed, its error is raised below
+                    break
+        finally:
+            put(_END_OF_CHUNKS)
+        if future.done():
+            self.__raise_error()
+
+    def checksum(self, record: dict) -> str:
+        """
+            Computes the checksum of the output of a produced time series with the wrapped producer
+        Args:
+            record (dict): the metadata record of the time series.
+
+        Returns:
+            (
+            str: the checksum of the output.)
+        """
+        return self.__data_producer.checksum(record)
+
+    def flush(self) -> None:
+        """
+            Waits for all the queued writes and raises the error of the first failed one, if any
+        """
+        while self.__pending:
+            self.__pending.popleft().exception()
+        self.__raise_error()
+
+    def close(self) -> None:
+        """
+            Flushes the queued writes, stops the writer thread and closes the wrapped producer
+        """
+        try:
+            self.flush()
+        finally:
+            self.__executor.shutdown(wait=True)
+        self.__data_producer.close()
+
+    def generate_metadata_file(self):
+        """
+            Flushes and joins the writer, then generates the metadata file with the wrapped producer
+        """
+        self.close()
+        self.__data_producer.generate_metadata_file()
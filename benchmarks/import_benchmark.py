@@ -0,0 +1,45 @@
+"""
+    Measures the time a fresh interpreter takes to import the generator module, compared with the imports it
+    used to pay for at load time (pandas and sklearn's MinMaxScaler).
+
+    Run from the repository root with: python -m benchmarks.import_benchmark
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = {
+    "python": "pass",
+    "import time_series_simulator": "import time_series_simulator",
+    "former pandas + sklearn imports": "import numpy, pandas; from sklearn.preprocessing import MinMaxScaler",
+}
+
+
+def time_statement(statement: str, repeats: int) -> float:
+    """
+        Measures the median wall time of a fresh interpreter running a statement
+    Args:
+        statement (str): the Python statement to run.
+        repeats (int): the number of interpreters to start.
+
+    Returns:
+        (
+        float: the median wall time in seconds.)
+    """
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main(repeats: int = 5) -> None:
+    print(f"{'statement':>32} {'median (s)':>11}")
+    for name, statement in STATEMENTS.items():
+        print(f"{name:>32} {time_statement(statement, repeats):>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
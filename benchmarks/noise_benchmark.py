@@ -0,0 +1,61 @@
+"""
+    Compares the vectorized noise injection against the per-point loop it replaced,
+    for every frequency listed in config.yaml over the longest data size.
+
+    Run from the repository root with: python -m benchmarks.noise_benchmark
+"""
+import timeit
+from datetime import timedelta
+from unittest.mock import Mock
+import numpy as np
+import pandas as pd
+import yaml
+from configuration_manager import ConfigurationManager
+from time_series_simulator import TimeSeriesGenerator
+
+
+def legacy_add_noise(time_series: np.ndarray, noise_level: float) -> pd.Series:
+    """
+        The original per-point implementation of TimeSeriesGenerator.__add_noise
+    Args:
+        time_series (np.ndarray): the scaled time series.
+        noise_level (float): the noise scale relative to the magnitude of each point.
+
+    Returns:
+        (
+        pd.Series: the time series with noise added.)
+    """
+    noise = np.zeros_like(time_series)
+    for i in range(len(time_series)):
+        noise[i] = np.random.normal(0, abs(time_series[i]) * noise_level) if noise_level > 0 else 0
+    return pd.Series(time_series + noise)
+
+
+def main(repeats: int = 3) -> None:
+    with open("config.yaml", 'r') as file:
+        yaml_data = yaml.safe_load(file)
+    duration = max(yaml_data['data_sizes'])
+    start_date = pd.Timestamp(2021, 7, 1)
+
+    config_manager = Mock(spec=ConfigurationManager)
+    config_manager.noise_level = "small"
+    generator = TimeSeriesGenerator(config_manager, seed=0)
+
+    print(f"{'frequency':>10} {'points':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>9}")
+    for frequency in yaml_data['frequencies']:
+        date_range = pd.date_range(start=start_date, end=start_date + timedelta(days=duration), freq=frequency)
+        time_series = np.sin(np.linspace(0, 20 * np.pi, len(date_range)))
+
+        def run_vectorized():
+            # the noise is added in place, so every run gets a fresh copy of the time series
+            generator._TimeSeriesGenerator__time_series = time_series.copy()
+            generator._TimeSeriesGenerator__add_noise()
+
+        loop_time = min(timeit.repeat(lambda: legacy_add_noise(time_series, 0.1), number=1, repeat=repeats))
+        vectorized_time = min(timeit.repeat(run_vectorized, number=1, repeat=repeats))
+        print(f"{frequency:>10} {len(date_range):>8} {loop_time:>10.4f} {vectorized_time:>15.6f} "
+              f"{loop_time / vectorized_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
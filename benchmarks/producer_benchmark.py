@@ -0,0 +1,56 @@
+"""
+    Compares the write time, read time and file size of the CSV and NPZ data producers on the longest
+    "10T" time series of config.yaml.
+
+    Run from the repository root with: python -m benchmarks.producer_benchmark
+"""
+import os
+import timeit
+from datetime import datetime
+from unittest.mock import Mock
+import numpy as np
+import pandas as pd
+from configuration_manager import ConfigurationManager
+from csv_data_producer import CSVDataProducer
+from npz_data_producer import NPZDataProducer
+from time_series_simulator import TimeSeriesGenerator
+
+
+def main(repeats: int = 3) -> None:
+    config_manager = Mock(spec=ConfigurationManager)
+    config_manager.start_date = datetime(2021, 7, 1)
+    config_manager.duration = 365
+    config_manager.frequency = "10T"
+    config_manager.daily_seasonality = config_manager.weekly_seasonality = "exist"
+    config_manager.trend_level = config_manager.cyclic_period = "exist"
+    config_manager.data_type = "additive"
+    config_manager.noise_level = "small"
+    config_manager.percentage_outliers = 0.05
+    config_manager.percentage_missing = 0.05
+    time_series, date_range, anomaly_mask = TimeSeriesGenerator(config_manager, seed=0).generate_time_series()
+
+    def read_csv():
+        pd.read_csv("./sample_datasets/benchmark.csv", parse_dates=['timestamp'])
+
+    producers = {
+        "csv": (CSVDataProducer(), "csv", read_csv),
+        "npz float64": (NPZDataProducer(np.float64, compress=False), "npz",
+                        lambda: NPZDataProducer.load_data("benchmark")),
+        "npz float64 compressed": (NPZDataProducer(np.float64), "npz", lambda: NPZDataProducer.load_data("benchmark")),
+        "npz float32 compressed": (NPZDataProducer(np.float32), "npz", lambda: NPZDataProducer.load_data("benchmark")),
+    }
+    print(f"{len(date_range)} points")
+    print(f"{'producer':>24} {'write (s)':>10} {'read (s)':>10} {'size (KiB)':>11}")
+    for name, (producer, extension, read) in producers.items():
+        write_time = min(timeit.repeat(
+            lambda: producer.produce_data(time_series, date_range, anomaly_mask, config_manager, "benchmark"),
+            number=1, repeat=repeats))
+        read_time = min(timeit.repeat(read, number=1, repeat=repeats))
+        size = os.path.getsize(f"./sample_datasets/benchmark.{extension}") / 1024
+        print(f"{name:>24} {write_time:>10.4f} {read_time:>10.4f} {size:>11.1f}")
+    for extension in ("csv", "npz"):
+        os.remove(f"./sample_datasets/benchmark.{extension}")
+
+
+if __name__ == '__main__':
+    main()
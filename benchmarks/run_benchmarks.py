@@ -0,0 +1,237 @@
+"""
+    Benchmark suite of the generation pipeline over the frequency x data size grid of config.yaml.
+
+    Times TimeSeriesGenerator.generate_time_series for every combination of the grid, each generation stage on
+    its own and CSVDataProducer.produce_data for every frequency at the largest data size, and reports the
+    throughput in points per second and the peak traced memory of each benchmark. The results are saved as JSON
+    under benchmarks/results/ so that runs can be compared.
+
+    Run from the repository root with:
+        python -m benchmarks.run_benchmarks [--repeats N] [--quick] [--compare benchmarks/results/<run>.json]
+"""
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from unittest.mock import Mock
+import numpy as np
+import pandas as pd
+import yaml
+from component_registry import TimeFeatures
+from configuration_manager import ConfigurationManager
+from configuration_plan import SeriesConfig
+from counter_rng import CounterRNG
+from csv_data_producer import CSVDataProducer
+from time_series_simulator import TimeSeriesGenerator
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def make_config_manager(frequency: str, data_size: int) -> ConfigurationManager:
+    """
+        Creates a configuration with every component enabled
+    Args:
+        frequency (str): the frequency of the time series.
+        data_size (int): the duration of the time series in days.
+
+    Returns:
+        (
+        ConfigurationManager: the configuration.)
+    """
+    config_manager = Mock(spec=ConfigurationManager)
+    config_manager.start_date = datetime(2021, 7, 1)
+    config_manager.duration = data_size
+    config_manager.frequency = frequency
+    config_manager.daily_seasonality = config_manager.weekly_seasonality = "exist"
+    config_manager.trend_level = config_manager.cyclic_period = "exist"
+    config_manager.data_type = "additive"
+    config_manager.noise_level = "small"
+    config_manager.percentage_outliers = 0.05
+    config_manager.percentage_missing = 0.05
+    return config_manager
+
+
+def measure(run, setup=None, repeats: int = 3) -> (float, int):
+    """
+        Measures the best wall time of a call over several repeats, then its peak traced memory in a separate run
+    Args:
+        run: the function to measure, it gets the value returned by setup.
+        setup: a function preparing the argument of run outside of the measurement.
+        repeats (int): the number of timed calls.
+
+    Returns:
+        (
+        float: the best wall time in seconds.
+        int: the peak memory traced during one call, in bytes.)
+    """
+    setup = setup or (lambda: None)
+    best = np.inf
+    for _ in range(repeats):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+
+    argument = setup()
+    tracemalloc.start()
+    try:
+        run(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def stage_benchmarks(frequency: str, data_size: int):
+    """
+        Builds a benchmark for each stage of TimeSeriesGenerator.generate_time_series
+    Args:
+        frequency (str): the frequency of the time series.
+        data_size (int): the duration of the time series in days.
+
+    Returns:
+        (
+        list: a (stage name, setup, run) tuple per stage, run gets the generator prepared by setup.)
+    """
+    config_manager = make_config_manager(frequency, data_size)
+    prefix = '_TimeSeriesGenerator__'
+
+    def prepared(stage=None):
+        def setup():
+            # a fresh generator without cache, advanced to the state the stage expects
+            generator = TimeSeriesGenerator(config_manager, seed=0, cache_size=0)
+            getattr(generator, prefix + 'generate_data_range')()
+            if stage in ('noise', 'outliers', 'missing_values', 'scaling'):
+                values = getattr(generator, prefix + 'combine_components')()
+                if stage != 'scaling':
+                    values = getattr(generator, prefix + 'min_max_scale')(values, values.min(), values.max())
+                setattr(generator, prefix + 'time_series', values)
+                if stage in ('outliers', 'missing_values'):
+                    getattr(generator, prefix + 'draw_anomaly_positions')()
+            return generator
+        return setup
+
+    def component(name):
+        # a component of the registry, computed from features extracted for it alone
+        def run(generator):
+            date_range = getattr(generator, prefix + 'date_range')
+            features, component = TimeFeatures(date_range, len(date_range)), generator.registry[name]
+            if component.shared:
+                return component.function(features)
+            return component.function(features, [SeriesConfig.from_config_manager(config_manager)], [CounterRNG(0)],
+                                      np.empty((1, len(date_range))))
+        return run
+
+    def scale(generator):
+        values = getattr(generator, prefix + 'time_series')
+        getattr(generator, prefix + 'min_max_scale')(values, values.min(), values.max())
+
+    return [
+        ('date_range', lambda: TimeSeriesGenerator(config_manager, seed=0, cache_size=0),
+         lambda generator: getattr(generator, prefix + 'generate_data_range')()),
+        *((name, prepared(), component(name))
+          for name in ('daily_seasonality', 'weekly_seasonality', 'trend', 'cycles')),
+        ('combine_components', prepared(), lambda generator: getattr(generator, prefix + 'combine_components')()),
+        ('scaling', prepared('scaling'), scale),
+        ('noise', prepared('noise'), lambda generator: getattr(generator, prefix + 'add_noise')()),
+        ('anomaly_positions', prepared('noise'),
+         lambda generator: getattr(generator, prefix + 'draw_anomaly_positions')()),
+        ('outliers', prepared('outliers'), lambda generator: getattr(generator, prefix + 'add_outliers')()),
+        ('missing_values', prepared('missing_values'),
+         lambda generator: getattr(generator, prefix + 'add_missing_values')()),
+    ]
+
+
+def run_benchmarks(frequencies: list, data_sizes: list, repeats: int) -> list:
+    """
+        Runs the whole suite
+    Args:
+        frequencies (list): the frequencies of the grid.
+        data_sizes (list): the data sizes of the grid.
+        repeats (int): the number of timed calls of each benchmark.
+
+    Returns:
+        (
+        list: a result record per benchmark.)
+    """
+    results = []
+
+    def record(benchmark, frequency, data_size, points, seconds, peak):
+        results.append({'benchmark': benchmark, 'frequency': frequency, 'data_size': data_size, 'points': points,
+                        'seconds': seconds, 'points_per_second': points / seconds, 'peak_bytes': peak})
+        print(f"{benchmark:>28} {frequency:>5} {data_size:>5} {points:>8} {seconds:>10.5f} "
+              f"{points / seconds:>14,.0f} {peak / 2 ** 20:>9.2f}")
+
+    print(f"{'benchmark':>28} {'freq':>5} {'days':>5} {'points':>8} {'best (s)':>10} {'points/s':>14} {'peak MiB':>9}")
+    for frequency in frequencies:
+        for data_size in data_sizes:
+            generator = TimeSeriesGenerator(make_config_manager(frequency, data_size), seed=0, cache_size=0)
+            points = len(generator.generate_time_series()[0])
+            seconds, peak = measure(lambda _: generator.generate_time_series(), repeats=repeats)
+            record('generate_time_series', frequency, data_size, points, seconds, peak)
+
+    data_size = max(data_sizes)
+    producer = CSVDataProducer()
+    for frequency in frequencies:
+        config_manager = make_config_manager(frequency, data_size)
+        time_series, date_range, anomaly_mask = TimeSeriesGenerator(config_manager, seed=0).generate_time_series()
+        for stage, setup, run in stage_benchmarks(frequency, data_size):
+            seconds, peak = measure(run, setup, repeats=repeats)
+            record(f'stage:{stage}', frequency, data_size, len(date_range), seconds, peak)
+        seconds, peak = measure(lambda _: producer.produce_data(time_series, date_range, anomaly_mask, config_manager,
+                                                                "benchmark"), repeats=repeats)
+        record('CSVDataProducer.produce_data', frequency, data_size, len(date_range), seconds, peak)
+    os.remove("./sample_datasets/benchmark.csv")
+    return results
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """
+        Prints the throughput of each benchmark relative to a previous run
+    Args:
+        results (list): the result records of this run.
+        baseline_path (str): the JSON file of the previous run.
+    """
+    with open(baseline_path, 'r') as file:
+        baseline = {(record['benchmark'], record['frequency'], record['data_size']): record
+                    for record in json.load(file)['results']}
+    print(f"\ncomparison with {baseline_path} (speedup > 1 is faster)")
+    for record in results:
+        previous = baseline.get((record['benchmark'], record['frequency'], record['data_size']))
+        if previous is not None:
+            print(f"{record['benchmark']:>28} {record['frequency']:>5} {record['data_size']:>5} "
+                  f"{record['points_per_second'] / previous['points_per_second']:>8.2f}x "
+                  f"peak {record['peak_bytes'] / max(previous['peak_bytes'], 1):>6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=3, help="timed calls per benchmark, the best one is kept")
+    parser.add_argument('--quick', action='store_true', help="only use the smallest and largest data sizes")
+    parser.add_argument('--compare', help="a previous results file to compare this run with")
+    arguments = parser.parse_args()
+
+    with open("config.yaml", 'r') as file:
+        yaml_data = yaml.safe_load(file)
+    data_sizes = sorted(yaml_data['data_sizes'])
+    if arguments.quick:
+        data_sizes = [data_sizes[0], data_sizes[-1]]
+    results = run_benchmarks(yaml_data['frequencies'], data_sizes, arguments.repeats)
+
+    os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+    run_name = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(RESULTS_DIRECTORY, f'{run_name}.json')
+    with open(path, 'w') as file:
+        json.dump({'run': run_name, 'python': platform.python_version(), 'numpy': np.__version__,
+                   'pandas': pd.__version__, 'machine': platform.platform(), 'processor': platform.processor(),
+                   'repeats': arguments.repeats, 'results': results}, file, indent=2)
+    print(f"\nresults saved to {path}")
+    if arguments.compare:
+        compare(results, arguments.compare)
+
+
+if __name__ == '__main__':
+    main()
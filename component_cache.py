@@ -0,0 +1,76 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class ComponentCache:
+    """
+        A bounded least-recently-used cache for the deterministic parts of the time series (date ranges and
+        components). The cached arrays are made read-only so that no caller can corrupt them.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.__maxsize = maxsize
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def maxsize(self):
+        return self.__maxsize
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__entries
+
+    def get(self, key, compute):
+        """
+            Returns the value cached under a key, computing and caching it on a miss
+        Args:
+            key: a hashable key identifying the value.
+            compute: a function without arguments computing the value.
+
+        Returns:
+            the cached value, NumPy arrays are returned read-only.
+        """
+        if key in self.__entries:
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+        self.__misses += 1
+        value = compute()
+        if self.__maxsize > 0:
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+            self.__entries[key] = value
+            if len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+        return value
+
+    def info(self) -> dict:
+        """
+            Reports the usage statistics of the cache
+
+        Returns:
+            (
+            dict: the number of hits and misses, the current size and the maximum size of the cache.)
+        """
+        return {'hits': self.__hits, 'misses': self.__misses, 'size': len(self.__entries), 'maxsize': self.__maxsize}
+
+    def clear(self) -> None:
+        """
+            Removes every entry and resets the statistics
+        """
+        self.__entries.clear()
+        self.__hits = 0
+        self.__misses = 0
@@ -0,0 +1,272 @@
+from __future__ import annotations
+import numpy as np
+from typing import TYPE_CHECKING, Callable
+from configuration_plan import Presence
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from timestamp_range import TimestampRange
+
+# the seasonal waves at each hour of the day, day of the week and quarter, looked up instead of computed per point
+DAILY_WAVE = np.sin(2 * np.pi * np.arange(24) / 24)
+WEEKLY_WAVE = np.sin(2 * np.pi * np.arange(7) / 7)
+QUARTERLY_WAVE = np.sin(2 * np.pi * np.arange(4) / 4)
+
+
+def _ramp(positions: np.ndarray, num_points: int) -> np.ndarray:
+    """
+        computes the points of np.linspace(0, 1, num_points) at the given positions, the same way numpy does
+    Args:
+        positions (np.ndarray): increasing positions, as floats, the array is reused for the result.
+        num_points (int): the number of points of the whole ramp.
+
+    Returns:
+        (
+        np.ndarray: the points of the ramp.)
+    """
+    ends_ramp = num_points > 1 and len(positions) > 0 and positions[-1] == num_points - 1
+    positions *= 1.0 / max(num_points - 1, 1)
+    if ends_ramp:
+        positions[-1] = 1.0
+    return positions
+
+
+class TimeFeatures:
+    """
+        The features of some points of a time series the components are computed from: their calendar features
+        (hour, day of the week, month, quarter) and their position in the time series. Each feature is extracted
+        once, when a component first asks for it, and then shared by all the components and all the time series
+        of a group, as a plain NumPy array.
+    """
+
+    def __init__(self, timestamps: TimestampRange | pd.DatetimeIndex, num_points: int, first_point: int = 0,
+                 positions: np.ndarray = None):
+        """
+        Args:
+            timestamps (TimestampRange | pd.DatetimeIndex): the timestamps of the points.
+            num_points (int): the number of points of the whole time series.
+            first_point (int): the position of the first point, when the points are consecutive.
+            positions (np.ndarray): the increasing positions of the points, when they are not consecutive.
+        """
+        self.__timestamps = timestamps
+        self.__num_points = num_points
+        self.__first_point = first_point
+        self.__positions_given = positions
+        self.__values = {}
+
+    @property
+    def timestamps(self):
+        return self.__timestamps
+
+    @property
+    def num_points(self):
+        return self.__num_points
+
+    def __len__(self) -> int:
+        return len(self.__timestamps)
+
+    def __get(self, name: str, compute: Callable) -> np.ndarray:
+        """
+            returns a feature, extracting it on first use
+        """
+        if name not in self.__values:
+            self.__values[name] = compute()
+        return self.__values[name]
+
+    @property
+    def hour(self) -> np.ndarray:
+        return self.__get('hour', lambda: np.asarray(self.__timestamps.hour))
+
+    @property
+    def dayofweek(self) -> np.ndarray:
+        return self.__get('dayofweek', lambda: np.asarray(self.__timestamps.dayofweek))
+
+    @property
+    def month(self) -> np.ndarray:
+        return self.__get('month', lambda: np.asarray(self.__timestamps.month))
+
+    @property
+    def quarter(self) -> np.ndarray:
+        return self.__get('quarter', lambda: np.asarray(self.__timestamps.quarter))
+
+    def __positions(self) -> np.ndarray:
+        """
+            computes the positions of the points, as floats
+        """
+        return np.array(self.__positions_given, dtype=float) if self.__positions_given is not None \
+            else np.arange(self.__first_point, self.__first_point + len(self), dtype=float)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+            the positions of the points in the time series, as floats
+        """
+        return self.__get('positions', self.__positions)
+
+    @property
+    def ramp(self) -> np.ndarray:
+        """
+            the points of a ramp going from 0 at the first point of the time series to 1 at its last point
+        """
+        # the ramp is computed in place, from the shared positions only if they were already extracted
+        return self.__get('ramp', lambda: _ramp(np.array(self.__values['positions']) if 'positions' in self.__values
+                                                else self.__positions(), self.__num_points))
+
+
+class Component:
+    """
+        A component of the time series, e.g. a seasonality or a trend, declared as a vectorized function of the
+        TimeFeatures of the points. A shared component only depends on the timestamps, its function(features)
+        returns one value per point, which is cached and shared by all the time series of a group. Any other
+        component depends on the configuration or the randomness of each time series, its
+        function(features, configs, rngs, out) writes a (number of series, number of points) matrix to out.
+
+        A component is enabled for a time series by a predicate of its configuration. An additive time series adds
+        the values of its enabled components, a multiplicative one multiplies their values plus
+        multiplicative_offset (1 for a wave around 0), and an untyped one adds them, each disabled component
+        adding 1.
+
+        A window of a time series is scaled by the bounds of the whole time series, which are only searched among
+        the first and last points of each hour of the week of each quarter when all of its components have
+        boundary_extremes, and among all its points otherwise.
+    """
+    __slots__ = ('__name', '__function', '__enabled', '__multiplicative_offset', '__shared', '__boundary_extremes')
+
+    def __init__(self, name: str, function: Callable, enabled: Callable, multiplicative_offset: float = 1.0,
+                 shared: bool = True, boundary_extremes: bool = False):
+        """
+        Args:
+            name (str): the name of the component, which identifies its values in the component cache.
+            function (Callable): the vectorized function computing the component.
+            enabled (Callable): tells from the configuration of a time series whether it has the component.
+            multiplicative_offset (float): added to the values of the component in a multiplicative time series.
+            shared (bool): whether the component only depends on the timestamps.
+            boundary_extremes (bool): whether the component only depends on the hour of the week, the quarter, the
+                configuration and the slope of the time series, and is monotonic over the points of the same
+                hour of the week of a quarter, so that its extremes are at the first or the last of them.
+        """
+        self.__name = name
+        self.__function = function
+        self.__enabled = enabled
+        self.__multiplicative_offset = multiplicative_offset
+        self.__shared = shared
+        self.__boundary_extremes = boundary_extremes
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def function(self):
+        return self.__function
+
+    @property
+    def multiplicative_offset(self):
+        return self.__multiplicative_offset
+
+    @property
+    def shared(self):
+        return self.__shared
+
+    @property
+    def boundary_extremes(self):
+        return self.__boundary_extremes
+
+    def enabled(self, config) -> bool:
+        """
+            Tells whether a time series has the component
+        Args:
+            config: the configuration of the time series, e.g. a SeriesConfig.
+
+        Returns:
+            (
+            bool: whether the component is enabled.)
+        """
+        return bool(self.__enabled(config))
+
+    def __repr__(self) -> str:
+        return f"Component({self.__name!r}, shared={self.__shared})"
+
+
+def _column(values, dtype=float) -> np.ndarray:
+    return np.array(values, dtype=dtype)[:, None]
+
+
+def _trend(features: TimeFeatures, configs: list, rngs: list, out: np.ndarray) -> np.ndarray:
+    """
+        an increasing trend goes from 0 to duration / 30 and a decreasing one from -duration / 30 to 0
+    """
+    np.subtract(features.ramp, _column([rng.slope() == -1 for rng in rngs]), out=out)
+    out *= _column([config.duration for config in configs]) / 30
+    return out
+
+
+class ComponentRegistry:
+    """
+        The components the time series are combined from, in the order they are combined. The default registry
+        holds the daily seasonality, weekly seasonality, quarterly cycles and trend configured in config.yaml,
+        more components can be registered, or the default ones replaced, without changing the generator.
+    """
+
+    def __init__(self, components: list = ()):
+        self.__components = {}
+        for component in components:
+            self.register(component)
+
+    @classmethod
+    def default(cls) -> 'ComponentRegistry':
+        """
+            Creates a registry holding the components configured in config.yaml
+
+        Returns:
+            (
+            ComponentRegistry: the registry.)
+        """
+        def exists(option):
+            return lambda config: getattr(config, f'{option}_code') == Presence.EXIST
+
+        return cls([Component('daily_seasonality', lambda features: DAILY_WAVE[features.hour],
+                              exists('daily_seasonality'), boundary_extremes=True),
+                    Component('weekly_seasonality', lambda features: WEEKLY_WAVE[features.dayofweek],
+                              exists('weekly_seasonality'), boundary_extremes=True),
+                    Component('cycles', lambda features: QUARTERLY_WAVE[features.quarter - 1],
+                              exists('cyclic_period'), boundary_extremes=True),
+                    Component('trend', _trend, exists('trend_level'), multiplicative_offset=0.0, shared=False,
+                              boundary_extremes=True)])
+
+    def register(self, component: Component) -> Component:
+        """
+            Adds a component after the registered ones, or replaces the registered component of the same name
+        Args:
+            component (Component): the component.
+
+        Returns:
+            (
+            Component: the component.)
+        """
+        self.__components[component.name] = component
+        return component
+
+    def unregister(self, name: str) -> None:
+        """
+            Removes a component
+        Args:
+            name (str): the name of the component.
+        """
+        del self.__components[name]
+
+    @property
+    def names(self) -> list:
+        return list(self.__components)
+
+    def __getitem__(self, name: str) -> Component:
+        return self.__components[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__components
+
+    def __iter__(self):
+        return iter(list(self.__components.values()))
+
+    def __len__(self) -> int:
+        return len(self.__components)
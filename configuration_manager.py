@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
+import numpy as np
+from configuration_plan import ConfigurationPlan, SeriesConfig
 
 
 class ConfigurationManager(ABC):
@@ -15,7 +17,17 @@ class ConfigurationManager(ABC):
         self._cyclic_period = "no"
         self._data_type = "additive"
         self._percentage_outliers = 0.05
+        self._percentage_missing = 0.05
         self._datasets_num = 1
+        self._rng = np.random.default_rng()
+
+    @property
+    def rng(self):
+        return self._rng
+
+    @rng.setter
+    def rng(self, value):
+        self._rng = value
 
     @property
     def datasets_num(self):
@@ -60,10 +72,37 @@ class ConfigurationManager(ABC):
     def percentage_outliers(self):
         return self._percentage_outliers
 
+    @property
+    def percentage_missing(self):
+        return self._percentage_missing
+
     @property
     def data_type(self):
         return self._data_type
 
+    def snapshot(self) -> SeriesConfig:
+        """
+            Takes a snapshot of the current configuration, which later calls to configure do not modify
+
+        Returns:
+            (
+            SeriesConfig: the current configuration.)
+        """
+        return SeriesConfig.from_config_manager(self)
+
+    @abstractmethod
+    def compile_plan(self, num_series: int = None) -> ConfigurationPlan:
+        """
+            Abstract method to draw the configurations of all the time series up front
+        Args:
+            num_series (int): the number of configurations to draw, defaults to the number of datasets.
+
+        Returns:
+            (
+            ConfigurationPlan: the configurations.)
+        """
+        pass
+
     @abstractmethod
     def load_config(self):
         """
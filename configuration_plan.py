@@ -0,0 +1,231 @@
+import hashlib
+import json
+from datetime import datetime
+from enum import IntEnum
+import numpy as np
+
+
+class Presence(IntEnum):
+    NO = 0
+    EXIST = 1
+
+    @classmethod
+    def parse(cls, option) -> 'Presence':
+        return cls.EXIST if option == "exist" else cls.NO
+
+
+class NoiseLevel(IntEnum):
+    NO = 0
+    SMALL = 1
+    LARGE = 2
+
+    @classmethod
+    def parse(cls, option) -> 'NoiseLevel':
+        return {"small": cls.SMALL, "large": cls.LARGE}.get(option, cls.NO)
+
+    @property
+    def scale(self) -> float:
+        """
+            the standard deviation of the noise relative to the value of a point
+        """
+        return (0.0, 0.1, 0.3)[self]
+
+
+class DataType(IntEnum):
+    UNTYPED = 0
+    ADDITIVE = 1
+    MULTIPLICATIVE = 2
+
+    @classmethod
+    def parse(cls, option) -> 'DataType':
+        return {"additive": cls.ADDITIVE, "multiplicative": cls.MULTIPLICATIVE}.get(option, cls.UNTYPED)
+
+
+# the configuration fields drawn for each time series, with the config.yaml key listing their options
+FIELDS = {'duration': 'data_sizes',
+          'frequency': 'frequencies',
+          'daily_seasonality': 'daily_seasonality_options',
+          'weekly_seasonality': 'weekly_seasonality_options',
+          'noise_level': 'noise_levels',
+          'trend_level': 'trend_levels',
+          'cyclic_period': 'cyclic_periods',
+          'data_type': 'data_types',
+          'percentage_outliers': 'percentage_outliers_options',
+          'percentage_missing': 'percentage_missing_options'}
+
+# the options of the fields config.yaml may leave out
+DEFAULT_OPTIONS = {'percentage_missing_options': [0.05]}
+
+# the fields whose options are enumerated, with their integer codes
+CODES = {'daily_seasonality': Presence,
+         'weekly_seasonality': Presence,
+         'noise_level': NoiseLevel,
+         'trend_level': Presence,
+         'cyclic_period': Presence,
+         'data_type': DataType}
+
+
+class SeriesConfig:
+    """
+        The configuration of one time series. It has the same attributes as a configured ConfigurationManager,
+        so it can be passed to the data producers in its place, and the integer code of each enumerated option.
+    """
+    __slots__ = ('start_date', *FIELDS, *(f'{field}_code' for field in CODES))
+
+    def __init__(self, start_date: datetime, **values):
+        self.start_date = start_date
+        for field in FIELDS:
+            setattr(self, field, values[field])
+        for field, codes in CODES.items():
+            setattr(self, f'{field}_code', codes.parse(values[field]))
+
+    @classmethod
+    def from_config_manager(cls, config_manager) -> 'SeriesConfig':
+        """
+            Takes a snapshot of the current configuration of a configuration manager
+        Args:
+            config_manager (ConfigurationManager): the configuration manager.
+
+        Returns:
+            (
+            SeriesConfig: the configuration.)
+        """
+        return cls(config_manager.start_date, **{field: getattr(config_manager, field) for field in FIELDS})
+
+
+class ConfigurationPlan:
+    """
+        The configurations of a whole run compiled from config.yaml: the options of every field, the start date,
+        parsed once, and the option drawn for each field of each time series, sampled up front into a NumPy
+        structured array of option indices with one record per time series. The plan of the first k time series
+        is the first k records of any longer plan drawn with the same generator.
+        A plan can be saved and loaded to generate the same configurations again.
+    """
+    __slots__ = ('__start_date', '__options', '__series')
+
+    def __init__(self, start_date: datetime, options: dict, series: np.ndarray):
+        self.__start_date = start_date
+        self.__options = options
+        self.__series = series
+
+    @classmethod
+    def compile(cls, yaml_data: dict, rng: np.random.Generator, num_series: int = None) -> 'ConfigurationPlan':
+        """
+            Compiles the configuration options of config.yaml and draws the configuration of every time series
+        Args:
+            yaml_data (dict): the content of config.yaml.
+            rng (np.random.Generator): the generator used to draw the configurations.
+            num_series (int): the number of configurations to draw, defaults to datasets_num.
+
+        Returns:
+            (
+            ConfigurationPlan: the plan.)
+        """
+        num_series = yaml_data['datasets_num'] if num_series is None else num_series
+        options = {field: tuple(yaml_data[key] if key in yaml_data else DEFAULT_OPTIONS[key])
+                   for field, key in FIELDS.items()}
+        series = np.empty(num_series, dtype=[(field, np.uint16) for field in FIELDS])
+        # the options are drawn one time series after the other, so the configuration of a time series does not
+        # depend on how many are drawn after it
+        draws = rng.integers([len(options[field]) for field in FIELDS], size=(num_series, len(FIELDS)))
+        for column, field in enumerate(FIELDS):
+            series[field] = draws[:, column]
+        return cls(datetime.strptime(yaml_data['start_date'], "%d-%m-%Y"), options, series)
+
+    @property
+    def start_date(self):
+        return self.__start_date
+
+    @property
+    def options(self):
+        return self.__options
+
+    @property
+    def series(self):
+        return self.__series
+
+    def __len__(self) -> int:
+        return len(self.__series)
+
+    def __getitem__(self, position):
+        """
+            Returns the configuration of a time series, or the plan of a slice or list of the time series
+        """
+        if isinstance(position, (slice, list, np.ndarray)):
+            return ConfigurationPlan(self.__start_date, self.__options, self.__series[position])
+        return self.config(position)
+
+    def config(self, position: int) -> SeriesConfig:
+        """
+            Returns the configuration of a time series of the plan
+        Args:
+            position (int): the position of the time series in the plan.
+
+        Returns:
+            (
+            SeriesConfig: the configuration of the time series.)
+        """
+        record = self.__series[position]
+        return SeriesConfig(self.__start_date,
+                            **{field: self.__options[field][record[field]] for field in FIELDS})
+
+    def values(self, field: str) -> np.ndarray:
+        """
+            Returns the option drawn for a field by every time series of the plan
+        Args:
+            field (str): the name of the field, e.g. 'duration'.
+
+        Returns:
+            (
+            np.ndarray: the options, one per time series.)
+        """
+        return np.asarray(self.__options[field])[self.__series[field]]
+
+    def codes(self, field: str) -> np.ndarray:
+        """
+            Returns the integer code of the option drawn for an enumerated field by every time series of the plan
+        Args:
+            field (str): the name of the field, e.g. 'noise_level'.
+
+        Returns:
+            (
+            np.ndarray: the codes, one per time series.)
+        """
+        table = np.array([CODES[field].parse(option) for option in self.__options[field]], dtype=np.uint8)
+        return table[self.__series[field]]
+
+    def fingerprint(self) -> str:
+        """
+            Identifies the configuration the plan was compiled from, its start date and options, which with the seed
+            of the generator determine the configuration of every time series, whatever the length of the plan
+
+        Returns:
+            (
+            str: the SHA-256 digest of the start date and options.)
+        """
+        content = json.dumps([self.__start_date.isoformat(), self.__options], default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def save(self, path: str) -> None:
+        """
+            Saves the plan to a .npz file
+        Args:
+            path (str): the path of the file.
+        """
+        np.savez(path, series=self.__series, start_date=np.array(self.__start_date.isoformat()),
+                 options=np.array(json.dumps(self.__options)))
+
+    @classmethod
+    def load(cls, path: str) -> 'ConfigurationPlan':
+        """
+            Loads a plan saved by save
+        Args:
+            path (str): the path of the file.
+
+        Returns:
+            (
+            ConfigurationPlan: the plan.)
+        """
+        with np.load(path) as data:
+            options = {field: tuple(values) for field, values in json.loads(str(data['options'])).items()}
+            return cls(datetime.fromisoformat(str(data['start_date'])), options, data['series'])
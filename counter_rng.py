@@ -0,0 +1,186 @@
+import numpy as np
+
+# the odd constant of SplitMix64, which spaces the counters hashed by _mix
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+# the permutations are computed by blocks of this many values, to bound the memory of their intermediate arrays
+PERMUTATION_BLOCK = 65536
+
+# the normal draws are computed by blocks of this many pairs of points, aligned on multiples of it, so that a point
+# is always computed by the same operations on the same block whichever range of points is requested
+NORMAL_BLOCK = 1024
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """
+        The finalizer of SplitMix64, a bijective hash of 64-bit integers
+    Args:
+        values (np.ndarray): the integers to hash, as uint64.
+
+    Returns:
+        (
+        np.ndarray: the hashes, as a new uint64 array.)
+    """
+    values = values ^ (values >> np.uint64(30))
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+
+class CounterRNG:
+    """
+        The randomness of one time series, drawn with counter-based generators: every random value is a function
+        of the seed of the time series and of the position of the point it belongs to, instead of the next value
+        of a sequential stream. Any range of points can therefore be drawn on its own, at a cost proportional to
+        its length, and gets exactly the values a draw of the whole time series gives at those positions.
+
+        The normal draws come from a Philox stream, whose counter is advanced to the first requested point, turned
+        into normals by the Box-Muller transform. The values drawn at scattered positions (e.g. the outliers) are
+        SplitMix64 hashes of the positions. The ranking of the positions that places the anomalies is a keyed
+        Feistel permutation of [0, num_points), so a position is ranked, and a rank mapped back to its position,
+        without ranking the other points.
+    """
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed: an int, a sequence of ints or a np.random.SeedSequence, fresh entropy by default.
+        """
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        words = seed_sequence.generate_state(8, np.uint64)
+        self.__noise_key = words[:2]
+        self.__slope_key, self.__uniform_key = words[2:4]
+        self.__round_keys = words[4:]
+
+    @classmethod
+    def from_generator(cls, rng: np.random.Generator) -> 'CounterRNG':
+        """
+            Seeds the randomness of a time series with a draw of a sequential generator
+        Args:
+            rng (np.random.Generator): the generator.
+
+        Returns:
+            (
+            CounterRNG: the randomness of the time series.)
+        """
+        return cls(rng.integers(2 ** 63, size=2).tolist())
+
+    def __hash(self, positions, key) -> np.ndarray:
+        """
+            Hashes positions with a key
+        Args:
+            positions: the positions, as integers.
+            key: the key of the stream.
+
+        Returns:
+            (
+            np.ndarray: a uniformly distributed uint64 per position.)
+        """
+        return _mix(np.asarray(positions, dtype=np.uint64) * _GAMMA + key)
+
+    def slope(self) -> int:
+        """
+            Draws the direction of the trend of the time series
+
+        Returns:
+            (
+            int: 1 or -1.)
+        """
+        return 1 if self.__hash([0], self.__slope_key)[0] >> np.uint64(63) else -1
+
+    def uniform(self, positions, low: float = 0.0, high: float = 1.0) -> np.ndarray:
+        """
+            Draws a uniform value for each of the given positions
+        Args:
+            positions: the positions of the points in the time series.
+            low (float): the lower bound of the values.
+            high (float): the upper bound of the values, excluded.
+
+        Returns:
+            (
+            np.ndarray: the values, in the order of positions.)
+        """
+        values = (self.__hash(positions, self.__uniform_key) >> np.uint64(11)).astype(np.float64)
+        values *= (high - low) * 2.0 ** -53
+        values += low
+        return values
+
+    def standard_normal(self, first_point: int, last_point: int, out: np.ndarray = None) -> np.ndarray:
+        """
+            Draws a standard normal value for each point of a range of the time series
+        Args:
+            first_point (int): the position of the first point of the range.
+            last_point (int): the position after the last point of the range.
+            out (np.ndarray): the array to write the values to, a new one by default.
+
+        Returns:
+            (
+            np.ndarray: the values of the points of the range.)
+        """
+        out = np.empty(last_point - first_point) if out is None else out
+        if last_point <= first_point:
+            return out
+        # the points 2p and 2p + 1 share the pair of Philox words 2p and 2p + 1, a Philox counter gives 4 words
+        first_block = first_point // (2 * NORMAL_BLOCK)
+        bit_generator = np.random.Philox(key=self.__noise_key)
+        bit_generator.advance(first_block * NORMAL_BLOCK // 2)
+        for block_start in range(first_block * 2 * NORMAL_BLOCK, last_point, 2 * NORMAL_BLOCK):
+            words = (bit_generator.random_raw(2 * NORMAL_BLOCK) >> np.uint64(11)).astype(np.float64)
+            radius = np.sqrt(-2 * np.log((words[0::2] + 1) * 2.0 ** -53))
+            angle = words[1::2] * (2 * np.pi * 2.0 ** -53)
+            normals = np.empty(2 * NORMAL_BLOCK)
+            np.multiply(radius, np.cos(angle), out=normals[0::2])
+            np.multiply(radius, np.sin(angle), out=normals[1::2])
+            start, stop = max(block_start, first_point), min(block_start + 2 * NORMAL_BLOCK, last_point)
+            out[start - first_point:stop - first_point] = normals[start - block_start:stop - block_start]
+        return out
+
+    def __feistel(self, values: np.ndarray, half_bits: int, inverse: bool) -> np.ndarray:
+        """
+            Applies the keyed Feistel network permuting the integers of 2 * half_bits bits
+        Args:
+            values (np.ndarray): the integers, as uint64.
+            half_bits (int): the number of bits of each half of an integer.
+            inverse (bool): whether to apply the inverse permutation.
+
+        Returns:
+            (
+            np.ndarray: the permuted integers.)
+        """
+        shift, mask = np.uint64(half_bits), np.uint64((1 << half_bits) - 1)
+        left, right = values >> shift, values & mask
+        if inverse:
+            for key in self.__round_keys[::-1]:
+                left, right = right ^ (_mix(left ^ key) & mask), left
+        else:
+            for key in self.__round_keys:
+                left, right = right, left ^ (_mix(right ^ key) & mask)
+        return (left << shift) | right
+
+    def permutation(self, values, num_points: int, inverse: bool = False) -> np.ndarray:
+        """
+            Applies a pseudo-random permutation of [0, num_points) keyed by the seed of the time series. The
+            Feistel network permutes the next power of 4, values it sends out of range are permuted again until
+            they come back in range (cycle walking).
+        Args:
+            values: integers in [0, num_points).
+            num_points (int): the size of the permuted range.
+            inverse (bool): whether to apply the inverse permutation.
+
+        Returns:
+            (
+            np.ndarray: the permuted integers, as int64.)
+        """
+        values = np.asarray(values)
+        permuted = np.empty(len(values), dtype=np.int64)
+        half_bits = max(1, (int(num_points - 1).bit_length() + 1) // 2)
+        for start in range(0, len(values), PERMUTATION_BLOCK):
+            block = self.__feistel(values[start:start + PERMUTATION_BLOCK].astype(np.uint64), half_bits, inverse)
+            walking = np.flatnonzero(block >= num_points)
+            while len(walking) > 0:
+                block[walking] = self.__feistel(block[walking], half_bits, inverse)
+                walking = walking[block[walking] >= num_points]
+            permuted[start:start + PERMUTATION_BLOCK] = block
+        return permuted
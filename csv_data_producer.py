@@ -1,38 +1,131 @@
 import numpy as np
 from data_producer import DataProducer
 import pandas as pd
+import os
 from configuration_manager import ConfigurationManager
+from stage_profiler import profile_stage
+from timestamp_range import TimestampRange, to_datetime_index
+
+TIMESTAMP_MODES = ('column', 'range')
 
 
 class CSVDataProducer(DataProducer):
-    def produce_data(self, time_series: pd.Series, date_range: pd.DatetimeIndex,
+
+    def __init__(self, timestamps: str = 'column'):
+        """
+        Args:
+            timestamps (str): how the timestamps are written, "column" writes each of them in a timestamp column
+                and "range" only writes the start and step of the time series to its metadata, load_data
+                rebuilding them as a TimestampRange.
+        """
+        super().__init__()
+        if timestamps not in TIMESTAMP_MODES:
+            raise ValueError(f"The timestamps must be written as one of {TIMESTAMP_MODES}, not {timestamps!r}")
+        self.__timestamps = timestamps
+
+    @property
+    def timestamps(self):
+        return self.__timestamps
+
+    def _columns(self, time_series, date_range, anomaly_mask) -> dict:
+        """
+            the columns of the .csv file of a time series, the timestamp column only being written in column mode
+        """
+        columns = {'value': time_series}
+        if self.__timestamps == 'column':
+            columns['timestamp'] = to_datetime_index(date_range)
+        columns['anomaly'] = anomaly_mask
+        return columns
+
+    def produce_data(self, time_series: pd.Series, date_range: TimestampRange | pd.DatetimeIndex,
                      anomaly_mask: np.ndarray, config_manager: ConfigurationManager, filename: str = None) -> None:
         """
             Generates a .csv file containing the time series data
         Args:
             time_series (pandas.Series): the time series to be saved to file.
-            date_range (pandas.DatetimeIndex): the timestamps of the data points in the time series.
+            date_range (TimestampRange | pandas.DatetimeIndex): the timestamps of the data points in the time series.
             anomaly_mask (np.ndarray): indicates whether each point is an anomaly or not.
             config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
             filename (str): the name of the .csv file to be created.
 
         """
-        df = pd.DataFrame({'value': time_series, 'timestamp': date_range, 'anomaly': anomaly_mask})
-        df.to_csv(f"./sample_datasets/{filename}.csv", encoding='utf-8', index=False)
-        self._metadata.append({'id': str(filename),
-                               'data_type': config_manager.data_type,
-                               'daily_seasonality': config_manager.daily_seasonality,
-                               'weekly_seasonality': config_manager.weekly_seasonality,
-                               'noise': config_manager.noise_level,
-                               'trend': config_manager.trend_level,
-                               'cyclic_period (3 months)': config_manager.cyclic_period,
-                               'data_size': config_manager.duration,
-                               'percentage_outliers': config_manager.percentage_outliers,
-                               'percentage_missing': 0.05,
-                               'freq': config_manager.frequency})
+        with profile_stage(self._profiler, 'write', len(date_range), filename) as record:
+            df = pd.DataFrame(self._columns(time_series, date_range, anomaly_mask))
+            df.to_csv(f"./sample_datasets/{filename}.csv", encoding='utf-8', index=False)
+            record['bytes_written'] = os.path.getsize(f"./sample_datasets/{filename}.csv")
+        self._add_metadata(config_manager, filename,
+                           **(self._range_fields(date_range) if self.__timestamps == 'range' else {}))
+
+    def produce_chunks(self, chunks, config_manager: ConfigurationManager, filename: str = None) -> None:
+        """
+            Generates a .csv file containing the time series data, appending it one chunk at a time
+        Args:
+            chunks: an iterable of (timestamps, values, anomaly mask) chunks, as yielded by
+                TimeSeriesGenerator.generate_time_series_chunks.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename (str): the name of the .csv file to be created.
 
-    def generate_metadata_file(self):
         """
-            Generates a .csv file containing the metadata of all the generated time series
+        fields = {}
+        with open(f"./sample_datasets/{filename}.csv", 'w', encoding='utf-8', newline='') as file:
+            for chunk_num, (timestamps, values, anomaly_mask) in enumerate(chunks):
+                with profile_stage(self._profiler, 'write', len(values), filename) as record:
+                    start = file.tell()
+                    df = pd.DataFrame(self._columns(values, timestamps, anomaly_mask))
+                    df.to_csv(file, header=chunk_num == 0, index=False)
+                    record['bytes_written'] = file.tell() - start
+                if chunk_num == 0 and self.__timestamps == 'range':
+                    fields = self._range_fields(timestamps)
+        self._add_metadata(config_manager, filename, **fields)
+
+    @staticmethod
+    def _read_timestamps(table: pd.DataFrame, record: dict, filename: str) -> TimestampRange | pd.DatetimeIndex:
+        """
+            Reads the timestamps of a .csv file, from its timestamp column or else from the start and step of its
+            metadata record
+        Args:
+            table (pd.DataFrame): the content of the file.
+            record (dict): the metadata record of the time series, if any.
+            filename (str): the name of the file, for the error message.
+
+        Returns:
+            (
+            TimestampRange | pd.DatetimeIndex: the timestamps of the rows of the file.)
+        """
+        if 'timestamp' in table.columns:
+            return pd.DatetimeIndex(pd.to_datetime(table['timestamp']))
+        if record is None or 'start' not in record:
+            raise ValueError(f"The timestamps of {filename} were written as a range, its metadata record is needed")
+        return TimestampRange(record['start'], record['step'], len(table))
+
+    @staticmethod
+    def load_data(filename: str, record: dict = None) -> (pd.Series, TimestampRange | pd.DatetimeIndex, np.ndarray):
+        """
+            Loads a time series written by produce_data or produce_chunks
+        Args:
+            filename (str): the name of the .csv file, without extension.
+            record (dict): the metadata record of the time series, needed when its timestamps were written as a
+                range.
+
+        Returns:
+            (
+            pd.Series: the time series.
+            TimestampRange | pd.DatetimeIndex: the timestamps of the data points, a TimestampRange when they were
+                written as a range.
+            np.ndarray: indicates whether each point is an anomaly or not.)
+        """
+        table = pd.read_csv(f"./sample_datasets/{filename}.csv")
+        timestamps = CSVDataProducer._read_timestamps(table, record, filename)
+        return table['value'], timestamps, table['anomaly'].to_numpy(dtype=bool)
+
+    def checksum(self, record: dict) -> str:
+        """
+            Computes the checksum of the .csv file of a produced time series
+        Args:
+            record (dict): the metadata record of the time series.
+
+        Returns:
+            (
+            str: the SHA-256 digest of the file.)
         """
-        pd.DataFrame.from_records(self._metadata).to_csv('sample_datasets/meta_data.csv', encoding='utf-8', index=False)
+        return self._file_checksum(f"./sample_datasets/{record['id']}.csv")
@@ -1,14 +1,25 @@
 from abc import ABC, abstractmethod
 from configuration_manager import ConfigurationManager
+import hashlib
 import os
+import numpy as np
+import pandas as pd
+from stage_profiler import StageProfiler
+from manifest import Manifest
+from timestamp_range import concat_timestamps, to_timestamp_range
 
 
 class DataProducer(ABC):
+    # whether the producer writes to the places the runner reserves for the time series in a shared store, which
+    # the runner then computes from the length of every time series before generating them
+    uses_layout = False
 
     def __init__(self):
         self._metadata = []
-        if not os.path.exists('sample_datasets'):
-            os.mkdir('sample_datasets')
+        self._profiler = None
+        self._manifest = None
+        self._layout = None
+        os.makedirs('sample_datasets', exist_ok=True)
 
     @property
     def metadata(self):
@@ -18,6 +29,112 @@ class DataProducer(ABC):
     def metadata(self, value):
         self._metadata = value
 
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, value: StageProfiler):
+        self._profiler = value
+
+    @property
+    def manifest(self):
+        return self._manifest
+
+    @manifest.setter
+    def manifest(self, value: Manifest):
+        self._manifest = value
+
+    @property
+    def layout(self):
+        """
+            the (offset, length) the runner reserved for each time series, by id, in a store shared by the
+            producers of the run, None when nothing was reserved
+        """
+        return self._layout
+
+    @layout.setter
+    def layout(self, value: dict):
+        self._layout = value
+
+    @staticmethod
+    def _file_checksum(path: str) -> str:
+        """
+            Computes the SHA-256 checksum of a file
+        Args:
+            path (str): the path of the file.
+
+        Returns:
+            (
+            str: the hexadecimal digest of the file.)
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(2 ** 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _range_fields(timestamps) -> dict:
+        """
+            Describes the timestamps of a time series by their start and step, for the producers that write them
+            as metadata instead of a column
+        Args:
+            timestamps: the timestamps of the time series, a TimestampRange or evenly spaced timestamps.
+
+        Returns:
+            (
+            dict: the start and step metadata fields, which TimestampRange accepts back with the length of the
+                time series.)
+        """
+        timestamps = to_timestamp_range(timestamps)
+        return {'start': str(timestamps.start), 'step': timestamps.freq}
+
+    def _add_metadata(self, config_manager: ConfigurationManager, filename=None, **fields) -> None:
+        """
+            Records the metadata of a produced time series, and appends it to the manifest if there is one
+        Args:
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename: the name of the file the time series was saved to, used as its id.
+            **fields: producer specific fields to add to the metadata record.
+        """
+        self._metadata.append({'id': str(filename),
+                               'data_type': config_manager.data_type,
+                               'daily_seasonality': config_manager.daily_seasonality,
+                               'weekly_seasonality': config_manager.weekly_seasonality,
+                               'noise': config_manager.noise_level,
+                               'trend': config_manager.trend_level,
+                               'cyclic_period (3 months)': config_manager.cyclic_period,
+                               'data_size': config_manager.duration,
+                               'percentage_outliers': config_manager.percentage_outliers,
+                               'percentage_missing': config_manager.percentage_missing,
+                               'freq': config_manager.frequency,
+                               **fields})
+        if self._manifest is not None:
+            self._manifest.append(self._metadata[-1], self.checksum(self._metadata[-1]))
+
+    def produce_chunks(self, chunks, config_manager: ConfigurationManager, filename=None) -> None:
+        """
+            Produces a time series generated as a stream of chunks. Producers that can write incrementally
+            override this to keep a single chunk in memory, by default the chunks are concatenated and passed
+            to produce_data.
+        Args:
+            chunks: an iterable of (timestamps, values, anomaly mask) chunks, as yielded by
+                TimeSeriesGenerator.generate_time_series_chunks.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename: the name of the file to be created, if applicable.
+        """
+        timestamps, values, anomaly_masks = zip(*chunks)
+        self.produce_data(pd.Series(np.concatenate(values)), concat_timestamps(timestamps),
+                          np.concatenate(anomaly_masks), config_manager, filename)
+
+    def close(self) -> None:
+        """
+            Finishes the production once every time series was handed to the producer, producers that write
+            asynchronously override this to wait for their pending writes
+        """
+        pass
+
     @abstractmethod
     def produce_data(self, time_series, date_range, anomaly_mask, config_manager: ConfigurationManager, filename=None):
         """
@@ -32,8 +149,22 @@ class DataProducer(ABC):
         pass
 
     @abstractmethod
-    def generate_metadata_file(self):
+    def checksum(self, record: dict) -> str:
         """
-            Abstract method to generate a file containing the metadata of all the generated time series
+            Abstract method to compute the checksum of the output of a produced time series, which validates it
+            when a run is resumed
+        Args:
+            record (dict): the metadata record of the time series.
+
+        Returns:
+            (
+            str: the checksum of the output.)
         """
         pass
+
+    def generate_metadata_file(self):
+        """
+            Generates a .csv file containing the metadata of all the generated time series, producers that keep
+            more than the metadata, or write asynchronously, override this and then call it
+        """
+        pd.DataFrame.from_records(self._metadata).to_csv('sample_datasets/meta_data.csv', encoding='utf-8', index=False)
@@ -0,0 +1,261 @@
+import itertools
+import json
+import os
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class GenerationServer:
+    """
+        Serves generation requests over HTTP on a local address, so that many small jobs do not each pay for
+        starting Python, importing NumPy and pandas and compiling config.yaml: the server imports them once and
+        keeps the corpora of the last requested seeds, with the component caches of their generators, warm.
+
+            GET  /health                          {"status": "ok", "requests": <served requests>}
+            GET  /series?id=3&seed=22[&count=10][&start=0&stop=100]
+                                                  one time series of the corpus of the seed, or a window of it
+                                                  given as positions or timestamps, as JSON
+            POST /run  {"format": "npz", "seed": 22, "workers": 1, "count": 10, "timestamps": "column",
+                        "resume": false}          produces a corpus, as main.py does, to the working directory
+
+        A time series is the one ParallelRunner produces with the same configuration and seed, whatever the count
+        of either. Each request is served on its own thread: the requests to the same corpus wait for each other,
+        as its generator is not thread-safe, and so do the runs, which share the output folder. A corpus is
+        compiled again when the configuration file changes.
+    """
+
+    def __init__(self, config_path: str = 'config.yaml', address: tuple = ('127.0.0.1', 8765),
+                 max_corpora: int = 8):
+        """
+        Args:
+            config_path (str): the path of the YAML configuration file.
+            address (tuple): the (host, port) to listen on, port 0 picks a free port.
+            max_corpora (int): the number of corpora kept warm.
+        """
+        # the imports a generation request needs are paid once, when the server starts
+        from component_cache import ComponentCache
+        import lazy_dataset
+        import parallel_runner
+        self.__config_path = os.path.abspath(config_path)
+        self.__corpora = ComponentCache(maxsize=max_corpora)
+        self.__corpora_lock = threading.Lock()
+        self.__run_lock = threading.Lock()
+        self.__requests = itertools.count(1)
+        self.__thread = None
+        self.__server = ThreadingHTTPServer(address, partial(_RequestHandler, self))
+        self.__server.daemon_threads = True
+
+    @property
+    def address(self) -> tuple:
+        """
+            the (host, port) the server listens on
+        """
+        return self.__server.server_address[:2]
+
+    @property
+    def config_path(self):
+        return self.__config_path
+
+    def serve_forever(self) -> None:
+        """
+            Serves requests until close is called
+        """
+        self.__server.serve_forever()
+
+    def start(self) -> 'GenerationServer':
+        """
+            Serves requests on a background thread
+
+        Returns:
+            (
+            GenerationServer: the server.)
+        """
+        self.__thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+            Stops serving requests and releases the address
+        """
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def __enter__(self) -> 'GenerationServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __config_manager(self, count: int = None):
+        from yaml_configuration_manager import YAMLConfigurationManager
+        return YAMLConfigurationManager(self.__config_path, datasets_num=count)
+
+    def __corpus(self, seed: int, count: int = None):
+        """
+            Returns the corpus of a seed, compiling it on first use
+        Args:
+            seed (int): the seed of the corpus.
+            count (int): the number of time series of the corpus, the datasets_num of the configuration file by
+                default.
+
+        Returns:
+            (
+            LazyDataset: the corpus.
+            threading.Lock: the lock its requests take.)
+        """
+        from lazy_dataset import LazyDataset
+
+        def compile_corpus():
+            config_manager = self.__config_manager(count)
+            config_manager.load_config()
+            return LazyDataset(config_manager, seed=seed), threading.Lock()
+        with self.__corpora_lock:
+            return self.__corpora.get((seed, count, os.path.getmtime(self.__config_path)), compile_corpus)
+
+    def series(self, series_num: int, seed: int = 22, count: int = None, start=None, stop=None) -> dict:
+        """
+            Generates a time series of a corpus, or a window of it
+        Args:
+            series_num (int): the id of the time series.
+            seed (int): the seed of the corpus.
+            count (int): the number of time series of the corpus.
+            start: the position or timestamp of the first point of the window.
+            stop: the position or timestamp after the last point of the window.
+
+        Returns:
+            (
+            dict: the configuration of the time series, its timestamps as a start and a step (or as a list when
+                its frequency is not fixed), its values, missing values being None, and the positions of its
+                outliers in the window.)
+        """
+        import numpy as np
+        from configuration_plan import FIELDS
+        from timestamp_range import TimestampRange
+        corpus, lock = self.__corpus(seed, count)
+        window = slice(start, stop) if start is not None or stop is not None else None
+        with lock:
+            values, date_range, anomaly_mask = corpus.get(series_num, window)
+        config = corpus.config(series_num)
+        values = values.to_numpy()
+        response = {'id': str(series_num % len(corpus)), 'seed': seed, 'start_date': str(config.start_date),
+                    **{field: getattr(config, field) for field in FIELDS},
+                    'values': np.where(np.isnan(values), None, values).tolist(),
+                    'anomalies': np.flatnonzero(anomaly_mask).tolist()}
+        if isinstance(date_range, TimestampRange):
+            response.update(start=str(date_range.start), step=date_range.freq)
+        else:
+            response['timestamps'] = [str(timestamp) for timestamp in date_range]
+        return response
+
+    def run(self, format: str = 'csv', seed: int = 22, workers: int = 1, count: int = None,
+            timestamps: str = 'column', resume: bool = False) -> dict:
+        """
+            Produces a corpus to the sample_datasets folder of the working directory, as main.py does
+        Args:
+            format (str): the output format, one of the producer formats except stream.
+            seed (int): the seed of the corpus.
+            workers (int): the number of worker processes.
+            count (int): the number of time series, the datasets_num of the configuration file by default.
+            timestamps (str): how the csv and npz producers write the timestamps, 'column' or 'range'.
+            resume (bool): whether to resume a previous run with the same seed.
+
+        Returns:
+            (
+            dict: the number of time series produced and the time the run took, in seconds.)
+        """
+        from parallel_runner import ParallelRunner
+        from producer_formats import data_producer_class
+        from yaml_configuration_manager import YAMLConfigurationManager
+        if format == 'stream':
+            raise ValueError("The server does not stream, run main.py with --format=stream instead")
+        with self.__run_lock:
+            start_time = time.perf_counter()
+            runner = ParallelRunner(partial(YAMLConfigurationManager, self.__config_path, count),
+                                    data_producer_class(format, timestamps=timestamps, resume=resume),
+                                    workers=workers, seed=seed, resume=resume)
+            runner.run()
+            return {'datasets': runner.metadata_index.count(), 'seconds': time.perf_counter() - start_time}
+
+    def handle(self, method: str, url: str, body: bytes) -> (int, dict):
+        """
+            Serves a request
+        Args:
+            method (str): the HTTP method.
+            url (str): the path and query of the request.
+            body (bytes): the JSON body of a POST request.
+
+        Returns:
+            (
+            int: the HTTP status.
+            dict: the JSON response, an error message when the request failed.)
+        """
+        requests = next(self.__requests)
+        url = urlparse(url)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if method == 'GET' and url.path == '/health':
+                return 200, {'status': 'ok', 'requests': requests}
+            if method == 'GET' and url.path == '/series':
+                if 'id' not in query:
+                    raise ValueError("A time series is requested by its id")
+                return 200, self.series(int(query['id']), seed=int(query.get('seed', 22)),
+                                        count=int(query['count']) if 'count' in query else None,
+                                        start=_bound(query.get('start')), stop=_bound(query.get('stop')))
+            if method == 'POST' and url.path == '/run':
+                return 200, self.run(**json.loads(body or b'{}'))
+            return 404, {'error': f"No {method} {url.path}"}
+        except (ValueError, TypeError, IndexError, KeyError) as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            # e.g. a configuration file that cannot be read, the server keeps serving the other requests
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+
+
+def _bound(text: str):
+    """
+        Parses the bound of a window, a position or a timestamp
+    """
+    if text is None:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+        Hands the requests to the GenerationServer and writes its JSON responses
+    """
+
+    def __init__(self, generation_server: GenerationServer, *args, **kwargs):
+        self.__generation_server = generation_server
+        super().__init__(*args, **kwargs)
+
+    def __respond(self, method: str) -> None:
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        status, response = self.__generation_server.handle(method, self.path, body)
+        # NumPy scalars, e.g. the durations of the plan, are written as numbers and anything else as a string
+        payload = json.dumps(response, default=lambda value: value.item() if hasattr(value, 'item') else str(value))\
+            .encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self.__respond('GET')
+
+    def do_POST(self) -> None:
+        self.__respond('POST')
+
+    def log_message(self, format: str, *args) -> None:
+        pass
@@ -0,0 +1,94 @@
+import numpy as np
+from counter_rng import CounterRNG
+
+
+class IndexSampler:
+    """
+        Draws the positions of the anomalies of the time series. All the anomalies of a time series (outliers and
+        missing values) are drawn jointly, so the groups are disjoint sets of exact sizes: the points are ranked by
+        a pseudo-random permutation keyed by the seed of the time series, and the first group takes the points
+        ranked in [0, counts[0]), the second those ranked in [counts[0], counts[0] + counts[1]) and so on.
+        Drawing the groups of a whole time series maps their ranks back to positions with the inverse permutation,
+        at a cost proportional to the number of anomalies; drawing them in a window ranks the points of the window,
+        at a cost proportional to its length, and finds the same positions a draw of the whole time series does.
+        The positions are returned as index arrays, to_mask turns them into a boolean mask when needed.
+    """
+
+    def __init__(self, rng: CounterRNG = None):
+        self.__rng = rng if rng is not None else CounterRNG()
+
+    @property
+    def rng(self):
+        return self.__rng
+
+    @rng.setter
+    def rng(self, value: CounterRNG):
+        self.__rng = value
+
+    def sample(self, num_points: int, counts, first_point: int = 0, last_point: int = None) -> list:
+        """
+            Draws disjoint groups of positions among the points of a time series, or of a window of it
+        Args:
+            num_points (int): the number of points of the time series.
+            counts: the number of positions of each group in the whole time series.
+            first_point (int): the position of the first point of the window.
+            last_point (int): the position after the last point of the window, the end of the time series by
+                default.
+
+        Returns:
+            (
+            list: an index array per group, in the order of counts, holding positions relative to the window.)
+        """
+        num_points = int(num_points)
+        last_point = num_points if last_point is None else last_point
+        counts = [int(count) for count in counts]
+        if sum(counts) > num_points:
+            raise ValueError(f"Cannot draw {sum(counts)} distinct positions among {num_points} points")
+        limits = np.cumsum([0] + counts)
+        if first_point == 0 and last_point == num_points:
+            positions = self.__rng.permutation(np.arange(limits[-1]), num_points, inverse=True)
+            return np.split(positions, limits[1:-1])
+        ranks = self.__rng.permutation(np.arange(first_point, last_point), num_points)
+        return [np.flatnonzero((ranks >= low) & (ranks < high)) for low, high in zip(limits[:-1], limits[1:])]
+
+    def sample_rows(self, num_points: int, counts: np.ndarray, rngs: list = None, first_point: int = 0,
+                    last_point: int = None) -> list:
+        """
+            Draws disjoint groups of positions in every row of a (rows, window length) matrix of windows of time
+            series, with a different number of positions per row
+        Args:
+            num_points (int): the number of points of each time series.
+            counts (np.ndarray): the number of positions of each group in each row, shaped (rows, groups).
+            rngs (list): the randomness of each row, the sampler's is used for all the rows by default.
+            first_point (int): the position of the first point of the windows.
+            last_point (int): the position after the last point of the windows, the end of the time series by
+                default.
+
+        Returns:
+            (
+            list: an index array per group, holding positions in the flattened matrix, row by row.)
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        width = (num_points if last_point is None else last_point) - first_point
+        groups = [[] for _ in range(counts.shape[1])]
+        for row, row_counts in enumerate(counts):
+            sampler = self if rngs is None else IndexSampler(rngs[row])
+            for group, positions in zip(groups, sampler.sample(num_points, row_counts, first_point, last_point)):
+                group.append(positions + row * width)
+        return [np.concatenate(group) if group else np.empty(0, dtype=np.int64) for group in groups]
+
+    @staticmethod
+    def to_mask(positions: np.ndarray, shape) -> np.ndarray:
+        """
+            Turns positions into a boolean mask
+        Args:
+            positions (np.ndarray): positions in the flattened mask.
+            shape: the shape of the mask.
+
+        Returns:
+            (
+            np.ndarray: a boolean mask that is True at the given positions.)
+        """
+        mask = np.zeros(shape, dtype=bool)
+        mask.reshape(-1)[positions] = True
+        return mask
@@ -0,0 +1,156 @@
+from __future__ import annotations
+import numpy as np
+from typing import TYPE_CHECKING
+from configuration_manager import ConfigurationManager
+from component_cache import ComponentCache
+from time_series_simulator import TimeSeriesGenerator
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from timestamp_range import TimestampRange
+
+
+class LazyDataset:
+    """
+        A corpus of time series that is never stored: each time series is regenerated on demand from the
+        configuration plan of the corpus and its own seed, derived from the seed of the corpus and its position.
+        dataset[i] is therefore the time series with id i of the corpus ParallelRunner produces with the same
+        configuration and seed, whatever the number of time series of either, and dataset[i, t0:t1] is its points
+        t0 to t1 (excluded), given as positions or timestamps. A window is generated on its own, as
+        generate_time_series_window does, unless its time series is cached. The last cache_size whole time series
+        accessed are kept in memory, read-only.
+    """
+
+    def __init__(self, config_manager: ConfigurationManager, seed: int = 22, length: int = None,
+                 cache_size: int = 0):
+        """
+        Args:
+            config_manager (ConfigurationManager): a configuration manager whose configuration is loaded.
+            seed (int): the seed of the corpus.
+            length (int): the number of time series of the corpus, defaults to the number of datasets.
+            cache_size (int): the maximum number of time series kept in memory.
+        """
+        config_manager.rng = np.random.default_rng(np.random.SeedSequence(seed))
+        self.__plan = config_manager.compile_plan(length)
+        self.__seed = seed
+        self.__generator = TimeSeriesGenerator(config_manager)
+        self.__cache = ComponentCache(maxsize=cache_size)
+
+    @property
+    def seed(self):
+        return self.__seed
+
+    @property
+    def plan(self):
+        return self.__plan
+
+    @property
+    def cache_info(self) -> dict:
+        return self.__cache.info()
+
+    def __len__(self) -> int:
+        return len(self.__plan)
+
+    def __iter__(self):
+        for series_num in range(len(self)):
+            yield self.get(series_num)
+
+    def __position(self, series_num: int) -> int:
+        """
+            Checks the position of a time series, negative positions count from the end of the corpus
+        """
+        if not -len(self) <= series_num < len(self):
+            raise IndexError(f"Time series {series_num} is out of a corpus of {len(self)}")
+        return series_num % len(self)
+
+    def config(self, series_num: int):
+        """
+            Returns the configuration of a time series of the corpus
+        Args:
+            series_num (int): the position of the time series in the corpus.
+
+        Returns:
+            (
+            SeriesConfig: the configuration of the time series.)
+        """
+        return self.__plan[self.__position(series_num)]
+
+    def __generate(self, series_num: int) -> (np.ndarray, TimestampRange, np.ndarray):
+        """
+            Generates a whole time series of the corpus
+        Args:
+            series_num (int): the position of the time series in the corpus.
+
+        Returns:
+            (
+            np.ndarray: the values of the time series.
+            TimestampRange: the timestamps of the data points in the time series.
+            np.ndarray: indicates whether each point is an anomaly or not.)
+        """
+        _, time_series, date_range, anomaly_mask, _ = self.__generator.generate_batch(
+            1, self.__plan[[series_num]], [TimeSeriesGenerator.series_seed(self.__seed, series_num)])[0]
+        values, anomaly_mask = time_series[0], anomaly_mask[0]
+        if self.__cache.maxsize > 0:
+            values.setflags(write=False)
+            anomaly_mask.setflags(write=False)
+        return values, date_range, anomaly_mask
+
+    @staticmethod
+    def _window_bounds(window: slice, config) -> (int, int):
+        """
+            Converts a window of positions or timestamps into positions, without building the timestamps
+        Args:
+            window (slice): the window, its bounds are positions, timestamps or None.
+            config (SeriesConfig): the configuration of the time series.
+
+        Returns:
+            (
+            int: the position of the first point of the window.
+            int: the position after the last point of the window.)
+        """
+        if window.step not in (None, 1):
+            raise ValueError("A window of a time series cannot have a step")
+        import pandas as pd
+        from pandas.tseries.frequencies import to_offset
+        num_points = TimeSeriesGenerator.series_length(config)
+
+        def position(bound, default):
+            if bound is None:
+                return default
+            if isinstance(bound, (int, np.integer)):
+                return slice(bound, None).indices(num_points)[0]
+            # the first point at or after the timestamp
+            offset = pd.Timestamp(bound) - pd.Timestamp(config.start_date)
+            return min(max(-(-offset // pd.Timedelta(to_offset(config.frequency))), 0), num_points)
+        return position(window.start, 0), max(position(window.stop, num_points), position(window.start, 0))
+
+    def get(self, series_num: int, window: slice = None) -> (pd.Series, TimestampRange, np.ndarray):
+        """
+            Returns a time series of the corpus, or a window of it
+        Args:
+            series_num (int): the position of the time series in the corpus.
+            window (slice): the points to return, as positions or timestamps, all of them by default.
+
+        Returns:
+            (
+            pd.Series: the time series.
+            TimestampRange: the timestamps of the data points in the time series.
+            np.ndarray: indicates whether each point is an anomaly or not.)
+        """
+        import pandas as pd
+        series_num = self.__position(series_num)
+        if window is not None and series_num not in self.__cache:
+            start, stop = self._window_bounds(window, self.config(series_num))
+            return self.__generator.generate_time_series_window(
+                start, stop, self.config(series_num), TimeSeriesGenerator.series_seed(self.__seed, series_num))
+        values, date_range, anomaly_mask = self.__cache.get(series_num, lambda: self.__generate(series_num))
+        if window is not None:
+            start, stop = self._window_bounds(window, self.config(series_num))
+            values, date_range, anomaly_mask = values[start:stop], date_range[start:stop], anomaly_mask[start:stop]
+        return pd.Series(values, copy=False), date_range, anomaly_mask
+
+    def __getitem__(self, key) -> (pd.Series, TimestampRange, np.ndarray):
+        if isinstance(key, tuple):
+            series_num, window = key
+            return self.get(series_num, window)
+        return self.get(key)
@@ -1,41 +1,133 @@
-# This is a sample Python script.
-
-# Press Shift+F10 to execute it or replace it with your code.
-# Press Double Shift to search everywhere for classes, files, tool windows, actions, and settings.
+import argparse
+import os
 import sys
-from yaml_configuration_manager import YAMLConfigurationManager
-from time_series_simulator import TimeSeriesGenerator
-from csv_data_producer import CSVDataProducer
 
-# Press the green button in the gutter to run the script.
-if __name__ == '__main__':
+# only the standard library is imported up front, NumPy, pandas and the data producers are imported once the
+# arguments are parsed, and only the producer of the chosen format
+FORMAT_MESSAGES = {'csv': "Producing data in .csv format",
+                   'npz': "Producing data in .npz format",
+                   'memmap': "Producing data in a single memory-mapped store",
+                   'stream': "Streaming data"}
 
-    if len(sys.argv) < 3:
-        print("INVALID ARGUMENTS! EXITING.")
-        exit()
 
-    if sys.argv[1] == "yaml":
-        print("Configuring through \"config.yaml\" file")
-        config_manager = YAMLConfigurationManager()
-    else:
-        print("Invalid first argument reverting to YAML config")
-        config_manager = YAMLConfigurationManager()
+def build_parser() -> argparse.ArgumentParser:
+    """
+        Builds the parser of the command line: "generate" (the default command) produces a corpus, "serve" keeps
+        a generation server running
 
-    if sys.argv[2] == "csv":
-        print("Producing data in .csv format")
-        data_producer = CSVDataProducer()
-    else:
-        print("Invalid second argument reverting to CSV output")
-        data_producer = CSVDataProducer()
+    Returns:
+        (
+        argparse.ArgumentParser: the parser.)
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--config', default='config.yaml', help="the YAML configuration file (default: %(default)s)")
+    common.add_argument('--output-dir', default='.',
+                        help="the directory the sample_datasets folder is written to (default: the current one)")
+
+    parser = argparse.ArgumentParser(description="Generates synthetic time series datasets.")
+    commands = parser.add_subparsers(dest='command')
+    generate = commands.add_parser('generate', parents=[common], help="produce a corpus of time series")
+    generate.add_argument('--format', choices=FORMAT_MESSAGES, default='csv', help="the output format")
+    generate.add_argument('--seed', type=int, default=22, help="the seed of the corpus (default: %(default)s)")
+    generate.add_argument('--workers', type=int, default=1, help="the number of worker processes")
+    generate.add_argument('--count', type=int, default=None,
+                          help="the number of time series, the datasets_num of the configuration by default")
+    generate.add_argument('--profile', action='store_true',
+                          help="write the time spent in each stage to sample_datasets/profile.jsonl")
+    generate.add_argument('--trace-memory', action='store_true',
+                          help="also record the bytes each stage allocates, which slows every stage down and writes "
+                               "in the foreground (implies --profile)")
+    generate.add_argument('--resume', action='store_true',
+                          help="only produce the time series a previous run with the same seed did not")
+    generate.add_argument('--timestamps', choices=('column', 'range'), default='column',
+                          help="range writes the start and step of each time series to its metadata instead of its "
+                               "timestamps (csv and npz)")
+    generate.add_argument('--address', default='127.0.0.1:9999',
+                          help="where to stream: host:port, unix:<path> or - for stdout (stream)")
+    generate.add_argument('--speedup', type=float, default=None,
+                          help="how many times faster than its frequency a time series is streamed (stream)")
+    generate.add_argument('--framing', choices=('line', 'binary'), default='line', help="the stream framing")
+
+    serve = commands.add_parser('serve', parents=[common], help="serve generation requests over local HTTP")
+    serve.add_argument('--host', default='127.0.0.1', help="the address to listen on (default: %(default)s)")
+    serve.add_argument('--port', type=int, default=8765, help="the port to listen on (default: %(default)s)")
+    return parser
+
+
+def parse_arguments(argv: list = None) -> argparse.Namespace:
+    """
+        Parses the command line, generate being the command when none is given
+    Args:
+        argv (list): the arguments, those of the process by default.
+
+    Returns:
+        (
+        argparse.Namespace: the parsed arguments.)
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in ('generate', 'serve', '-h', '--help'):
+        argv = ['generate'] + argv
+    return build_parser().parse_args(argv)
 
-    config_manager.load_config()
-    config_manager.configure()
-    generator = TimeSeriesGenerator(config_manager=config_manager)
 
-    for series_num in range(config_manager.datasets_num):
-        time_series, data_range, anomaly_mask = generator.generate_time_series()
-        data_producer.produce_data(time_series, data_range, anomaly_mask, config_manager, str(series_num))
-        config_manager.configure()
+def generate(arguments: argparse.Namespace) -> None:
+    """
+        Produces a corpus of time series as the arguments configure it
+    Args:
+        arguments (argparse.Namespace): the parsed arguments of the generate command.
+    """
+    from functools import partial
+    from parallel_runner import ParallelRunner
+    from producer_formats import data_producer_class
+    from yaml_configuration_manager import YAMLConfigurationManager
 
-    data_producer.generate_metadata_file()
-# See PyCharm help at https://www.jetbrains.com/help/pycharm/
+    # the status goes to stderr when the stream goes to stdout, so that the stream only holds frames
+    status = sys.stderr if arguments.format == 'stream' and arguments.address == '-' else sys.stdout
+    print(f"Configuring through \"{arguments.config}\" file", file=status)
+    config_manager_class = partial(YAMLConfigurationManager, arguments.config, arguments.count)
+    print(FORMAT_MESSAGES[arguments.format] + (f" to {arguments.address}" if arguments.format == 'stream' else ""),
+          file=status)
+    producer_class = data_producer_class(arguments.format, timestamps=arguments.timestamps,
+                                         address=arguments.address, speedup=arguments.speedup,
+                                         framing=arguments.framing, resume=arguments.resume)
+
+    print(f"{'Resuming' if arguments.resume else 'Generating'} with {arguments.workers} worker(s) and seed "
+          f"{arguments.seed}", file=status)
+    ParallelRunner(config_manager_class, producer_class, workers=arguments.workers, seed=arguments.seed,
+                   profile=arguments.profile, resume=arguments.resume, trace_memory=arguments.trace_memory).run()
+    if arguments.profile or arguments.trace_memory:
+        print("Stage profile written to \"sample_datasets/profile.jsonl\"", file=status)
+
+
+def serve(arguments: argparse.Namespace) -> None:
+    """
+        Runs a generation server until interrupted
+    Args:
+        arguments (argparse.Namespace): the parsed arguments of the serve command.
+    """
+    from generation_server import GenerationServer
+    server = GenerationServer(arguments.config, address=(arguments.host, arguments.port))
+    host, port = server.address
+    print(f"Serving generation requests on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+def main(argv: list = None) -> None:
+    arguments = parse_arguments(argv)
+    # the configuration is found from the directory main.py was started in, the output goes to the output one
+    arguments.config = os.path.abspath(arguments.config)
+    os.makedirs(arguments.output_dir, exist_ok=True)
+    os.chdir(arguments.output_dir)
+    if arguments.command == 'serve':
+        serve(arguments)
+    else:
+        generate(arguments)
+
+
+if __name__ == '__main__':
+    main()
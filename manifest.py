@@ -0,0 +1,70 @@
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, the manifest can then only be written from a single process
+    fcntl = None
+
+MANIFEST_FILE = 'sample_datasets/manifest.jsonl'
+
+
+class Manifest:
+    """
+        An append-only log of the produced time series, with their metadata and output checksums, to resume a run.
+    """
+
+    def __init__(self, path: str = MANIFEST_FILE, run_fields: dict = None):
+        self.__path = path
+        self.__run_fields = dict(run_fields or {})
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def run_fields(self):
+        return self.__run_fields
+
+    def append(self, metadata: dict, checksum: str) -> None:
+        """
+            Records a produced time series
+        Args:
+            metadata (dict): the metadata record of the time series, holding its id.
+            checksum (str): the checksum of the output of the time series.
+        """
+        line = json.dumps({'id': metadata['id'], **self.__run_fields, 'checksum': checksum, 'metadata': metadata})
+        with open(self.__path, 'a', encoding='utf-8') as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            file.write(line + '\n')
+            file.flush()
+
+    def load(self) -> dict:
+        """
+            Reads the time series recorded by runs with the same fields as this one, a line cut short by a crash
+            is ignored and a time series recorded twice keeps its last entry
+
+        Returns:
+            (
+            dict: the entries of the manifest by time series id.)
+        """
+        entries = {}
+        if not os.path.exists(self.__path):
+            return entries
+        with open(self.__path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if all(entry.get(field) == value for field, value in self.__run_fields.items()):
+                    entries[entry['id']] = entry
+        return entries
+
+    def clear(self) -> None:
+        """
+            Removes the manifest left by a previous run
+        """
+        if os.path.exists(self.__path):
+            os.remove(self.__path)
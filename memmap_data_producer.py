@@ -0,0 +1,137 @@
+import hashlib
+import os
+import numpy as np
+from data_producer import DataProducer
+import pandas as pd
+from configuration_manager import ConfigurationManager
+from stage_profiler import profile_stage
+from timestamp_range import to_datetime_index
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, the store can then only be filled from a single process
+    fcntl = None
+
+STORE_FILES = {'value': ('store_values.bin', np.float64),
+               'timestamp': ('store_timestamps.bin', np.int64),
+               'anomaly': ('store_anomaly.bin', np.bool_)}
+OFFSETS_FILE = 'store_offsets.npy'
+LOCK_FILE = 'store.lock'
+
+
+class MemmapDataProducer(DataProducer):
+    """
+        Writes every time series to one store of contiguous binary arrays, at the place the runner reserved for it.
+    """
+    uses_layout = True
+
+    @staticmethod
+    def clear_store() -> None:
+        """
+            Removes the store left by a previous run, which is otherwise written over
+        """
+        for filename, _ in STORE_FILES.values():
+            if os.path.exists(f"./sample_datasets/{filename}"):
+                os.remove(f"./sample_datasets/{filename}")
+        if os.path.exists(f"./sample_datasets/{OFFSETS_FILE}"):
+            os.remove(f"./sample_datasets/{OFFSETS_FILE}")
+
+    def __write(self, chunks, filename=None) -> (int, int):
+        """
+            Writes the chunks of a time series at the offset reserved for it in the layout, or else appends them at
+            the end of the store
+        Args:
+            chunks: an iterable of (timestamps, values, anomaly mask) chunks.
+            filename: the id of the time series.
+
+        Returns:
+            (
+            int: the offset of the time series in the store, in points.
+            int: the number of points of the time series.)
+        """
+        reserved = self._layout.get(str(filename)) if self._layout is not None else None
+        with open(f"./sample_datasets/{LOCK_FILE}", 'w') as lock:
+            # the producers of a run write to disjoint reserved places, only appends need to wait for each other
+            if fcntl is not None and reserved is None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            files = {column: open(os.open(f"./sample_datasets/{name}", os.O_RDWR | os.O_CREAT), 'r+b')
+                     for column, (name, _) in STORE_FILES.items()}
+            try:
+                if reserved is None:
+                    offset = files['value'].seek(0, os.SEEK_END) // np.dtype(np.float64).itemsize
+                else:
+                    offset = reserved[0]
+                for column, (_, dtype) in STORE_FILES.items():
+                    files[column].seek(offset * np.dtype(dtype).itemsize)
+                length = 0
+                for timestamps, values, anomaly_mask in chunks:
+                    if reserved is not None and length + len(values) > reserved[1]:
+                        raise ValueError(f"Time series {filename} is longer than the {reserved[1]} points reserved")
+                    with profile_stage(self._profiler, 'write', len(values), filename) as record:
+                        np.asarray(values, dtype=np.float64).tofile(files['value'])
+                        to_datetime_index(timestamps).asi8.tofile(files['timestamp'])
+                        np.asarray(anomaly_mask, dtype=np.bool_).tofile(files['anomaly'])
+                        record['bytes_written'] = len(values) * sum(np.dtype(dtype).itemsize
+                                                                    for _, dtype in STORE_FILES.values())
+                    length += len(values)
+                if reserved is not None and length != reserved[1]:
+                    raise ValueError(f"Time series {filename} has {length} points, {reserved[1]} were reserved")
+            finally:
+                for file in files.values():
+                    file.close()
+        return offset, length
+
+    def produce_data(self, time_series: pd.Series, date_range: pd.DatetimeIndex,
+                     anomaly_mask: np.ndarray, config_manager: ConfigurationManager, filename: str = None) -> None:
+        """
+            Writes the time series to the store
+        Args:
+            time_series (pandas.Series): the time series to be saved.
+            date_range (pandas.DatetimeIndex): the timestamps of the data points in the time series.
+            anomaly_mask (np.ndarray): indicates whether each point is an anomaly or not.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename (str): the id of the time series in the store.
+
+        """
+        self.produce_chunks([(date_range, time_series, anomaly_mask)], config_manager, filename)
+
+    def produce_chunks(self, chunks, config_manager: ConfigurationManager, filename: str = None) -> None:
+        """
+            Writes the time series to the store one chunk at a time
+        Args:
+            chunks: an iterable of (timestamps, values, anomaly mask) chunks, as yielded by
+                TimeSeriesGenerator.generate_time_series_chunks.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename (str): the id of the time series in the store.
+
+        """
+        offset, length = self.__write(chunks, filename)
+        self._add_metadata(config_manager, filename, offset=offset, length=length)
+
+    def checksum(self, record: dict) -> str:
+        """
+            Computes the checksum of the part of the store holding a produced time series
+        Args:
+            record (dict): the metadata record of the time series, with its offset and length in the store.
+
+        Returns:
+            (
+            str: the SHA-256 digest of the values, timestamps and anomaly mask of the time series.)
+        """
+        digest = hashlib.sha256()
+        for filename, dtype in STORE_FILES.values():
+            itemsize = np.dtype(dtype).itemsize
+            with open(f"./sample_datasets/{filename}", 'rb') as file:
+                file.seek(int(record['offset']) * itemsize)
+                digest.update(file.read(int(record['length']) * itemsize))
+        return digest.hexdigest()
+
+    def generate_metadata_file(self):
+        """
+            Generates the offsets index of the store and a .csv file containing the metadata of all the
+            time series, in the same order
+        """
+        np.save(f"./sample_datasets/{OFFSETS_FILE}",
+                np.array([(record['offset'], record['length']) for record in self._metadata],
+                         dtype=np.int64).reshape(-1, 2))
+        super().generate_metadata_file()
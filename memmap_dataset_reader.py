@@ -0,0 +1,56 @@
+import os
+import numpy as np
+import pandas as pd
+from memmap_data_producer import STORE_FILES, OFFSETS_FILE
+
+
+class MemmapDatasetReader:
+    """
+        Reads the time series of a store written by MemmapDataProducer. The store is memory mapped, so a time
+        series is returned as zero-copy views and only the pages it spans are ever loaded.
+    """
+
+    def __init__(self, directory: str = 'sample_datasets'):
+        self.__directory = directory
+        self.__metadata = pd.read_csv(os.path.join(directory, 'meta_data.csv'), dtype={'id': str})
+        self.__offsets = np.load(os.path.join(directory, OFFSETS_FILE))
+        self.__positions = {series_id: position for position, series_id in enumerate(self.__metadata['id'])}
+        self.__arrays = {}
+        for column, (filename, dtype) in STORE_FILES.items():
+            path = os.path.join(directory, filename)
+            self.__arrays[column] = np.memmap(path, dtype=dtype, mode='r') if os.path.getsize(path) > 0 \
+                else np.empty(0, dtype=dtype)
+
+    @property
+    def metadata(self) -> pd.DataFrame:
+        return self.__metadata
+
+    @property
+    def ids(self) -> list:
+        return list(self.__positions)
+
+    def __len__(self) -> int:
+        return len(self.__positions)
+
+    def __contains__(self, series_id) -> bool:
+        return str(series_id) in self.__positions
+
+    def get(self, series_id) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+            Returns a time series of the store without reading the others
+        Args:
+            series_id: the id the time series was produced with.
+
+        Returns:
+            (
+            np.ndarray: the values of the time series.
+            np.ndarray: the timestamps of the data points, as datetime64[ns].
+            np.ndarray: indicates whether each point is an anomaly or not.)
+        """
+        offset, length = self.__offsets[self.__positions[str(series_id)]]
+        window = slice(offset, offset + length)
+        return (self.__arrays['value'][window], self.__arrays['timestamp'][window].view('datetime64[ns]'),
+                self.__arrays['anomaly'][window])
+
+    def __getitem__(self, series_id) -> (np.ndarray, np.ndarray, np.ndarray):
+        return self.get(series_id)
@@ -0,0 +1,184 @@
+import json
+import os
+import sqlite3
+
+METADATA_INDEX_FILE = 'sample_datasets/metadata.sqlite'
+
+# the metadata fields with a column of their own, by record key: the column and its SQLite type
+COLUMNS = {'id': ('id', 'TEXT'),
+           'data_type': ('data_type', 'TEXT'),
+           'daily_seasonality': ('daily_seasonality', 'TEXT'),
+           'weekly_seasonality': ('weekly_seasonality', 'TEXT'),
+           'noise': ('noise', 'TEXT'),
+           'trend': ('trend', 'TEXT'),
+           'cyclic_period (3 months)': ('cyclic_period', 'TEXT'),
+           'data_size': ('data_size', 'INTEGER'),
+           'percentage_outliers': ('percentage_outliers', 'REAL'),
+           'percentage_missing': ('percentage_missing', 'REAL'),
+           'freq': ('freq', 'TEXT')}
+
+# the Python type each SQLite type is stored from
+TYPES = {'TEXT': str, 'INTEGER': int, 'REAL': float}
+
+
+class MetadataIndex:
+    """
+        A SQLite table of the metadata of the produced time series, with an indexed column per configuration field.
+    """
+
+    def __init__(self, path: str = METADATA_INDEX_FILE):
+        self.__path = path
+
+    @property
+    def path(self):
+        return self.__path
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+            Opens the database, creating its table and indexes if needed
+
+        Returns:
+            (
+            sqlite3.Connection: the connection, which waits for the appends of other processes to finish.)
+        """
+        connection = sqlite3.connect(self.__path, timeout=60)
+        connection.execute('PRAGMA journal_mode=WAL')
+        columns = ', '.join(f'{column} {sql_type}' + (' PRIMARY KEY' if column == 'id' else '')
+                            for column, sql_type in COLUMNS.values())
+        with connection:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS series ({columns}, extra TEXT)')
+            for column, _ in list(COLUMNS.values())[1:]:
+                connection.execute(f'CREATE INDEX IF NOT EXISTS series_{column} ON series ({column})')
+        return connection
+
+    def create(self) -> None:
+        """
+            Creates the database, its table and indexes if they do not exist yet, before several processes append
+            to it
+        """
+        self.__connect().close()
+
+    @staticmethod
+    def __row(record: dict) -> tuple:
+        """
+            Turns a metadata record into a row of the table
+        Args:
+            record (dict): the metadata record.
+
+        Returns:
+            (
+            tuple: the typed value of each column, then the other fields as JSON.)
+        """
+        values = tuple(None if record.get(key) is None else TYPES[sql_type](record[key])
+                       for key, (_, sql_type) in COLUMNS.items())
+        extra = {key: value for key, value in record.items() if key not in COLUMNS}
+        return values + (json.dumps(extra, default=str),)
+
+    @staticmethod
+    def __record(row: sqlite3.Row) -> dict:
+        """
+            Turns a row of the table back into a metadata record
+        Args:
+            row (sqlite3.Row): the row.
+
+        Returns:
+            (
+            dict: the metadata record.)
+        """
+        return {**{key: row[column] for key, (column, _) in COLUMNS.items()}, **json.loads(row['extra'])}
+
+    def append(self, records: list) -> None:
+        """
+            Records the metadata of produced time series, in one transaction
+        Args:
+            records (list): the metadata records, each holding the id of its time series.
+        """
+        placeholders = ', '.join('?' * (len(COLUMNS) + 1))
+        connection = self.__connect()
+        try:
+            with connection:
+                connection.executemany(f'INSERT OR REPLACE INTO series VALUES ({placeholders})',
+                                       [self.__row(record) for record in records])
+        finally:
+            connection.close()
+
+    @staticmethod
+    def __where(criteria: dict) -> (str, list):
+        """
+            Builds the WHERE clause selecting the time series matching some criteria
+        Args:
+            criteria (dict): a value or a list of accepted values by column, e.g. {'freq': ['10T', '1H']}.
+
+        Returns:
+            (
+            str: the clause, empty without criteria.
+            list: the parameters of the clause.)
+        """
+        columns = {column for column, _ in COLUMNS.values()}
+        conditions, parameters = [], []
+        for column, value in criteria.items():
+            if column not in columns:
+                raise ValueError(f"Unknown metadata column {column!r}, expected one of {sorted(columns)}")
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+            parameters.extend(values)
+        return (' WHERE ' + ' AND '.join(conditions)) if conditions else '', parameters
+
+    def select(self, **criteria) -> list:
+        """
+            Selects the metadata of the time series matching all the criteria, e.g.
+            select(data_type='multiplicative', freq='10T', trend='exist')
+        Args:
+            **criteria: a value or a list of accepted values by column, the columns being the metadata fields and
+                cyclic_period for the 'cyclic_period (3 months)' field.
+
+        Returns:
+            (
+            list: the metadata records of the matching time series.)
+        """
+        where, parameters = self.__where(criteria)
+        connection = self.__connect()
+        connection.row_factory = sqlite3.Row
+        try:
+            return [self.__record(row) for row in connection.execute(f'SELECT * FROM series{where}', parameters)]
+        finally:
+            connection.close()
+
+    def count(self, **criteria) -> int:
+        """
+            Counts the time series matching all the criteria
+        Args:
+            **criteria: a value or a list of accepted values by column, as in select.
+
+        Returns:
+            (
+            int: the number of matching time series.)
+        """
+        where, parameters = self.__where(criteria)
+        connection = self.__connect()
+        try:
+            return connection.execute(f'SELECT COUNT(*) FROM series{where}', parameters).fetchone()[0]
+        finally:
+            connection.close()
+
+    def truncate(self, count: int) -> None:
+        """
+            Removes the time series whose id is count or more, e.g. those a previous run produced beyond the
+            number of time series of the run resuming it
+        Args:
+            count (int): the number of time series kept.
+        """
+        connection = self.__connect()
+        try:
+            with connection:
+                connection.execute('DELETE FROM series WHERE CAST(id AS INTEGER) >= ?', (count,))
+        finally:
+            connection.close()
+
+    def clear(self) -> None:
+        """
+            Removes the index left by a previous run
+        """
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.__path + suffix):
+                os.remove(self.__path + suffix)
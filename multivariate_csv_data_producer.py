@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import os
+from csv_data_producer import CSVDataProducer
+from stage_profiler import profile_stage
+from timestamp_range import TimestampRange, to_datetime_index
+
+
+class MultivariateCSVDataProducer(CSVDataProducer):
+    """
+        Writes each multivariate time series as one wide .csv table: a timestamp column, unless the timestamps
+        are written as a range, a value column per channel and an anomaly column per channel, named after the
+        channel with an _anomaly suffix. The metadata has a row per channel, with the configuration of the
+        channel.
+    """
+
+    def _columns(self, time_series: pd.DataFrame, date_range, anomaly_mask: np.ndarray) -> dict:
+        """
+            the columns of the wide .csv file of a multivariate time series, the timestamp column only being written
+            in column mode
+        """
+        columns = {'timestamp': to_datetime_index(date_range)} if self.timestamps == 'column' else {}
+        columns.update((channel, time_series[channel].to_numpy()) for channel in time_series.columns)
+        columns.update((f'{channel}_anomaly', anomaly_mask[:, position])
+                       for position, channel in enumerate(time_series.columns))
+        return columns
+
+    def __add_channels_metadata(self, channels: list, channel_configs: list, filename: str, **fields) -> None:
+        """
+            Records a metadata row per channel of a multivariate time series, all of them with its id
+        Args:
+            channels (list): the names of the channels.
+            channel_configs (list): the configuration of each channel.
+            filename (str): the name of the .csv file, used as the id of the time series.
+            **fields: the fields shared by the channels.
+        """
+        if len(channel_configs) != len(channels):
+            raise ValueError(f"Expected the configuration of {len(channels)} channels, got {len(channel_configs)}")
+        for channel, config in zip(channels, channel_configs):
+            self._add_metadata(config, filename, channel=channel, channels=len(channels), **fields)
+
+    def produce_data(self, time_series: pd.DataFrame, date_range: TimestampRange | pd.DatetimeIndex,
+                     anomaly_mask: np.ndarray, config_manager: list, filename: str = None) -> None:
+        """
+            Generates a .csv file containing the multivariate time series data
+        Args:
+            time_series (pandas.DataFrame): the time series to be saved to file, with one column per channel.
+            date_range (TimestampRange | pandas.DatetimeIndex): the timestamps shared by the channels.
+            anomaly_mask (np.ndarray): indicates whether each point of each channel is an anomaly or not.
+            config_manager (list): the configuration of each channel, e.g. as drawn by
+                MultivariateTimeSeriesGenerator.draw_channel_configs.
+            filename (str): the name of the .csv file to be created.
+
+        """
+        with profile_stage(self._profiler, 'write', time_series.size, filename) as record:
+            pd.DataFrame(self._columns(time_series, date_range, anomaly_mask))\
+                .to_csv(f"./sample_datasets/{filename}.csv", encoding='utf-8', index=False)
+            record['bytes_written'] = os.path.getsize(f"./sample_datasets/{filename}.csv")
+        self.__add_channels_metadata(list(time_series.columns), config_manager, filename,
+                                     **(self._range_fields(date_range) if self.timestamps == 'range' else {}))
+
+    def produce_chunks(self, chunks, config_manager: list, filename: str = None) -> None:
+        """
+            Generates a wide .csv file containing the multivariate time series data, appending it one chunk at a
+            time
+        Args:
+            chunks: an iterable of (timestamps, values, anomaly mask) chunks, the values being a DataFrame with one
+                column per channel and the anomaly mask a matching array.
+            config_manager (list): the configuration of each channel.
+            filename (str): the name of the .csv file to be created.
+
+        """
+        fields, channels = {}, []
+        with open(f"./sample_datasets/{filename}.csv", 'w', encoding='utf-8', newline='') as file:
+            for chunk_num, (timestamps, values, anomaly_mask) in enumerate(chunks):
+                with profile_stage(self._profiler, 'write', values.size, filename) as record:
+                    start = file.tell()
+                    pd.DataFrame(self._columns(values, timestamps, anomaly_mask))\
+                        .to_csv(file, header=chunk_num == 0, index=False)
+                    record['bytes_written'] = file.tell() - start
+                if chunk_num == 0:
+                    channels = list(values.columns)
+                    if self.timestamps == 'range':
+                        fields = self._range_fields(timestamps)
+        self.__add_channels_metadata(channels, config_manager, filename, **fields)
+
+    @staticmethod
+    def load_data(filename: str, record: dict = None) -> (pd.DataFrame, TimestampRange | pd.DatetimeIndex,
+                                                          np.ndarray):
+        """
+            Loads a multivariate time series written by produce_data
+        Args:
+            filename (str): the name of the .csv file, without extension.
+            record (dict): the metadata record of the time series, needed when its timestamps were written as a
+                range.
+
+        Returns:
+            (
+            pd.DataFrame: the time series, with one column per channel.
+            TimestampRange | pd.DatetimeIndex: the timestamps shared by the channels.
+            np.ndarray: indicates whether each point of each channel is an anomaly or not.)
+        """
+        table = pd.read_csv(f"./sample_datasets/{filename}.csv")
+        timestamps = CSVDataProducer._read_timestamps(table, record, filename)
+        anomaly_columns = [column for column in table.columns if column.endswith('_anomaly')]
+        channels = [column[:-len('_anomaly')] for column in anomaly_columns]
+        return table[channels], timestamps, table[anomaly_columns].to_numpy(dtype=bool)
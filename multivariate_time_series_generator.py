@@ -0,0 +1,183 @@
+from __future__ import annotations
+import numpy as np
+from typing import TYPE_CHECKING
+from configuration_manager import ConfigurationManager
+from configuration_plan import FIELDS, NoiseLevel, SeriesConfig
+from counter_rng import CounterRNG
+from index_sampler import IndexSampler
+from stage_profiler import StageProfiler, profile_stage
+from time_series_simulator import TimeSeriesGenerator
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from timestamp_range import TimestampRange
+
+
+class MultivariateTimeSeriesGenerator:
+    """
+        Generates multivariate time series: k channels over one shared TimestampRange, computed together in one
+        pass as a (k, number of points) matrix instead of k univariate time series joined on their timestamps.
+
+        Each channel has its own configuration, of which only the start date, duration, frequency and percentages of
+        outliers and missing values of the first channel are shared. The scaled components of the channels are
+        mixed by the lower Cholesky factor L of the correlation matrix, channel i being sum_j L[i, j] *
+        components[j] scaled back to [-1, 1], so the channels share patterns as much as they are correlated and an
+        identity matrix keeps them independent. The noise of the channels is drawn the same way, as L times
+        independent standard normal draws, so it has exactly the correlation matrix as covariance before being
+        scaled by the value of each point like univariate noise.
+
+        An anomaly event happens at a timestamp and spans several channels: an outlier event replaces the points
+        of span of the channels, chosen at random, by outliers, and a missing event removes the points of every
+        channel. Outlier and missing events are drawn jointly at disjoint timestamps, as in TimeSeriesGenerator,
+        with the percentages of outliers and missing values the channels share.
+    """
+
+    def __init__(self, config_manager: ConfigurationManager, correlation, span: int = 1, channel_names: list = None,
+                 seed=None, profiler: StageProfiler = None):
+        """
+        Args:
+            config_manager (ConfigurationManager): draws the configuration of each channel.
+            correlation: the (k, k) correlation matrix of the channels, symmetric positive definite with a unit
+                diagonal.
+            span (int): the number of channels an outlier event spans.
+            channel_names (list): the names of the k channels, channel_<i> by default.
+            seed: the seed of the generator drawing the seed of each multivariate time series.
+            profiler (StageProfiler): records the duration of each generation stage when given.
+        """
+        correlation = np.array(correlation, dtype=float)
+        if correlation.ndim != 2 or correlation.shape[0] != correlation.shape[1] \
+                or not np.allclose(correlation, correlation.T) or not np.allclose(np.diag(correlation), 1):
+            raise ValueError("The correlation matrix must be a symmetric square matrix with a unit diagonal")
+        try:
+            self.__mixing = np.linalg.cholesky(correlation)
+        except np.linalg.LinAlgError:
+            raise ValueError("The correlation matrix must be positive definite") from None
+        if not 1 <= span <= len(correlation):
+            raise ValueError(f"An outlier event must span between 1 and {len(correlation)} channels")
+        self.__config_manager = config_manager
+        self.__correlation = correlation
+        self.__span = span
+        self.__channel_names = list(channel_names) if channel_names is not None \
+            else [f'channel_{channel}' for channel in range(len(correlation))]
+        if len(self.__channel_names) != len(correlation):
+            raise ValueError("There must be one name per channel")
+        self.__rng = np.random.default_rng(seed)
+        self.__generator = TimeSeriesGenerator(config_manager, profiler=profiler)
+        self.__profiler = profiler
+
+    @property
+    def correlation(self):
+        return self.__correlation
+
+    @property
+    def span(self):
+        return self.__span
+
+    @property
+    def channel_names(self):
+        return self.__channel_names
+
+    @property
+    def num_channels(self) -> int:
+        return len(self.__correlation)
+
+    def draw_channel_configs(self) -> list:
+        """
+            Draws the configuration of each channel from the configuration manager, which is re-configured after
+            each channel. The channels take the start date, duration, frequency and percentages of outliers and
+            missing values of the first one, as the anomaly events span the channels.
+
+        Returns:
+            (
+            list: the SeriesConfig of each channel.)
+        """
+        configs = []
+        for _ in range(self.num_channels):
+            configs.append(self.__config_manager.snapshot())
+            self.__config_manager.configure()
+        shared = {field: getattr(configs[0], field)
+                  for field in ('duration', 'frequency', 'percentage_outliers', 'percentage_missing')}
+        return [configs[0]] + [SeriesConfig(configs[0].start_date,
+                                            **{field: getattr(config, field) for field in FIELDS} | shared)
+                               for config in configs[1:]]
+
+    @staticmethod
+    def __scale_rows(values: np.ndarray) -> np.ndarray:
+        """
+            scales each row of a matrix to [-1, 1] in place, a constant row is mapped to -1.
+        Args:
+            values (np.ndarray): the matrix.
+
+        Returns:
+            (
+            np.ndarray: the scaled matrix, the same array as values)
+        """
+        data_min = values.min(axis=1, keepdims=True)
+        data_range = values.max(axis=1, keepdims=True) - data_min
+        values -= data_min
+        values *= 2 / np.where(data_range == 0, 1, data_range)
+        values -= 1
+        return values
+
+    def generate_time_series(self, channel_configs: list = None,
+                             seed=None) -> (pd.DataFrame, TimestampRange, np.ndarray):
+        """
+            Generates a multivariate time series.
+        Args:
+            channel_configs (list): the configuration of each channel, drawn by draw_channel_configs by default.
+            seed: the seed of the time series, drawn from the generator of this MultivariateTimeSeriesGenerator by
+                default.
+
+        Returns:
+
+        (
+            pd.DataFrame: the generated time series, with one column per channel.
+            TimestampRange: the timestamps shared by the channels.
+            np.ndarray: indicates whether each point of each channel is an anomaly or not, shaped like the
+                DataFrame.
+        )
+        """
+        import pandas as pd
+        configs = self.draw_channel_configs() if channel_configs is None else channel_configs
+        if len(configs) != self.num_channels:
+            raise ValueError(f"Expected the configuration of {self.num_channels} channels, got {len(configs)}")
+        seed = self.__rng.integers(2 ** 63, size=2).tolist() if seed is None else seed
+        seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        # every channel has its own randomness, the anomaly events have the one of the time series
+        rngs = [CounterRNG(np.random.SeedSequence(seed.entropy, spawn_key=(*seed.spawn_key, channel)))
+                for channel in range(self.num_channels)]
+        events = CounterRNG(seed)
+
+        with profile_stage(self.__profiler, 'multivariate_components') as record:
+            components, date_range = self.__generator.generate_components(configs, rngs)
+            record['points'] = group_points = components.size
+        num_points = len(date_range)
+        with profile_stage(self.__profiler, 'multivariate_mixing', group_points):
+            time_series = self.__scale_rows(self.__mixing @ self.__scale_rows(components))
+            del components
+
+        with profile_stage(self.__profiler, 'multivariate_noise', group_points):
+            noise = np.empty_like(time_series)
+            for channel, rng in enumerate(rngs):
+                rng.standard_normal(0, num_points, out=noise[channel])
+            noise = self.__mixing @ noise
+            noise *= np.array([[NoiseLevel(config.noise_level_code).scale] for config in configs])
+            noise *= time_series
+            time_series += noise
+            del noise
+
+        with profile_stage(self.__profiler, 'multivariate_anomalies', group_points):
+            outlier_times, missing_times = IndexSampler(events).sample(
+                num_points, [int(num_points * configs[0].percentage_outliers),
+                             int(num_points * configs[0].percentage_missing)])
+            # the channels of an outlier event are the span ones with the smallest draws at its timestamp
+            draws = events.uniform(outlier_times[:, None] * self.num_channels + np.arange(self.num_channels))
+            channels = np.argsort(draws, axis=1)[:, :self.__span]
+            anomaly_mask = np.zeros_like(time_series, dtype=bool)
+            anomaly_mask[channels, outlier_times[:, None]] = True
+            for channel, rng in enumerate(rngs):
+                times = np.flatnonzero(anomaly_mask[channel])
+                time_series[channel, times] = rng.uniform(times, -1, 1)
+            time_series[:, missing_times] = np.nan
+
+        return pd.DataFrame(time_series.T, columns=self.__channel_names, copy=False), date_range, anomaly_mask.T
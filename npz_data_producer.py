@@ -0,0 +1,102 @@
+import os
+import numpy as np
+from data_producer import DataProducer
+import pandas as pd
+from configuration_manager import ConfigurationManager
+from stage_profiler import profile_stage
+from csv_data_producer import TIMESTAMP_MODES
+from timestamp_range import TimestampRange, to_datetime_index, to_timestamp_range
+
+
+class NPZDataProducer(DataProducer):
+
+    def __init__(self, dtype=np.float64, compress: bool = True, timestamps: str = 'column'):
+        """
+        Args:
+            dtype: the dtype the values are saved in.
+            compress (bool): whether the .npz files are compressed.
+            timestamps (str): how the timestamps are saved, "column" saves each of them and "range" only saves
+                the start and step of the time series, load_data rebuilding them as a TimestampRange.
+        """
+        super().__init__()
+        if timestamps not in TIMESTAMP_MODES:
+            raise ValueError(f"The timestamps must be saved as one of {TIMESTAMP_MODES}, not {timestamps!r}")
+        self.__dtype = np.dtype(dtype)
+        self.__compress = compress
+        self.__timestamps = timestamps
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    @property
+    def compress(self):
+        return self.__compress
+
+    @property
+    def timestamps(self):
+        return self.__timestamps
+
+    def produce_data(self, time_series: pd.Series, date_range: TimestampRange | pd.DatetimeIndex,
+                     anomaly_mask: np.ndarray, config_manager: ConfigurationManager, filename: str = None) -> None:
+        """
+            Generates a .npz file containing the time series data as binary columns: int64 epoch timestamps in
+            nanoseconds, or only the first one and the step between them in range mode, the values in the
+            producer's dtype and the bit-packed anomaly mask
+        Args:
+            time_series (pandas.Series): the time series to be saved to file.
+            date_range (TimestampRange | pandas.DatetimeIndex): the timestamps of the data points in the time series.
+            anomaly_mask (np.ndarray): indicates whether each point is an anomaly or not.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename (str): the name of the .npz file to be created.
+
+        """
+        save = np.savez_compressed if self.__compress else np.savez
+        with profile_stage(self._profiler, 'write', len(date_range), filename) as record:
+            if self.__timestamps == 'range':
+                timestamp_range = to_timestamp_range(date_range)
+                timestamps = {'start': np.int64(timestamp_range.start.value),
+                              'step': np.int64(timestamp_range.step.value)}
+            else:
+                timestamps = {'timestamp': to_datetime_index(date_range).asi8}
+            save(f"./sample_datasets/{filename}.npz",
+                 **timestamps,
+                 value=np.asarray(time_series, dtype=self.__dtype),
+                 anomaly=np.packbits(np.asarray(anomaly_mask, dtype=bool)),
+                 length=np.int64(len(date_range)))
+            record['bytes_written'] = os.path.getsize(f"./sample_datasets/{filename}.npz")
+        self._add_metadata(config_manager, filename,
+                           **(self._range_fields(date_range) if self.__timestamps == 'range' else {}))
+
+    @staticmethod
+    def load_data(filename: str) -> (pd.Series, TimestampRange | pd.DatetimeIndex, np.ndarray):
+        """
+            Loads a time series saved by produce_data
+        Args:
+            filename (str): the name of the .npz file, without its extension.
+
+        Returns:
+            (
+            pd.Series: the time series.
+            TimestampRange | pd.DatetimeIndex: the timestamps of the data points in the time series, a
+                TimestampRange when only their start and step were saved.
+            np.ndarray: indicates whether each point is an anomaly or not.)
+        """
+        with np.load(f"./sample_datasets/{filename}.npz") as data:
+            length = int(data['length'])
+            timestamps = pd.DatetimeIndex(data['timestamp']) if 'timestamp' in data.files \
+                else TimestampRange(pd.Timestamp(int(data['start'])), pd.Timedelta(int(data['step'])), length)
+            return (pd.Series(data['value']), timestamps,
+                    np.unpackbits(data['anomaly'], count=length).astype(bool))
+
+    def checksum(self, record: dict) -> str:
+        """
+            Computes the checksum of the .npz file of a produced time series
+        Args:
+            record (dict): the metadata record of the time series.
+
+        Returns:
+            (
+            str: the SHA-256 digest of the file.)
+        """
+        return self._file_checksum(f"./sample_datasets/{record['id']}.npz")
@@ -0,0 +1,224 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from time_series_simulator import TimeSeriesGenerator
+from background_data_producer import BackgroundDataProducer
+from stage_profiler import StageProfiler
+from manifest import Manifest
+from metadata_index import MetadataIndex
+
+
+class ParallelRunner:
+    """
+        Generates and produces the configured number of time series on a pool of worker processes.
+
+        The configurations of all the series are drawn up front into a plan, seeded with the root SeedSequence
+        and saved to sample_datasets/plan.npz. The series are then split into consecutive blocks of batch_size
+        series and every series draws the rest of its randomness from its own generator, seeded with the
+        series' child of the root SeedSequence. The output therefore only depends on the seed, whatever the
+        number of workers and the batch size, and any series can be regenerated alone with LazyDataset.
+        With background_writer, every block writes its time series on a background thread while it generates.
+        With profile, every block records the time spent in each generation and write stage, and with trace_memory
+        the bytes each stage allocates too, the records of all the blocks are gathered in the runner's profiler and
+        summarized in sample_datasets/profile.jsonl. As the stages of a profiler tracing memory must not overlap,
+        trace_memory writes in the foreground, whatever background_writer.
+
+        Every produced time series is recorded in the manifest as soon as it is written, and the metadata of each
+        block is appended to the metadata index once the block is written. The time series are laid out in id order
+        in the stores the producers of the run share, each block writing to the place reserved for its time series,
+        so the output does not depend on the order the blocks finish in either. With resume, the time series of a
+        previous run with the same seed and configuration whose output still matches its checksum are neither
+        generated nor written again.
+    """
+
+    def __init__(self, config_manager_class: type, data_producer_class: type, workers: int = 1, seed: int = 22,
+                 batch_size: int = 256, background_writer: bool = True, profile: bool = False,
+                 resume: bool = False, trace_memory: bool = False):
+        self.__config_manager_class = config_manager_class
+        self.__data_producer_class = data_producer_class
+        self.__workers = workers
+        self.__seed = seed
+        self.__batch_size = batch_size
+        self.__background_writer = background_writer and not trace_memory
+        self.__profiler = StageProfiler(trace_memory=trace_memory) if profile or trace_memory else None
+        self.__resume = resume
+        self.__manifest = Manifest(run_fields={'seed': seed})
+        self.__metadata_index = MetadataIndex()
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    @property
+    def seed(self):
+        return self.__seed
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    @property
+    def manifest(self):
+        return self.__manifest
+
+    @property
+    def metadata_index(self):
+        return self.__metadata_index
+
+    def series_seed(self, series_num: int) -> np.random.SeedSequence:
+        """
+            derives the seed of a time series from the root seed
+        Args:
+            series_num (int): the id of the time series.
+
+        Returns:
+            (
+            np.random.SeedSequence: the time series' child of the root seed sequence.)
+        """
+        return TimeSeriesGenerator.series_seed(self.__seed, series_num)
+
+    def run(self) -> None:
+        """
+            Generates all the time series, produces them with one data producer per block and writes the metadata
+            of the whole run once every block is done.
+        """
+        config_manager = self.__config_manager_class()
+        config_manager.rng = np.random.default_rng(np.random.SeedSequence(self.__seed))
+        config_manager.load_config()
+        plan = config_manager.compile_plan()
+        datasets_num = len(plan)
+        os.makedirs('sample_datasets', exist_ok=True)
+        plan.save('sample_datasets/plan.npz')
+        # a time series produced with another configuration is not reused, the plan being compiled from it
+        self.__manifest = Manifest(run_fields={'seed': self.__seed, 'plan': plan.fingerprint()})
+
+        if self.__resume:
+            completed = self.__manifest.load()
+            # a previous run may have produced more time series than this one
+            self.__metadata_index.truncate(datasets_num)
+        else:
+            self.__manifest.clear()
+            self.__metadata_index.clear()
+            completed = {}
+        self.__metadata_index.create()
+
+        # the places in a shared store are only reserved for the producers that write there, the data producer
+        # class being the producer itself or a partial of it
+        uses_layout = getattr(self.__data_producer_class, 'func', self.__data_producer_class).uses_layout
+        lengths = _series_lengths(plan) if uses_layout else None
+        offsets = np.cumsum(lengths) - lengths if uses_layout else None
+        blocks = []
+        for first_series_num in range(0, datasets_num, self.__batch_size):
+            count = min(self.__batch_size, datasets_num - first_series_num)
+            block_completed = {str(series_num): completed[str(series_num)]
+                               for series_num in range(first_series_num, first_series_num + count)
+                               if str(series_num) in completed}
+            layout = {str(series_num): (int(offsets[series_num]), int(lengths[series_num]))
+                      for series_num in range(first_series_num, first_series_num + count)} if uses_layout else None
+            blocks.append((self.__config_manager_class, self.__data_producer_class, self.__background_writer,
+                           self.__profiler is not None and self.__profiler.trace_memory,
+                           self.__profiler is not None, self.__manifest, self.__metadata_index, block_completed,
+                           layout, plan[first_series_num:first_series_num + count], self.__seed, first_series_num))
+
+        if self.__workers > 1:
+            with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+                blocks_results = list(executor.map(_produce_block, blocks))
+        else:
+            blocks_results = [_produce_block(block) for block in blocks]
+
+        data_producer = self.__data_producer_class()
+        data_producer.metadata = [record for block_metadata, _ in blocks_results for record in block_metadata]
+        data_producer.generate_metadata_file()
+
+        if self.__profiler is not None:
+            for _, block_records in blocks_results:
+                self.__profiler.extend(block_records)
+            self.__profiler.write_summary()
+
+
+def _produce_block(block: tuple) -> (list, list):
+    """
+        Generates and produces one block of time series, this runs inside the worker processes.
+    Args:
+        block (tuple): the configuration manager class, data producer class, whether to write on a background
+            thread, whether to trace the memory allocations, whether to profile, manifest, metadata index, manifest
+            entries of the time series of the block completed by a previous run, (offset, length) reserved for each
+            time series of the block, configuration plan of the block, seed of the run and id of the first time
+            series.
+
+    Returns:
+        (
+        list: the metadata records of the produced time series, in id order.
+        list: the profiling records of the block, empty when it is not profiled.)
+    """
+    (config_manager_class, data_producer_class, background_writer, trace_memory, profile, manifest, metadata_index,
+     completed, layout, plan, seed, first_series_num) = block
+    count = len(plan)
+    profiler = StageProfiler(trace_memory=trace_memory) if profile else None
+
+    data_producer = data_producer_class()
+    valid = {series_id: entry['metadata'] for series_id, entry in completed.items()
+             if _is_valid(data_producer, entry)}
+    if len(valid) == count:
+        metadata = sorted(valid.values(), key=lambda record: int(record['id']))
+        metadata_index.append(metadata)
+        return metadata, []
+
+    generator = TimeSeriesGenerator(config_manager=config_manager_class(), profiler=profiler)
+    # every time series has its own seed, so the valid time series of a previous run can simply be left out
+    pending = [series_num for series_num in range(count) if str(first_series_num + series_num) not in valid]
+    seeds = [TimeSeriesGenerator.series_seed(seed, first_series_num + series_num) for series_num in pending]
+    if background_writer:
+        data_producer = BackgroundDataProducer(data_producer)
+    data_producer.profiler = profiler
+    data_producer.manifest = manifest
+    data_producer.layout = layout
+
+    # each group is handed to the producer as soon as it is generated, so its writes overlap the next group
+    for series_ids, time_series, data_range, anomaly_mask, configs in generator.iter_batch(len(pending),
+                                                                                           plan[pending], seeds):
+        for row, position in enumerate(series_ids):
+            data_producer.produce_data(pd.Series(time_series[row]), data_range, anomaly_mask[row], configs[row],
+                                       str(first_series_num + pending[position]))
+    data_producer.close()
+    metadata = sorted(data_producer.metadata + list(valid.values()), key=lambda record: int(record['id']))
+    metadata_index.append(metadata)
+    if profiler is not None:
+        profiler.stop_tracing()
+    return metadata, profiler.records if profiler is not None else []
+
+
+def _series_lengths(plan) -> np.ndarray:
+    """
+        Computes the number of points of every time series of a plan, once per duration and frequency
+    Args:
+        plan (ConfigurationPlan): the configurations of the time series.
+
+    Returns:
+        (
+        np.ndarray: the number of points of each time series.)
+    """
+    lengths = np.empty(len(plan), dtype=np.int64)
+    combinations = plan.series[['duration', 'frequency']]
+    for combination in np.unique(combinations):
+        same = combinations == combination
+        lengths[same] = TimeSeriesGenerator.series_length(plan[int(np.argmax(same))])
+    return lengths
+
+
+def _is_valid(data_producer, entry: dict) -> bool:
+    """
+        Checks that the output of a time series recorded in the manifest is still intact
+    Args:
+        data_producer: the data producer the time series was produced with.
+        entry (dict): the manifest entry of the time series.
+
+    Returns:
+        (
+        bool: whether the output exists and matches its checksum.)
+    """
+    try:
+        return data_producer.checksum(entry['metadata']) == entry['checksum']
+    except OSError:
+        return False
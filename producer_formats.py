@@ -0,0 +1,39 @@
+from functools import partial
+from importlib import import_module
+
+# the data producer of each output format, by module and class name, imported only when the format is used
+FORMATS = {'csv': ('csv_data_producer', 'CSVDataProducer'),
+           'npz': ('npz_data_producer', 'NPZDataProducer'),
+           'memmap': ('memmap_data_producer', 'MemmapDataProducer'),
+           'stream': ('streaming_data_producer', 'StreamingDataProducer')}
+
+
+def data_producer_class(output_format: str, timestamps: str = 'column', address: str = '127.0.0.1:9999',
+                        speedup: float = None, framing: str = 'line', resume: bool = False):
+    """
+        Imports the data producer of an output format and binds its options, the other producers and their
+        dependencies are never imported
+    Args:
+        output_format (str): one of FORMATS.
+        timestamps (str): how the csv and npz producers write the timestamps, 'column' or 'range'.
+        address (str): the address the stream producer streams to, as parse_address expects it.
+        speedup (float): how many times faster than its frequency the stream producer emits a time series.
+        framing (str): the framing of the stream producer, 'line' or 'binary'.
+        resume (bool): whether the run resumes a previous one, which keeps the memmap store.
+
+    Returns:
+        (
+        the data producer class, with its options bound, to be instantiated without arguments by the runner.)
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}, expected one of {tuple(FORMATS)}")
+    module_name, class_name = FORMATS[output_format]
+    module = import_module(module_name)
+    producer_class = getattr(module, class_name)
+    if output_format in ('csv', 'npz'):
+        return partial(producer_class, timestamps=timestamps)
+    if output_format == 'memmap':
+        if not resume:
+            producer_class.clear_store()
+        return producer_class
+    return partial(producer_class, address=module.parse_address(address), speedup=speedup, framing=framing)
@@ -0,0 +1,144 @@
+import json
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+
+class StageProfiler:
+    """
+        Records the wall time, number of points and bytes allocated or written of each stage of the generation
+        and production of the time series. The generator and the data producers only profile their stages when
+        a profiler is attached to them, so the instrumentation costs nothing otherwise. Memory allocations are
+        only traced with trace_memory, which slows every stage down noticeably: tracing starts with the first stage
+        and lasts until stop_tracing. The bytes a stage allocates are measured from the peak of the whole process,
+        so the stages of a profiler tracing memory must not overlap, e.g. on a background writer thread.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.__trace_memory = trace_memory
+        self.__records = []
+        self.__started_tracing = False
+
+    @property
+    def records(self) -> list:
+        return self.__records
+
+    @property
+    def trace_memory(self):
+        return self.__trace_memory
+
+    def _start_tracing(self) -> None:
+        """
+            Starts tracing the memory allocations, unless they already are
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracing = True
+
+    def stop_tracing(self) -> None:
+        """
+            Stops tracing the memory allocations if this profiler started it
+        """
+        if self.__started_tracing:
+            tracemalloc.stop()
+            self.__started_tracing = False
+
+    def extend(self, records: list) -> None:
+        """
+            Adds records collected by another profiler, e.g. the profiler of a worker process
+        Args:
+            records (list): the records to add.
+        """
+        self.__records.extend(records)
+
+    def stage(self, name: str, points: int = 0, series=None) -> '_Stage':
+        """
+            Creates a context manager profiling one stage, the record it yields can be completed inside the block,
+            e.g. with the number of bytes written
+        Args:
+            name (str): the name of the stage.
+            points (int): the number of points processed by the stage.
+            series: the id of the time series, if known.
+
+        Returns:
+            (
+            _Stage: the context manager of the stage.)
+        """
+        return _Stage(self, name, points, series)
+
+    def summary(self) -> list:
+        """
+            Aggregates the records per stage
+
+        Returns:
+            (
+            list: a record per stage, in the order the stages were first seen, holding the number of calls and the
+                total points, seconds, points per second and bytes allocated and written.)
+        """
+        stages = {}
+        for record in self.__records:
+            total = stages.setdefault(record['stage'], {'stage': record['stage'], 'calls': 0, 'points': 0,
+                                                        'seconds': 0.0, 'bytes_allocated': 0, 'bytes_written': 0})
+            total['calls'] += 1
+            total['points'] += record['points']
+            total['seconds'] += record['seconds']
+            total['bytes_allocated'] += record['bytes_allocated'] or 0
+            total['bytes_written'] += record['bytes_written'] or 0
+        for total in stages.values():
+            total['points_per_second'] = total['points'] / total['seconds'] if total['seconds'] > 0 else None
+        return list(stages.values())
+
+    def write_summary(self, path: str = 'sample_datasets/profile.jsonl', include_records: bool = False) -> None:
+        """
+            Writes the summary as JSON lines, one per stage, optionally followed by every record
+        Args:
+            path (str): the file to write.
+            include_records (bool): whether to write the individual records after the summary.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            for line in self.summary() + (self.__records if include_records else []):
+                file.write(json.dumps(line) + '\n')
+
+
+class _Stage:
+    """
+        Context manager measuring one stage for a StageProfiler
+    """
+
+    def __init__(self, profiler: StageProfiler, name: str, points: int, series):
+        self.__profiler = profiler
+        self.__record = {'stage': name, 'series': series, 'points': int(points), 'seconds': 0.0,
+                         'bytes_allocated': None, 'bytes_written': None}
+        self.__start = None
+        self.__start_memory = 0
+
+    def __enter__(self) -> dict:
+        if self.__profiler.trace_memory:
+            self.__profiler._start_tracing()
+            tracemalloc.reset_peak()
+            self.__start_memory = tracemalloc.get_traced_memory()[0]
+        self.__start = time.perf_counter()
+        return self.__record
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.__record['seconds'] = time.perf_counter() - self.__start
+        if self.__profiler.trace_memory:
+            self.__record['bytes_allocated'] = tracemalloc.get_traced_memory()[1] - self.__start_memory
+        if exc_type is None:
+            self.__profiler.records.append(self.__record)
+        return False
+
+
+def profile_stage(profiler: StageProfiler, name: str, points: int = 0, series=None):
+    """
+        Profiles a stage with the given profiler, or does nothing when there is none
+    Args:
+        profiler (StageProfiler): the profiler, or None when profiling is disabled.
+        name (str): the name of the stage.
+        points (int): the number of points processed by the stage.
+        series: the id of the time series, if known.
+
+    Returns:
+        a context manager yielding the record of the stage, a throwaway dict when profiling is disabled.
+    """
+    return nullcontext({}) if profiler is None else profiler.stage(name, points, series)
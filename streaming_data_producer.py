@@ -0,0 +1,314 @@
+import asyncio
+import copy
+import hashlib
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from data_producer import DataProducer
+from configuration_manager import ConfigurationManager
+from timestamp_range import to_datetime_index
+
+# a binary frame is one data point: the channel of its time series, its epoch timestamp in nanoseconds, its value
+# and its anomaly label, little-endian and without padding (21 bytes)
+FRAME_DTYPE = np.dtype([('channel', '<u4'), ('timestamp', '<i8'), ('value', '<f8'), ('anomaly', '?')])
+FRAMINGS = ('line', 'binary')
+
+
+class StreamingDataProducer(DataProducer):
+    """
+        Streams the data points of the time series over a TCP socket, a Unix socket or stdout instead of saving
+        them, to feed live traffic to anomaly detectors.
+
+        Every time series is streamed by its own task of an asyncio event loop running on a background thread,
+        so many time series are multiplexed on the same connection. The points of a time series are tagged with
+        its id as their channel, which stays unique across the producers of a run and is kept in its metadata.
+        A point is emitted when its timestamp is reached, counted from the start of its time series and sped up
+        by speedup, e.g. an hourly time series emits a point per second with a speedup of 3600; without speedup
+        the points are emitted as fast as the connection allows.
+
+        With the line framing, a point is a "channel,timestamp,value,anomaly" line of text, with the timestamp in
+        epoch nanoseconds and the anomaly as 0 or 1. With the binary framing, a point is a FRAME_DTYPE record.
+        At most max_concurrent time series are streamed at once, after which produce_data blocks.
+    """
+
+    def __init__(self, address=None, speedup: float = None, framing: str = 'line', max_concurrent: int = 64):
+        """
+        Args:
+            address: a (host, port) tuple for TCP, the path of a Unix socket, or None for stdout.
+            speedup (float): how many times faster than its frequency a time series is emitted, None to emit the
+                points without waiting.
+            framing (str): 'line' or 'binary'.
+            max_concurrent (int): the maximum number of time series streamed at once.
+        """
+        super().__init__()
+        if framing not in FRAMINGS:
+            raise ValueError(f"Unknown framing {framing!r}, expected one of {FRAMINGS}")
+        if speedup is not None and speedup <= 0:
+            raise ValueError("The speedup must be positive")
+        self.__address = address
+        self.__speedup = speedup
+        self.__framing = framing
+        self.__slots = threading.BoundedSemaphore(max_concurrent)
+        self.__loop = None
+        self.__thread = None
+        self.__writer = None
+        self.__pending = []
+        self.__error = None
+        self.__checksums = {}
+        self.__points_sent = 0
+        self.__bytes_sent = 0
+        self.__series_streamed = 0
+        self.__start_time = None
+
+    @property
+    def address(self):
+        return self.__address
+
+    @property
+    def speedup(self):
+        return self.__speedup
+
+    @property
+    def framing(self):
+        return self.__framing
+
+    @property
+    def points_sent(self):
+        return self.__points_sent
+
+    @property
+    def bytes_sent(self):
+        return self.__bytes_sent
+
+    @property
+    def series_streamed(self):
+        return self.__series_streamed
+
+    def throughput(self) -> dict:
+        """
+            Reports the throughput of the stream since the first time series was produced
+
+        Returns:
+            (
+            dict: the number of time series streamed, points and bytes sent, elapsed seconds and the points and
+                bytes sent per second.)
+        """
+        elapsed = time.perf_counter() - self.__start_time if self.__start_time is not None else 0.0
+        return {'series_streamed': self.__series_streamed, 'points_sent': self.__points_sent,
+                'bytes_sent': self.__bytes_sent, 'seconds': elapsed,
+                'points_per_second': self.__points_sent / elapsed if elapsed > 0 else None,
+                'bytes_per_second': self.__bytes_sent / elapsed if elapsed > 0 else None}
+
+    def __start(self) -> None:
+        """
+            Starts the event loop thread and opens the connection
+        """
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__loop.run_forever, name='streaming-producer', daemon=True)
+        self.__thread.start()
+        self.__writer = asyncio.run_coroutine_threadsafe(self.__connect(), self.__loop).result()
+        self.__start_time = time.perf_counter()
+
+    async def __connect(self):
+        """
+            Opens the connection to the address of the producer
+
+        Returns:
+            the stream writer of the connection.
+        """
+        if self.__address is None:
+            return _StdoutWriter()
+        if isinstance(self.__address, tuple):
+            _, writer = await asyncio.open_connection(*self.__address)
+        else:
+            _, writer = await asyncio.open_unix_connection(self.__address)
+        return writer
+
+    def __encode(self, channel: int, timestamps: np.ndarray, values: np.ndarray, anomaly_mask: np.ndarray) -> bytes:
+        """
+            Encodes data points in the framing of the producer
+        Args:
+            channel (int): the channel of the time series.
+            timestamps (np.ndarray): the epoch timestamps of the points, in nanoseconds.
+            values (np.ndarray): the values of the points.
+            anomaly_mask (np.ndarray): the anomaly labels of the points.
+
+        Returns:
+            (
+            bytes: the frames of the points.)
+        """
+        if self.__framing == 'binary':
+            frames = np.empty(len(values), dtype=FRAME_DTYPE)
+            frames['channel'] = channel
+            frames['timestamp'] = timestamps
+            frames['value'] = values
+            frames['anomaly'] = anomaly_mask
+            return frames.tobytes()
+        return ''.join(f"{channel},{timestamp},{value!r},{anomaly:d}\n" for timestamp, value, anomaly
+                       in zip(timestamps.tolist(), values.tolist(), anomaly_mask.tolist())).encode('ascii')
+
+    async def __stream(self, channel: int, timestamps: np.ndarray, values: np.ndarray, anomaly_mask: np.ndarray,
+                       config_manager: ConfigurationManager, filename) -> None:
+        """
+            Streams the points of a time series at the rate of their timestamps, then records its metadata
+        Args:
+            channel (int): the channel of the time series.
+            timestamps (np.ndarray): the epoch timestamps of the points, in nanoseconds.
+            values (np.ndarray): the values of the points.
+            anomaly_mask (np.ndarray): the anomaly labels of the points.
+            config_manager (ConfigurationManager): a snapshot of the configs that generated the time series.
+            filename: the id of the time series.
+        """
+        digest = hashlib.sha256()
+        if self.__speedup is None:
+            due = np.zeros(len(values))
+        else:
+            due = (timestamps - timestamps[0]) / 1e9 / self.__speedup if len(values) else np.zeros(0)
+        start = self.__loop.time()
+        first = 0
+        while first < len(values):
+            # every point already due is sent at once, at most 4096 at a time to let the other series through
+            last = min(int(np.searchsorted(due, self.__loop.time() - start, side='right')), first + 4096)
+            if last == first:
+                await asyncio.sleep(due[first] - (self.__loop.time() - start))
+                continue
+            frames = self.__encode(channel, timestamps[first:last], values[first:last], anomaly_mask[first:last])
+            self.__writer.write(frames)
+            await self.__writer.drain()
+            digest.update(frames)
+            self.__points_sent += last - first
+            self.__bytes_sent += len(frames)
+            first = last
+        self.__series_streamed += 1
+        self.__checksums[str(filename)] = digest.hexdigest()
+        self._add_metadata(config_manager, filename, channel=channel)
+
+    def __on_done(self, future) -> None:
+        """
+            Frees the slot of a finished time series and keeps its error, if it failed
+        Args:
+            future: the future of the finished time series.
+        """
+        if future.exception() is not None and self.__error is None:
+            self.__error = future.exception()
+        self.__slots.release()
+
+    def __raise_error(self) -> None:
+        """
+            Raises the error of the first failed time series, if any
+        """
+        if self.__error is not None:
+            raise self.__error
+
+    def produce_data(self, time_series: pd.Series, date_range: pd.DatetimeIndex,
+                     anomaly_mask: np.ndarray, config_manager: ConfigurationManager, filename: str = None) -> None:
+        """
+            Starts streaming a time series, it is streamed concurrently with the ones already being streamed
+        Args:
+            time_series (pandas.Series): the time series to be streamed.
+            date_range (pandas.DatetimeIndex): the timestamps of the data points in the time series.
+            anomaly_mask (np.ndarray): indicates whether each point is an anomaly or not.
+            config_manager (ConfigurationManager): the configuration manager containing the configs that generated the time series.
+            filename (str): the id of the time series, a non-negative integer which is its channel.
+
+        """
+        channel = int(filename)
+        self.__raise_error()
+        if self.__loop is None:
+            self.__start()
+        self.__slots.acquire()
+        # the arrays and the configuration may be modified by the caller once this returns
+        future = asyncio.run_coroutine_threadsafe(
+            self.__stream(channel, np.array(to_datetime_index(date_range).asi8),
+                          np.array(time_series, dtype=np.float64), np.array(anomaly_mask, dtype=bool),
+                          copy.copy(config_manager), filename), self.__loop)
+        future.add_done_callback(self.__on_done)
+        self.__pending.append(future)
+
+    def checksum(self, record: dict) -> str:
+        """
+            Returns the checksum of the frames streamed for a time series by this producer. A stream cannot be
+            read back, so the time series streamed by another producer, e.g. before a resumed run, have none and
+            are streamed again.
+        Args:
+            record (dict): the metadata record of the time series.
+
+        Returns:
+            (
+            str: the SHA-256 digest of the frames of the time series, None if this producer did not stream it.)
+        """
+        return self.__checksums.get(str(record['id']))
+
+    def flush(self) -> None:
+        """
+            Waits until every time series is streamed and raises the error of the first failed one, if any
+        """
+        while self.__pending:
+            self.__pending.pop(0).exception()
+        self.__raise_error()
+
+    def close(self) -> None:
+        """
+            Flushes the stream, then closes the connection and stops the event loop
+        """
+        if self.__loop is None:
+            return
+        try:
+            self.flush()
+        finally:
+            asyncio.run_coroutine_threadsafe(self.__disconnect(), self.__loop).result()
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join()
+            self.__loop.close()
+            self.__loop = None
+
+    async def __disconnect(self) -> None:
+        """
+            Closes the connection
+        """
+        self.__writer.close()
+        await self.__writer.wait_closed()
+
+    def generate_metadata_file(self):
+        """
+            Closes the stream, then generates a .csv file containing the metadata of all the streamed time series
+        """
+        self.close()
+        super().generate_metadata_file()
+
+
+class _StdoutWriter:
+    """
+        Minimal stream writer writing to the standard output
+    """
+
+    def write(self, data: bytes) -> None:
+        sys.stdout.buffer.write(data)
+
+    async def drain(self) -> None:
+        sys.stdout.buffer.flush()
+
+    def close(self) -> None:
+        sys.stdout.buffer.flush()
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+def parse_address(text: str):
+    """
+        Parses the address of a stream given as "host:port", "unix:<path>" or "-" for stdout
+    Args:
+        text (str): the address.
+
+    Returns:
+        a (host, port) tuple, the path of a Unix socket or None for stdout, as expected by StreamingDataProducer.
+    """
+    if text == '-':
+        return None
+    if text.startswith('unix:'):
+        return text[len('unix:'):]
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
@@ -0,0 +1,83 @@
+import unittest
+import os
+import tempfile
+import threading
+from datetime import datetime
+from unittest.mock import Mock
+import pandas as pd
+import numpy as np
+from background_data_producer import BackgroundDataProducer
+from csv_data_producer import CSVDataProducer
+from data_producer import DataProducer
+from yaml_configuration_manager import YAMLConfigurationManager
+
+
+class TestBackgroundDataProducer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.__config_manager = YAMLConfigurationManager()
+        self.__date_range = pd.date_range(start=datetime(2021, 7, 1), periods=50, freq='1D')
+        self.__time_series = pd.Series(np.arange(50, dtype=float))
+        self.__anomaly_mask = np.zeros(50, dtype=bool)
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
+    def test_produce_data_in_order(self):
+        producer = BackgroundDataProducer(CSVDataProducer(), max_pending=2)
+        for series_num in range(5):
+            self.__config_manager._duration = series_num
+            producer.produce_data(self.__time_series, self.__date_range, self.__anomaly_mask, self.__config_manager,
+                                  f"background_{series_num}")
+        producer.generate_metadata_file()
+        self.assertEqual([record['id'] for record in producer.metadata], [f"background_{n}" for n in range(5)],
+                         msg="Time series were not produced in order")
+        self.assertEqual([record['data_size'] for record in producer.metadata], list(range(5)),
+                         msg="The metadata does not match the configuration at the time of the call")
+
+    def test_backpressure(self):
+        release = threading.Event()
+        inner_producer = Mock(spec=DataProducer)
+        inner_producer.produce_data.side_effect = lambda *args: release.wait()
+        producer = BackgroundDataProducer(inner_producer, max_pending=2)
+        producer.produce_data(self.__time_series, self.__date_range, self.__anomaly_mask, self.__config_manager)
+        producer.produce_data(self.__time_series, self.__date_range, self.__anomaly_mask, self.__config_manager)
+
+        third_call = threading.Thread(target=producer.produce_data, args=(
+            self.__time_series, self.__date_range, self.__anomaly_mask, self.__config_manager))
+        third_call.start()
+        third_call.join(timeout=0.2)
+        self.assertTrue(third_call.is_alive(), msg="produce_data did not block with a full queue")
+        release.set()
+        third_call.join(timeout=5)
+        producer.generate_metadata_file()
+        self.assertEqual(inner_producer.produce_data.call_count, 3, msg="Not every time series was produced")
+        inner_producer.generate_metadata_file.assert_called_once()
+
+    def test_error_propagation(self):
+        inner_producer = Mock(spec=DataProducer)
+        inner_producer.produce_data.side_effect = OSError("disk full")
+        inner_producer.produce_chunks.side_effect = lambda chunks, *args: [chunk for chunk in chunks]
+        producer = BackgroundDataProducer(inner_producer)
+        producer.produce_data(self.__time_series, self.__date_range, self.__anomaly_mask, self.__config_manager)
+        with self.assertRaises(OSError):
+            producer.flush()
+        with self.assertRaises(OSError):
+            producer.produce_chunks(iter([]), self.__config_manager)
+        with self.assertRaises(OSError):
+            producer.generate_metadata_file()
+        inner_producer.generate_metadata_file.assert_not_called()
+
+    def test_produce_chunks(self):
+        producer = BackgroundDataProducer(CSVDataProducer(), max_pending=1)
+        chunks = ((self.__date_range[first:first + 10], self.__time_series.to_numpy()[first:first + 10],
+                   self.__anomaly_mask[first:first + 10]) for first in range(0, 50, 10))
+        producer.produce_chunks(chunks, self.__config_manager, "background_chunks")
+        producer.flush()
+        self.assertEqual(len(pd.read_csv('./sample_datasets/background_chunks.csv')), 50,
+                         msg="Not every chunk was written")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+from component_cache import ComponentCache
+
+
+class TestComponentCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__cache = ComponentCache(maxsize=2)
+
+    def test_get_hit_and_miss(self):
+        first = self.__cache.get('a', lambda: np.arange(3.0))
+        second = self.__cache.get('a', lambda: np.zeros(3))
+        self.assertIs(first, second, msg="The cached value was recomputed")
+        self.assertEqual(self.__cache.info(), {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2})
+
+    def test_cached_arrays_are_read_only(self):
+        value = self.__cache.get('a', lambda: np.arange(3.0))
+        with self.assertRaises(ValueError):
+            value[0] = 1
+
+    def test_least_recently_used_eviction(self):
+        self.__cache.get('a', lambda: 1)
+        self.__cache.get('b', lambda: 2)
+        self.__cache.get('a', lambda: 1)
+        self.__cache.get('c', lambda: 3)
+        self.assertEqual(self.__cache.get('a', lambda: None), 1, msg="The most recently used entry was evicted")
+        self.assertIsNone(self.__cache.get('b', lambda: None), msg="The least recently used entry was kept")
+        self.assertEqual(len(self.__cache), 2, msg="The cache grew past its maximum size")
+
+    def test_disabled_cache(self):
+        cache = ComponentCache(maxsize=0)
+        cache.get('a', lambda: np.arange(3.0))[0] = 1
+        self.assertEqual(cache.info(), {'hits': 0, 'misses': 1, 'size': 0, 'maxsize': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
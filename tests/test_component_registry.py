@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+from component_registry import Component, ComponentRegistry, TimeFeatures
+from counter_rng import CounterRNG
+from time_series_simulator import TimeSeriesGenerator
+from timestamp_range import TimestampRange
+from yaml_configuration_manager import YAMLConfigurationManager
+from tests.test_time_series_simulator import YAML_DATA as SIMULATOR_YAML_DATA
+
+# the default components are all disabled, so that the registered ones are the only ones
+YAML_DATA = SIMULATOR_YAML_DATA | {"daily_seasonality_options": ["no"], "weekly_seasonality_options": ["no"],
+                                   "trend_levels": ["no"], "cyclic_periods": ["no"], "percentage_missing_options": [0]}
+
+
+class TestComponentRegistry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__config_manager = YAMLConfigurationManager()
+
+    def test_time_features(self):
+        timestamps = TimestampRange('2021-07-01', '1h', 500)
+        features = TimeFeatures(timestamps, 1000, first_point=200)
+        date_range = timestamps.to_index()
+        for feature in ('hour', 'dayofweek', 'month', 'quarter'):
+            np.testing.assert_array_equal(getattr(features, feature), getattr(date_range, feature).to_numpy())
+            self.assertIs(getattr(features, feature), getattr(features, feature), msg=f"{feature} was extracted twice")
+        np.testing.assert_array_equal(features.positions, np.arange(200, 700))
+        np.testing.assert_array_equal(features.ramp, np.linspace(0, 1, 1000)[200:700])
+
+    def test_registry(self):
+        registry = ComponentRegistry.default()
+        self.assertEqual(registry.names, ['daily_seasonality', 'weekly_seasonality', 'cycles', 'trend'])
+        registry.register(Component('cycles', lambda features: np.zeros(len(features)), lambda config: False))
+        self.assertEqual(registry.names, ['daily_seasonality', 'weekly_seasonality', 'cycles', 'trend'],
+                         msg="Replacing a component changed the order of the components")
+        registry.unregister('trend')
+        self.assertNotIn('trend', registry)
+
+    def test_custom_component(self):
+        # a half-hourly sawtooth, only enabled for the multiplicative time series
+        registry = ComponentRegistry.default()
+        registry.register(Component('sawtooth', lambda features: (features.hour % 2) / 2,
+                                    lambda config: config.data_type == 'multiplicative'))
+        for data_type in ("additive", "multiplicative"):
+            self.__config_manager.yaml_data = YAML_DATA | {"data_types": [data_type]}
+            self.__config_manager.configure()
+            generator = TimeSeriesGenerator(self.__config_manager, seed=0, registry=registry)
+            time_series = generator.generate_time_series()[0].to_numpy()
+            expected_levels = 2 if data_type == "multiplicative" else 1
+            self.assertEqual(len(np.unique(time_series)), expected_levels, msg=f"Incorrect {data_type} composition")
+            _, batch, _, _, _ = generator.generate_batch(1, seeds=[4])[0]
+            window = generator.generate_time_series_window(30, 90, self.__config_manager.snapshot(), seed=4)[0]
+            np.testing.assert_array_equal(window.to_numpy(), batch[0][30:90],
+                                          err_msg="The window differs from the batch with a custom component")
+
+    def test_series_component(self):
+        # a component of each time series, a level drawn from its randomness
+        def level(features, configs, rngs, out):
+            out[...] = np.array([rng.uniform([0])[0] for rng in rngs])[:, None]
+            return out
+
+        registry = ComponentRegistry.default()
+        registry.register(Component('level', level, lambda config: True, shared=False))
+        self.__config_manager.yaml_data = YAML_DATA | {"daily_seasonality_options": ["exist"]}
+        self.__config_manager.configure()
+        generator = TimeSeriesGenerator(self.__config_manager, seed=0, registry=registry)
+        _, batch, _, _, _ = generator.generate_batch(2, seeds=[1, 2])[0]
+        components, _ = generator.generate_components([self.__config_manager.snapshot()] * 2,
+                                                      [CounterRNG(1), CounterRNG(2)])
+        np.testing.assert_allclose(components[1] - components[0], CounterRNG(2).uniform([0])[0]
+                                   - CounterRNG(1).uniform([0])[0])
+        window = generator.generate_time_series_window(100, 200, self.__config_manager.snapshot(), seed=2)[0]
+        np.testing.assert_array_equal(window.to_numpy(), batch[1][100:200])
+
+
+if __name__ == '__main__':
+    unittest.main()
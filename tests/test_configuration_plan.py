@@ -0,0 +1,68 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime
+import numpy as np
+from configuration_plan import ConfigurationPlan, SeriesConfig, Presence, NoiseLevel, DataType
+
+YAML_DATA = {
+    "start_date": "1-7-2021",
+    "frequencies": ["1D", "10T", "1H"],
+    "daily_seasonality_options": ["no", "exist"],
+    "weekly_seasonality_options": ["exist"],
+    "noise_levels": ["small", "large", "no"],
+    "trend_levels": ["exist", "no"],
+    "cyclic_periods": ["no"],
+    "data_types": ["", "additive", "multiplicative"],
+    "percentage_outliers_options": [0.05, 0.1],
+    "data_sizes": [60, 90],
+    "datasets_num": 50
+}
+
+
+class TestConfigurationPlan(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__plan = ConfigurationPlan.compile(YAML_DATA, np.random.default_rng(0))
+
+    def test_compile(self):
+        self.assertEqual(len(self.__plan), 50, msg="Expected a configuration per dataset")
+        self.assertEqual(self.__plan.start_date, datetime(2021, 7, 1), msg="Incorrect start date")
+        self.assertEqual(set(self.__plan.values('duration')), {60, 90})
+        config = self.__plan[3]
+        self.assertIsInstance(config, SeriesConfig)
+        self.assertIn(config.frequency, YAML_DATA['frequencies'])
+        self.assertEqual(config.weekly_seasonality_code, Presence.EXIST)
+        self.assertEqual(config.cyclic_period_code, Presence.NO)
+        self.assertFalse(hasattr(config, '__dict__'), msg="The configuration is not slotted")
+
+    def test_codes(self):
+        noise_codes = self.__plan.codes('noise_level')
+        for position, code in enumerate(noise_codes):
+            self.assertEqual(code, NoiseLevel.parse(self.__plan[position].noise_level))
+        data_type_codes = self.__plan.codes('data_type')
+        self.assertEqual(set(data_type_codes), {DataType.UNTYPED, DataType.ADDITIVE, DataType.MULTIPLICATIVE})
+
+    def test_slice(self):
+        part = self.__plan[10:20]
+        self.assertEqual(len(part), 10)
+        self.assertEqual(part[0].duration, self.__plan[10].duration)
+        self.assertEqual(part[9].frequency, self.__plan[19].frequency)
+
+    def test_prefix_stable(self):
+        for num_series in (1, 5, 10, 49):
+            part = ConfigurationPlan.compile(YAML_DATA, np.random.default_rng(0), num_series)
+            np.testing.assert_array_equal(part.series, self.__plan[:num_series].series,
+                                          err_msg=f"The first {num_series} configurations depend on the plan length")
+
+    def test_save_and_load(self):
+        path = os.path.join(tempfile.mkdtemp(), 'plan.npz')
+        self.__plan.save(path)
+        loaded = ConfigurationPlan.load(path)
+        self.assertEqual(loaded.start_date, self.__plan.start_date)
+        self.assertEqual(loaded.options, self.__plan.options)
+        np.testing.assert_array_equal(loaded.series, self.__plan.series)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from counter_rng import CounterRNG, NORMAL_BLOCK
+
+
+class TestCounterRNG(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__rng = CounterRNG(3)
+
+    def test_standard_normal_ranges_match(self):
+        num_points = 5 * NORMAL_BLOCK + 3
+        whole = self.__rng.standard_normal(0, num_points)
+        self.assertAlmostEqual(whole.mean(), 0, places=1, msg="The normal draws are biased")
+        self.assertAlmostEqual(whole.std(), 1, places=1, msg="Incorrect standard deviation")
+        for first_point, last_point in ((0, 1), (1, 2), (2 * NORMAL_BLOCK - 1, 2 * NORMAL_BLOCK + 1),
+                                        (777, num_points), (num_points - 1, num_points)):
+            np.testing.assert_array_equal(self.__rng.standard_normal(first_point, last_point),
+                                          whole[first_point:last_point],
+                                          err_msg=f"Range {first_point}:{last_point} differs")
+        self.assertFalse(np.array_equal(CounterRNG(4).standard_normal(0, 10), whole[:10]),
+                         msg="Different seeds draw the same values")
+
+    def test_uniform(self):
+        positions = np.arange(100000)
+        values = self.__rng.uniform(positions, -1, 1)
+        self.assertTrue(((values >= -1) & (values < 1)).all(), msg="A uniform value is out of range")
+        self.assertAlmostEqual(values.mean(), 0, places=1, msg="The uniform draws are biased")
+        np.testing.assert_array_equal(self.__rng.uniform(positions[::-7], -1, 1), values[::-7])
+
+    def test_permutation(self):
+        for num_points in (1, 2, 5, 1000, 65537):
+            permuted = self.__rng.permutation(np.arange(num_points), num_points)
+            np.testing.assert_array_equal(np.sort(permuted), np.arange(num_points), err_msg="Not a permutation")
+            np.testing.assert_array_equal(self.__rng.permutation(permuted, num_points, inverse=True),
+                                          np.arange(num_points), err_msg="Incorrect inverse permutation")
+
+    def test_seed_sequence(self):
+        seed = np.random.SeedSequence(22, spawn_key=(4,))
+        self.assertEqual(CounterRNG(seed).slope(), CounterRNG(np.random.SeedSequence(22, spawn_key=(4,))).slope())
+        self.assertEqual({CounterRNG(seed).slope() for seed in range(32)}, {1, -1}, msg="The slope is constant")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,12 +4,16 @@ from unittest.mock import Mock
 import pandas as pd
 import numpy as np
 from csv_data_producer import CSVDataProducer
+from timestamp_range import TimestampRange
 from configuration_manager import ConfigurationManager
 import os
+import tempfile
 
 
 class TestCSVDataProducer(unittest.TestCase):
     def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
         self.__mock_configuration_manager = Mock(spec=ConfigurationManager)
         self.__mock_configuration_manager.data_type.return_value = "additive"
         self.__mock_configuration_manager.daily_seasonality.return_value = "no"
@@ -30,12 +34,45 @@ class TestCSVDataProducer(unittest.TestCase):
         self.__anomaly_mask = np.ndarray(shape=len(self.__date_range))
         self.__time_series = pd.Series(self.__anomaly_mask)
 
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
     def test_produce_data_success(self):
         self.__producer.produce_data(self.__time_series, self.__date_range, self.__anomaly_mask,
                                      self.__mock_configuration_manager,
                                      self.__filename)
         self.assertTrue(os.path.exists('./sample_datasets/test.csv'), "Time series file was not created successfully")
 
+    def test_produce_chunks_success(self):
+        self.__producer.produce_data(self.__time_series, self.__date_range, self.__anomaly_mask,
+                                     self.__mock_configuration_manager, self.__filename)
+        chunks = [(self.__date_range[first:first + 7], self.__time_series.to_numpy()[first:first + 7],
+                   self.__anomaly_mask[first:first + 7]) for first in range(0, len(self.__date_range), 7)]
+        self.__producer.produce_chunks(chunks, self.__mock_configuration_manager, "test_chunks")
+        with open('./sample_datasets/test.csv') as expected, open('./sample_datasets/test_chunks.csv') as result:
+            self.assertEqual(result.read(), expected.read(), "Chunked file differs from the in-memory one")
+        self.assertEqual(self.__producer.metadata[-1]['id'], "test_chunks", "Chunked time series metadata missing")
+
+    def test_produce_data_range_timestamps(self):
+        producer = CSVDataProducer(timestamps='range')
+        timestamps = TimestampRange.from_index(self.__date_range)
+        producer.produce_data(self.__time_series, timestamps, self.__anomaly_mask,
+                              self.__mock_configuration_manager, "test_range")
+        chunks = [(timestamps[first:first + 7], self.__time_series.to_numpy()[first:first + 7],
+                   self.__anomaly_mask[first:first + 7]) for first in range(0, len(timestamps), 7)]
+        producer.produce_chunks(chunks, self.__mock_configuration_manager, "test_range_chunks")
+        for record in producer.metadata:
+            self.assertEqual((record['start'], record['step']), ('2017-05-10 00:00:00', 'D'),
+                             "The start and step of the timestamps are not in the metadata")
+            time_series, date_range, anomaly_mask = CSVDataProducer.load_data(record['id'], record)
+            self.assertEqual(date_range, timestamps, "Timestamps were not restored")
+            np.testing.assert_allclose(time_series.to_numpy(), self.__time_series.to_numpy())
+            np.testing.assert_array_equal(anomaly_mask, self.__anomaly_mask.astype(bool))
+        with open('./sample_datasets/test_range.csv') as file:
+            self.assertEqual(file.readline().strip(), "value,anomaly", "The timestamps were written as a column")
+        with self.assertRaises(ValueError):
+            CSVDataProducer.load_data("test_range")
+
     def test_generate_metadata_file(self):
         self.__producer.metadata = [{'id': self.__filename,
                                      'data_type': self.__mock_configuration_manager.data_type,
@@ -0,0 +1,80 @@
+import unittest
+import os
+import json
+import tempfile
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import numpy as np
+from generation_server import GenerationServer
+from npz_data_producer import NPZDataProducer
+from tests.test_parallel_runner import CONFIG
+
+
+class TestGenerationServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        with open("config.yaml", 'w') as file:
+            file.write(CONFIG)
+        self.__server = GenerationServer(address=('127.0.0.1', 0)).start()
+
+    def tearDown(self) -> None:
+        self.__server.close()
+        os.chdir(self.__working_directory)
+
+    def __request(self, path: str, body: dict = None) -> dict:
+        host, port = self.__server.address
+        data = json.dumps(body).encode() if body is not None else None
+        with urlopen(Request(f"http://{host}:{port}{path}", data=data), timeout=60) as response:
+            return json.loads(response.read())
+
+    def test_health(self):
+        self.assertEqual(self.__request("/health")["status"], "ok")
+
+    def test_series_matches_run(self):
+        result = self.__request("/run", {"format": "npz", "seed": 7, "count": 5})
+        self.assertEqual(result["datasets"], 5, msg="Incorrect number of produced time series")
+        for series_num in (0, 3):
+            time_series, date_range, anomaly_mask = NPZDataProducer.load_data(str(series_num))
+            response = self.__request(f"/series?id={series_num}&seed=7&count=5")
+            values = np.array(response["values"], dtype=float)
+            np.testing.assert_array_equal(values, time_series.to_numpy(),
+                                          err_msg="The served time series differs from the produced one")
+            np.testing.assert_array_equal(response["anomalies"], np.flatnonzero(anomaly_mask))
+            self.assertEqual(response["start"], str(date_range[0]))
+
+            window = self.__request(f"/series?id={series_num}&seed=7&count=5&start=10&stop=25")
+            np.testing.assert_array_equal(np.array(window["values"], dtype=float), values[10:25])
+            self.assertEqual(window["start"], str(date_range[10]), msg="Incorrect start of the window")
+
+    def test_series_independent_of_count(self):
+        expected = self.__request("/series?id=1&seed=7&count=2")
+        for count in (5, 30):
+            response = self.__request(f"/series?id=1&seed=7&count={count}")
+            self.assertEqual(response, expected, msg=f"Time series 1 differs with a count of {count}")
+
+    def test_invalid_requests(self):
+        for path, status in (("/series?seed=7", 400), ("/series?id=100", 400), ("/unknown", 404)):
+            with self.assertRaises(HTTPError, msg=f"{path} did not fail") as context:
+                self.__request(path)
+            self.assertEqual(context.exception.code, status)
+            context.exception.close()
+        self.assertEqual(self.__request("/health")["status"], "ok", msg="The server did not survive an error")
+
+        os.remove("config.yaml")
+        with self.assertRaises(HTTPError) as context:
+            self.__request("/series?id=0")
+        self.assertEqual(context.exception.code, 500, msg="An unreadable configuration did not fail with 500")
+        self.assertIn("FileNotFoundError", json.loads(context.exception.read())["error"])
+        context.exception.close()
+
+    def test_concurrent_requests(self):
+        # a run in progress holds the run lock, the other requests are still served meanwhile
+        with self.__server._GenerationServer__run_lock:
+            self.assertEqual(self.__request("/health")["status"], "ok")
+            self.assertTrue(self.__request("/series?id=2&seed=7")["values"], msg="A series request was blocked")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from counter_rng import CounterRNG
+from index_sampler import IndexSampler
+
+
+class TestIndexSampler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__sampler = IndexSampler(CounterRNG(0))
+
+    def test_sample_disjoint_groups(self):
+        for num_points, counts in ((1000, [50, 50]), (10 ** 6, [5, 7]), (10, [4, 6]), (10, [0, 0])):
+            outliers, missing = self.__sampler.sample(num_points, counts)
+            self.assertEqual((len(outliers), len(missing)), tuple(counts), msg="Incorrect group sizes")
+            positions = np.concatenate([outliers, missing])
+            self.assertEqual(len(np.unique(positions)), len(positions), msg="The groups overlap")
+            self.assertTrue(((positions >= 0) & (positions < num_points)).all(), msg="Position out of range")
+
+    def test_sample_too_many(self):
+        with self.assertRaises(ValueError):
+            self.__sampler.sample(10, [6, 5])
+
+    def test_sample_is_uniform(self):
+        hits = np.zeros(20)
+        for seed in range(4000):
+            outliers, _ = IndexSampler(CounterRNG(seed)).sample(20, [2, 3])
+            hits[outliers] += 1
+        np.testing.assert_allclose(hits / 4000, 2 / 20, atol=0.02)
+
+    def test_sample_window_matches_whole(self):
+        for num_points in (10, 1000, 4097):
+            counts = [num_points // 10, num_points // 20]
+            whole = [IndexSampler.to_mask(positions, num_points) for positions in
+                     self.__sampler.sample(num_points, counts)]
+            for first_point, last_point in ((0, num_points // 3), (num_points // 3, num_points - 1), (5, 6)):
+                for mask, positions in zip(whole, self.__sampler.sample(num_points, counts, first_point, last_point)):
+                    np.testing.assert_array_equal(IndexSampler.to_mask(positions, last_point - first_point),
+                                                  mask[first_point:last_point])
+
+    def test_sample_rows(self):
+        counts = np.array([[3, 2], [0, 4], [5, 0]])
+        outliers, missing = self.__sampler.sample_rows(10, counts, [CounterRNG(seed) for seed in range(3)])
+        outlier_mask = IndexSampler.to_mask(outliers, (3, 10))
+        missing_mask = IndexSampler.to_mask(missing, (3, 10))
+        np.testing.assert_array_equal(outlier_mask.sum(axis=1), counts[:, 0])
+        np.testing.assert_array_equal(missing_mask.sum(axis=1), counts[:, 1])
+        self.assertFalse((outlier_mask & missing_mask).any(), msg="The groups overlap")
+
+
+if __name__ == '__main__':
+    unittest.main()
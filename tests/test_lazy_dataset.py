@@ -0,0 +1,89 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from lazy_dataset import LazyDataset
+from parallel_runner import ParallelRunner
+from npz_data_producer import NPZDataProducer
+from yaml_configuration_manager import YAMLConfigurationManager
+from tests.test_parallel_runner import CONFIG
+
+
+class TestLazyDataset(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        with open("config.yaml", 'w') as file:
+            file.write(CONFIG)
+        config_manager = YAMLConfigurationManager()
+        config_manager.load_config()
+        self.__dataset = LazyDataset(config_manager, seed=7, cache_size=2)
+
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
+    def test_matches_parallel_runner(self):
+        ParallelRunner(YAMLConfigurationManager, NPZDataProducer, seed=7, batch_size=3).run()
+        self.assertEqual(len(self.__dataset), 7)
+        for series_num in (0, 4, 6):
+            time_series, date_range, anomaly_mask = NPZDataProducer.load_data(str(series_num))
+            values, timestamps, mask = self.__dataset[series_num]
+            np.testing.assert_array_equal(values.to_numpy(), time_series.to_numpy())
+            np.testing.assert_array_equal(timestamps, date_range)
+            np.testing.assert_array_equal(mask, anomaly_mask)
+
+    def test_independent_of_length(self):
+        config_manager = YAMLConfigurationManager(datasets_num=3)
+        config_manager.load_config()
+        shorter = LazyDataset(config_manager, seed=7)
+        for series_num in range(3):
+            np.testing.assert_array_equal(shorter[series_num][0].to_numpy(), self.__dataset[series_num][0].to_numpy(),
+                                          err_msg=f"Time series {series_num} depends on the length of the corpus")
+
+    def test_window(self):
+        values, date_range, anomaly_mask = self.__dataset[3]
+        window_values, window_dates, window_mask = self.__dataset[3, 10:25]
+        np.testing.assert_array_equal(window_values.to_numpy(), values.to_numpy()[10:25])
+        np.testing.assert_array_equal(window_dates, date_range[10:25])
+        np.testing.assert_array_equal(window_mask, anomaly_mask[10:25])
+
+        by_timestamp = self.__dataset[3, date_range[10]:date_range[25]]
+        np.testing.assert_array_equal(by_timestamp[1], date_range[10:25], err_msg="Incorrect timestamp window")
+        self.assertEqual(len(self.__dataset[3, -5:][0]), 5)
+
+    def test_window_without_cache(self):
+        config_manager = YAMLConfigurationManager()
+        config_manager.load_config()
+        dataset = LazyDataset(config_manager, seed=7)
+        for series_num in (0, 5):
+            values, date_range, anomaly_mask = dataset[series_num]
+            last = len(date_range) - 5
+            for window in (slice(0, 40), slice(len(date_range) - 30, None), slice(date_range[3], date_range[last])):
+                start, stop = window.indices(len(date_range))[:2] if window.start is None or \
+                    isinstance(window.start, int) else (3, last)
+                window_values, window_dates, window_mask = dataset[series_num, window]
+                np.testing.assert_array_equal(window_values.to_numpy(), values.to_numpy()[start:stop])
+                np.testing.assert_array_equal(window_dates, date_range[start:stop])
+                np.testing.assert_array_equal(window_mask, anomaly_mask[start:stop])
+        self.assertEqual(dataset.cache_info['size'], 0, msg="A window was cached")
+
+    def test_cache(self):
+        first = self.__dataset[1][0]
+        self.__dataset[1, 2:4]
+        self.assertEqual(self.__dataset.cache_info['hits'], 1, msg="The time series was regenerated")
+        with self.assertRaises(ValueError):
+            first.to_numpy()[0] = 0
+        self.__dataset[2]
+        self.__dataset[3]
+        np.testing.assert_array_equal(self.__dataset[1][0].to_numpy(), first.to_numpy(),
+                                      err_msg="A regenerated time series differs")
+
+    def test_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.__dataset[7]
+        self.assertEqual(self.__dataset.config(-1).duration, self.__dataset.plan[6].duration)
+
+
+if __name__ == '__main__':
+    unittest.main()
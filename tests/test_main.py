@@ -0,0 +1,49 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+from main import parse_arguments
+from tests.test_parallel_runner import CONFIG
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestMain(unittest.TestCase):
+
+    def test_parse_arguments(self):
+        arguments = parse_arguments([])
+        self.assertEqual(arguments.command, "generate", msg="generate is not the default command")
+        self.assertEqual((arguments.config, arguments.format, arguments.seed, arguments.workers, arguments.count),
+                         ("config.yaml", "csv", 22, 1, None))
+        arguments = parse_arguments(["--format", "npz", "--seed", "3", "--workers", "4", "--count", "100",
+                                     "--output-dir", "out"])
+        self.assertEqual((arguments.format, arguments.seed, arguments.workers, arguments.count, arguments.output_dir),
+                         ("npz", 3, 4, 100, "out"))
+        arguments = parse_arguments(["serve", "--port", "0"])
+        self.assertEqual((arguments.command, arguments.host, arguments.port), ("serve", "127.0.0.1", 0))
+
+    def test_lazy_imports(self):
+        # parsing the command line imports neither NumPy nor pandas nor any data producer
+        modules = subprocess.run([sys.executable, "-c", "import sys, main; main.parse_arguments([]); "
+                                                        "print(' '.join(sys.modules))"],
+                                 cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+        for module in ("numpy", "pandas", "yaml", "csv_data_producer", "parallel_runner"):
+            self.assertNotIn(module, modules, msg=f"{module} is imported at startup")
+
+    def test_stream_to_stdout(self):
+        # the status messages must not be mixed with the frames of a stream written to stdout
+        config_path = os.path.join(tempfile.mkdtemp(), "config.yaml")
+        with open(config_path, 'w') as file:
+            file.write(CONFIG)
+        result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--format", "stream", "--address",
+                                 "-", "--count", "2", "--config", config_path, "--output-dir", tempfile.mkdtemp()],
+                                capture_output=True, text=True, check=True)
+        lines = result.stdout.splitlines()
+        self.assertGreater(len(lines), 0, msg="Nothing was streamed")
+        self.assertTrue(all(len(line.split(',')) == 4 for line in lines), msg="The stream holds other output")
+        self.assertIn("Streaming data to -", result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
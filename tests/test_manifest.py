@@ -0,0 +1,40 @@
+import unittest
+import os
+import tempfile
+from manifest import Manifest
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__path = os.path.join(tempfile.mkdtemp(), 'manifest.jsonl')
+        self.__manifest = Manifest(self.__path, run_fields={'seed': 22, 'batch_size': 2})
+
+    def test_append_and_load(self):
+        self.__manifest.append({'id': '0', 'data_size': 30}, 'a')
+        self.__manifest.append({'id': '1', 'data_size': 60}, 'b')
+        self.__manifest.append({'id': '0', 'data_size': 30}, 'c')
+        entries = self.__manifest.load()
+        self.assertEqual(sorted(entries), ['0', '1'])
+        self.assertEqual(entries['0']['checksum'], 'c', msg="The last entry of a time series was not kept")
+        self.assertEqual(entries['1']['metadata'], {'id': '1', 'data_size': 60})
+        self.assertEqual(entries['1']['seed'], 22)
+
+    def test_load_ignores_truncated_line(self):
+        self.__manifest.append({'id': '0'}, 'a')
+        with open(self.__path, 'a', encoding='utf-8') as file:
+            file.write('{"id": "1", "seed": 2')
+        self.assertEqual(list(self.__manifest.load()), ['0'])
+
+    def test_load_ignores_other_runs(self):
+        Manifest(self.__path, run_fields={'seed': 23, 'batch_size': 2}).append({'id': '0'}, 'a')
+        self.assertEqual(self.__manifest.load(), {})
+
+    def test_clear(self):
+        self.__manifest.append({'id': '0'}, 'a')
+        self.__manifest.clear()
+        self.assertEqual(self.__manifest.load(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
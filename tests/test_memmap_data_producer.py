@@ -0,0 +1,77 @@
+import unittest
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+from unittest.mock import Mock
+import pandas as pd
+import numpy as np
+from memmap_data_producer import MemmapDataProducer
+from memmap_dataset_reader import MemmapDatasetReader
+from configuration_manager import ConfigurationManager
+from memmap_data_producer import STORE_FILES
+from parallel_runner import ParallelRunner
+from yaml_configuration_manager import YAMLConfigurationManager
+from tests.test_parallel_runner import CONFIG
+
+
+class TestMemmapDataProducer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        self.__mock_configuration_manager = Mock(spec=ConfigurationManager)
+        MemmapDataProducer.clear_store()
+        rng = np.random.default_rng(0)
+        self.__series = {}
+        for series_id, length in (("0", 40), ("1", 7), ("2", 25)):
+            date_range = pd.date_range(start=datetime(2021, 7, 1), periods=length, freq='1h')
+            self.__series[series_id] = (pd.Series(rng.random(length)), date_range, rng.random(length) < 0.2)
+
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
+    def test_store_round_trip(self):
+        # two producers appending to the same store, like the producers of two worker processes
+        producers = [MemmapDataProducer(), MemmapDataProducer()]
+        for position, (series_id, (time_series, date_range, anomaly_mask)) in enumerate(self.__series.items()):
+            producer = producers[position % 2]
+            if series_id == "2":
+                chunks = [(date_range[first:first + 10], time_series.to_numpy()[first:first + 10],
+                           anomaly_mask[first:first + 10]) for first in range(0, len(date_range), 10)]
+                producer.produce_chunks(chunks, self.__mock_configuration_manager, series_id)
+            else:
+                producer.produce_data(time_series, date_range, anomaly_mask, self.__mock_configuration_manager,
+                                      series_id)
+        producers[0].metadata = sorted(producers[0].metadata + producers[1].metadata, key=lambda record: record['id'])
+        producers[0].generate_metadata_file()
+
+        reader = MemmapDatasetReader()
+        self.assertEqual(len(reader), 3, "Incorrect number of time series in the store")
+        self.assertEqual(reader.ids, ["0", "1", "2"], "Incorrect time series ids")
+        for series_id, (time_series, date_range, anomaly_mask) in self.__series.items():
+            values, timestamps, mask = reader[series_id]
+            self.assertIsInstance(values, np.memmap, "The values are not a view of the memory-mapped store")
+            np.testing.assert_array_equal(values, time_series.to_numpy())
+            np.testing.assert_array_equal(timestamps, date_range.to_numpy())
+            np.testing.assert_array_equal(mask, anomaly_mask)
+
+    def test_store_is_independent_of_worker_count(self):
+        digests = []
+        for workers in (1, 3):
+            os.chdir(tempfile.mkdtemp())
+            with open("config.yaml", 'w') as file:
+                file.write(CONFIG.replace("datasets_num : 7", "datasets_num : 30"))
+            ParallelRunner(YAMLConfigurationManager, MemmapDataProducer, workers=workers, batch_size=3).run()
+            digest = hashlib.sha256()
+            for filename, _ in STORE_FILES.values():
+                with open(f"sample_datasets/{filename}", 'rb') as file:
+                    digest.update(file.read())
+            digests.append(digest.hexdigest())
+            reader = MemmapDatasetReader()
+            self.assertEqual(reader.ids, [str(series_num) for series_num in range(30)])
+            self.assertTrue(np.all(np.diff(reader.metadata['offset']) > 0), msg="The store is not in id order")
+        self.assertEqual(digests[0], digests[1], msg="The store changed with the number of workers")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from metadata_index import MetadataIndex
+
+
+def _record(series_num: int) -> dict:
+    return {'id': str(series_num),
+            'data_type': ('additive', 'multiplicative')[series_num % 2],
+            'daily_seasonality': 'exist',
+            'weekly_seasonality': 'no',
+            'noise': 'small',
+            'trend': ('exist', 'no')[series_num % 4 == 0],
+            'cyclic_period (3 months)': 'no',
+            'data_size': 60 + series_num,
+            'percentage_outliers': 0.05,
+            'percentage_missing': 0.02,
+            'freq': ('10T', '1H', '1D')[series_num % 3],
+            'offset': series_num * 10}
+
+
+def _append_block(block: tuple) -> None:
+    path, first_series_num = block
+    MetadataIndex(path).append([_record(series_num) for series_num in range(first_series_num, first_series_num + 25)])
+
+
+class TestMetadataIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__index = MetadataIndex(os.path.join(tempfile.mkdtemp(), 'metadata.sqlite'))
+        self.__index.create()
+
+    def test_concurrent_appends(self):
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_append_block, [(self.__index.path, first) for first in range(0, 200, 25)]))
+        self.assertEqual(self.__index.count(), 200, msg="Records were lost by concurrent appends")
+        records = {record['id']: record for record in self.__index.select()}
+        self.assertEqual(records['17'], _record(17), msg="The record was not restored")
+
+    def test_select(self):
+        self.__index.append([_record(series_num) for series_num in range(60)])
+        selected = self.__index.select(data_type='multiplicative', freq='10T', trend='exist')
+        expected = [_record(series_num) for series_num in range(60) if series_num % 2 == 1 and series_num % 3 == 0]
+        self.assertEqual(sorted(selected, key=lambda record: int(record['id'])), expected)
+        selected = self.__index.select(data_type='multiplicative', freq=['1H', '1D'], cyclic_period='no')
+        self.assertEqual(sorted(int(record['id']) for record in selected),
+                         [series_num for series_num in range(60) if series_num % 2 == 1 and series_num % 3 != 0])
+        self.assertEqual(self.__index.count(trend='no'), 15)
+        with self.assertRaises(ValueError):
+            self.__index.select(colour='red')
+
+    def test_append_replaces(self):
+        self.__index.append([_record(3)])
+        self.__index.append([_record(3) | {'data_size': 365}])
+        self.assertEqual([record['data_size'] for record in self.__index.select(id='3')], [365])
+
+    def test_truncate(self):
+        self.__index.append([_record(series_num) for series_num in range(12)])
+        self.__index.truncate(9)
+        self.assertEqual(sorted(int(record['id']) for record in self.__index.select()), list(range(9)),
+                         msg="The time series beyond the count were not removed")
+
+
+if __name__ == '__main__':
+    unittest.main()
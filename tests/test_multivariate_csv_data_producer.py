@@ -0,0 +1,64 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from yaml_configuration_manager import YAMLConfigurationManager
+from multivariate_time_series_generator import MultivariateTimeSeriesGenerator
+from multivariate_csv_data_producer import MultivariateCSVDataProducer
+from tests.test_parallel_runner import CONFIG
+
+
+class TestMultivariateCSVDataProducer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        with open("config.yaml", 'w') as file:
+            file.write(CONFIG)
+        self.__config_manager = YAMLConfigurationManager()
+        self.__config_manager.load_config()
+        self.__generator = MultivariateTimeSeriesGenerator(self.__config_manager, np.eye(2),
+                                                           channel_names=['temperature', 'pressure'], seed=1)
+        self.__producer = MultivariateCSVDataProducer()
+
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
+    def test_produce_data(self):
+        configs = self.__generator.draw_channel_configs()
+        time_series, date_range, anomaly_mask = self.__generator.generate_time_series(configs)
+        self.__producer.produce_data(time_series, date_range, anomaly_mask, configs, "wide")
+        with open('./sample_datasets/wide.csv') as file:
+            self.assertEqual(file.readline().strip(),
+                             "timestamp,temperature,pressure,temperature_anomaly,pressure_anomaly")
+        loaded, loaded_dates, loaded_mask = MultivariateCSVDataProducer.load_data("wide")
+        np.testing.assert_allclose(loaded.to_numpy(), time_series.to_numpy())
+        np.testing.assert_array_equal(loaded_dates, date_range)
+        np.testing.assert_array_equal(loaded_mask, anomaly_mask)
+        self.assertEqual([(record['channel'], record['channels'], record['data_type'], record['noise'])
+                          for record in self.__producer.metadata],
+                         [(channel, 2, config.data_type, config.noise_level)
+                          for channel, config in zip(['temperature', 'pressure'], configs)],
+                         msg="The metadata does not describe each channel")
+
+        self.__producer.generate_metadata_file()
+        self.assertEqual(pd.read_csv('sample_datasets/meta_data.csv')['id'].tolist(), ['wide', 'wide'])
+
+    def test_produce_chunks(self):
+        configs = self.__generator.draw_channel_configs()
+        time_series, date_range, anomaly_mask = self.__generator.generate_time_series(configs)
+        self.__producer.produce_data(time_series, date_range, anomaly_mask, configs, "whole")
+        chunks = [(date_range[first:first + 100], time_series.iloc[first:first + 100],
+                   anomaly_mask[first:first + 100]) for first in range(0, len(date_range), 100)]
+        self.__producer.produce_chunks(chunks, configs, "chunked")
+        with open('./sample_datasets/whole.csv', 'rb') as whole, open('./sample_datasets/chunked.csv', 'rb') as chunked:
+            self.assertEqual(whole.read(), chunked.read(), msg="The chunked file differs from the whole one")
+        self.assertEqual([{key: value for key, value in record.items() if key != 'id'}
+                          for record in self.__producer.metadata[2:]],
+                         [{key: value for key, value in record.items() if key != 'id'}
+                          for record in self.__producer.metadata[:2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
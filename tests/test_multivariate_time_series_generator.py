@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+import pandas as pd
+from yaml_configuration_manager import YAMLConfigurationManager
+from multivariate_time_series_generator import MultivariateTimeSeriesGenerator
+
+CORRELATION = [[1, 0.8, -0.5], [0.8, 1, -0.3], [-0.5, -0.3, 1]]
+
+
+class TestMultivariateTimeSeriesGenerator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__config_manager = YAMLConfigurationManager()
+        self.__config_manager.yaml_data = {
+            "start_date": "1-7-2021", "frequencies": ["1H", "1D"], "daily_seasonality_options": ["exist", "no"],
+            "weekly_seasonality_options": ["exist"], "noise_levels": ["small"], "trend_levels": ["exist", "no"],
+            "cyclic_periods": ["exist"], "data_types": ["additive", "multiplicative"],
+            "percentage_outliers_options": [0.05], "data_sizes": [60, 90], "datasets_num": 1
+        }
+        self.__config_manager.configure()
+        self.__generator = MultivariateTimeSeriesGenerator(self.__config_manager, CORRELATION, span=2, seed=3)
+
+    def test_generate_time_series_success(self):
+        time_series, date_range, anomaly_mask = self.__generator.generate_time_series()
+        self.assertIsInstance(time_series, pd.DataFrame, msg="The time series is not a Pandas DataFrame")
+        self.assertEqual(list(time_series.columns), ['channel_0', 'channel_1', 'channel_2'])
+        self.assertEqual(time_series.shape, (len(date_range), 3), msg="The channels do not share the timestamps")
+        self.assertEqual(anomaly_mask.shape, time_series.shape, msg="Incorrect anomaly mask shape")
+        values = time_series.to_numpy()
+        present = values[~np.isnan(values)]
+        self.assertTrue((present[~anomaly_mask[~np.isnan(values)]] >= -2).all(), msg="The channels are not scaled")
+
+    def test_anomaly_events(self):
+        time_series, date_range, anomaly_mask = self.__generator.generate_time_series()
+        num_points = len(date_range)
+        outlier_events = anomaly_mask.any(axis=1)
+        self.assertEqual(outlier_events.sum(), int(num_points * 0.05), msg="Incorrect number of outlier events")
+        np.testing.assert_array_equal(anomaly_mask[outlier_events].sum(axis=1), 2,
+                                      err_msg="An outlier event does not span 2 channels")
+        missing = time_series.isna().to_numpy()
+        np.testing.assert_array_equal(missing.any(axis=1), missing.all(axis=1),
+                                      err_msg="A missing event does not span every channel")
+        self.assertEqual(missing.all(axis=1).sum(), int(num_points * 0.05), msg="Incorrect number of missing events")
+        self.assertFalse((missing & anomaly_mask).any(), msg="A missing value overwrote an outlier")
+
+    def test_channels_share_anomaly_percentages(self):
+        self.__config_manager.yaml_data = dict(self.__config_manager.yaml_data,
+                                               percentage_outliers_options=[0.01, 0.05, 0.1],
+                                               percentage_missing_options=[0, 0.02, 0.05])
+        self.__config_manager.configure()
+        for seed in range(5):
+            configs = self.__generator.draw_channel_configs()
+            self.assertEqual({(config.percentage_outliers, config.percentage_missing) for config in configs},
+                             {(configs[0].percentage_outliers, configs[0].percentage_missing)},
+                             msg="The channels do not share the percentages their anomalies are drawn with")
+            time_series, date_range, anomaly_mask = self.__generator.generate_time_series(configs, seed=seed)
+            self.assertEqual(anomaly_mask.any(axis=1).sum(), int(len(date_range) * configs[1].percentage_outliers))
+            self.assertEqual(time_series.isna().all(axis=1).sum(),
+                             int(len(date_range) * configs[1].percentage_missing))
+
+    def test_correlated_noise(self):
+        # constant channels, so the noise is the only variation
+        self.__config_manager.yaml_data = dict(self.__config_manager.yaml_data, daily_seasonality_options=["no"],
+                                               weekly_seasonality_options=["no"], trend_levels=["no"],
+                                               cyclic_periods=["no"], data_types=["additive"],
+                                               noise_levels=["large"], frequencies=["10T"], data_sizes=[365])
+        self.__config_manager.configure()
+        time_series, _, anomaly_mask = self.__generator.generate_time_series()
+        values = time_series.to_numpy()
+        kept = ~np.isnan(values).any(axis=1) & ~anomaly_mask.any(axis=1)
+        np.testing.assert_allclose(np.corrcoef(values[kept].T), CORRELATION, atol=0.02)
+        np.testing.assert_allclose(values[kept].std(axis=0), 0.3, atol=0.01)
+
+    def test_seed(self):
+        configs = self.__generator.draw_channel_configs()
+        self.assertEqual({(config.duration, config.frequency) for config in configs},
+                         {(configs[0].duration, configs[0].frequency)}, msg="The channels do not share their range")
+        first = self.__generator.generate_time_series(configs, seed=5)[0]
+        second = self.__generator.generate_time_series(configs, seed=5)[0]
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_invalid_correlation(self):
+        for correlation in ([[1, 0.5], [0.4, 1]], [[1, 2], [2, 1]], [[2, 0], [0, 2]]):
+            with self.assertRaises(ValueError):
+                MultivariateTimeSeriesGenerator(self.__config_manager, correlation)
+        with self.assertRaises(ValueError):
+            MultivariateTimeSeriesGenerator(self.__config_manager, CORRELATION, span=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+import pandas as pd
+import numpy as np
+from npz_data_producer import NPZDataProducer
+from timestamp_range import TimestampRange
+from configuration_manager import ConfigurationManager
+import os
+import tempfile
+
+
+class TestNPZDataProducer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        self.__mock_configuration_manager = Mock(spec=ConfigurationManager)
+        self.__filename = "test_npz"
+        self.__date_range = pd.date_range(start=datetime(2017, 5, 10), end=datetime(2017, 5, 10) + timedelta(days=60),
+                                          freq='1D')
+        self.__anomaly_mask = np.random.default_rng(0).random(len(self.__date_range)) < 0.1
+        self.__time_series = pd.Series(np.sin(np.arange(len(self.__date_range))))
+        self.__time_series[3] = np.nan
+
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
+    def test_produce_data_round_trip(self):
+        for dtype in (np.float64, np.float32):
+            for compress in (True, False):
+                producer = NPZDataProducer(dtype=dtype, compress=compress)
+                producer.produce_data(self.__time_series, self.__date_range, self.__anomaly_mask,
+                                      self.__mock_configuration_manager, self.__filename)
+                self.assertTrue(os.path.exists('./sample_datasets/test_npz.npz'),
+                                "Time series file was not created successfully")
+                time_series, date_range, anomaly_mask = NPZDataProducer.load_data(self.__filename)
+                self.assertEqual(time_series.dtype, dtype, "Values were not stored with the requested dtype")
+                np.testing.assert_array_equal(time_series.to_numpy(), self.__time_series.to_numpy(dtype=dtype))
+                self.assertTrue(date_range.equals(self.__date_range), "Timestamps were not restored")
+                np.testing.assert_array_equal(anomaly_mask, self.__anomaly_mask)
+                self.assertEqual(producer.metadata[-1]['id'], self.__filename, "Time series metadata missing")
+
+    def test_produce_data_range_timestamps(self):
+        producer = NPZDataProducer(timestamps='range')
+        producer.produce_data(self.__time_series, TimestampRange.from_index(self.__date_range), self.__anomaly_mask,
+                              self.__mock_configuration_manager, self.__filename)
+        time_series, date_range, anomaly_mask = NPZDataProducer.load_data(self.__filename)
+        self.assertIsInstance(date_range, TimestampRange, "The timestamps were not saved as a range")
+        self.assertTrue(date_range.to_index().equals(self.__date_range), "Timestamps were not restored")
+        np.testing.assert_array_equal(anomaly_mask, self.__anomaly_mask)
+        with np.load('./sample_datasets/test_npz.npz') as data:
+            self.assertNotIn('timestamp', data.files, "The timestamps were saved point by point")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+import os
+import json
+import tempfile
+import pandas as pd
+from unittest.mock import patch
+from background_data_producer import BackgroundDataProducer
+from parallel_runner import ParallelRunner
+from yaml_configuration_manager import YAMLConfigurationManager
+from csv_data_producer import CSVDataProducer
+from metadata_index import MetadataIndex
+from configuration_plan import ConfigurationPlan
+from memmap_data_producer import MemmapDataProducer
+from memmap_dataset_reader import MemmapDatasetReader
+
+CONFIG = """{
+  start_date : "1-7-2021",
+  frequencies : [ "1D", "8H" ],
+  daily_seasonality_options : [ "no", "exist" ],
+  weekly_seasonality_options : [ "exist", "no" ],
+  noise_levels : [ "small", "large" ],
+  trend_levels : [ "exist", "no" ],
+  cyclic_periods : [ "exist", "no" ],
+  data_types : ["", "additive", "multiplicative"],
+  percentage_outliers_options : [0.05],
+  data_sizes : [ 60, 90 ],
+  datasets_num : 7
+}"""
+
+
+class TestParallelRunner(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
+    def __run(self, workers: int, seed: int = 22, resume: bool = False) -> dict:
+        if not resume:
+            os.chdir(tempfile.mkdtemp())
+            with open("config.yaml", 'w') as file:
+                file.write(CONFIG)
+        ParallelRunner(YAMLConfigurationManager, CSVDataProducer, workers=workers, seed=seed, batch_size=2,
+                       resume=resume).run()
+        outputs = {}
+        for filename in sorted(os.listdir('sample_datasets')):
+            if not filename.endswith('.csv'):
+                continue
+            with open(os.path.join('sample_datasets', filename), 'rb') as file:
+                outputs[filename] = file.read()
+        return outputs
+
+    def test_run_is_independent_of_worker_count(self):
+        single_worker_outputs = self.__run(workers=1)
+        self.assertEqual(len(single_worker_outputs), 8, msg="Expected 7 time series and a metadata file")
+        self.assertEqual(single_worker_outputs, self.__run(workers=3),
+                         msg="The output changed with the number of workers")
+
+    def test_resume(self):
+        outputs = self.__run(workers=1)
+        with open('sample_datasets/manifest.jsonl', 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 7, msg="Expected a manifest line per time series")
+
+        # a run that died after 4 time series, in the middle of the write of a fifth and of the manifest
+        with open('sample_datasets/manifest.jsonl', 'w', encoding='utf-8') as file:
+            file.writelines(lines[:4] + [lines[4][:20]])
+        os.remove('sample_datasets/meta_data.csv')
+        with open('sample_datasets/5.csv', 'w') as file:
+            file.write("value,timestamp")
+        # a completed time series whose output was corrupted afterwards
+        with open('sample_datasets/1.csv', 'a') as file:
+            file.write("0,0,False\n")
+        first_block_mtime = os.path.getmtime('sample_datasets/0.csv')
+
+        self.assertEqual(self.__run(workers=1, resume=True), outputs,
+                         msg="The resumed run differs from an uninterrupted one")
+        self.assertEqual(os.path.getmtime('sample_datasets/0.csv'), first_block_mtime,
+                         msg="A valid time series was written again")
+
+    def test_resume_after_configuration_change(self):
+        self.__run(workers=1)
+        with open("config.yaml", 'w') as file:
+            file.write(CONFIG.replace('[ "1D", "8H" ]', '[ "6H" ]'))
+        self.__run(workers=1, resume=True)
+        plan = ConfigurationPlan.load('sample_datasets/plan.npz')
+        records = {record['id']: record for record in MetadataIndex().select()}
+        for series_num, config in enumerate(plan):
+            self.assertEqual(records[str(series_num)]['freq'], config.frequency, msg="A stale time series was reused")
+            table = CSVDataProducer.load_data(str(series_num))[0]
+            self.assertEqual(len(table), config.duration * 4 + 1, msg="The output does not match the new plan")
+
+    def test_resume_with_fewer_series(self):
+        self.__run(workers=1)
+        with open("config.yaml", 'w') as file:
+            file.write(CONFIG.replace("datasets_num : 7", "datasets_num : 4"))
+        self.__run(workers=1, resume=True)
+        self.assertEqual(sorted(record['id'] for record in MetadataIndex().select()), ['0', '1', '2', '3'],
+                         msg="The index still lists time series the resumed run does not have")
+
+    def test_run_with_profile(self):
+        for trace_memory in (False, True):
+            os.chdir(tempfile.mkdtemp())
+            with open("config.yaml", 'w') as file:
+                file.write(CONFIG)
+            runner = ParallelRunner(YAMLConfigurationManager, CSVDataProducer, seed=22, batch_size=2, profile=True,
+                                    trace_memory=trace_memory)
+            # the stages of a background writer would overlap the generation stages
+            with patch('parallel_runner.BackgroundDataProducer', wraps=BackgroundDataProducer) as background:
+                runner.run()
+            self.assertEqual(background.called, not trace_memory, msg="Memory was traced with a background writer")
+            with open('sample_datasets/profile.jsonl', 'r', encoding='utf-8') as file:
+                summary = {line['stage']: line for line in map(json.loads, file)}
+            self.assertEqual(summary['write']['calls'], 7, msg="Expected a write per time series")
+            self.assertGreater(summary['write']['bytes_written'], 0)
+            self.assertIn('batch_noise', summary)
+            self.assertEqual(summary['batch_noise']['bytes_allocated'] > 0, trace_memory,
+                             msg=f"Allocations recorded incorrectly with trace_memory={trace_memory}")
+            if trace_memory:
+                self.assertTrue(all(record['bytes_allocated'] >= 0 for record in runner.profiler.records),
+                                msg="Overlapping stages corrupted the traced allocations")
+
+    def test_metadata_index(self):
+        self.__run(workers=3)
+        index = MetadataIndex()
+        records = {record['id']: record for record in index.select()}
+        self.assertEqual(sorted(records, key=int), [str(series_num) for series_num in range(7)],
+                         msg="Expected a metadata record per time series")
+        plan = ConfigurationPlan.load('sample_datasets/plan.npz')
+        for series_num, config in enumerate(plan):
+            record = records[str(series_num)]
+            self.assertEqual((record['data_type'], record['freq'], record['data_size'], record['percentage_missing']),
+                             (config.data_type, config.frequency, config.duration, config.percentage_missing),
+                             msg="The recorded configuration differs from the applied one")
+        self.assertEqual(index.count(data_type='multiplicative', freq='8H', trend='exist'),
+                         sum(record['data_type'] == 'multiplicative' and record['freq'] == '8H' and
+                             record['trend'] == 'exist' for record in records.values()))
+        self.assertEqual({record['percentage_missing'] for record in records.values()}, {0.05})
+        self.assertIsInstance(records['0']['data_size'], int, msg="The data size is not stored as an integer")
+
+    def test_weekly_frequency(self):
+        # a frequency whose step is not fixed, the memmap store reserves its lengths from the calendar
+        for producer_class in (CSVDataProducer, MemmapDataProducer):
+            os.chdir(tempfile.mkdtemp())
+            with open("config.yaml", 'w') as file:
+                file.write(CONFIG.replace('[ "1D", "8H" ]', '[ "W" ]'))
+            ParallelRunner(YAMLConfigurationManager, producer_class, batch_size=2).run()
+            plan = ConfigurationPlan.load('sample_datasets/plan.npz')
+            for series_num, config in enumerate(plan):
+                length = len(pd.date_range(start=config.start_date, freq='W',
+                                           end=config.start_date + pd.Timedelta(days=config.duration)))
+                if producer_class is CSVDataProducer:
+                    self.assertEqual(len(CSVDataProducer.load_data(str(series_num))[0]), length)
+                else:
+                    self.assertEqual(len(MemmapDatasetReader()[str(series_num)][0]), length)
+
+    def test_run_depends_on_seed(self):
+        self.assertNotEqual(self.__run(workers=1, seed=1), self.__run(workers=1, seed=2),
+                            msg="Different seeds produced the same datasets")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import json
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime
+from unittest.mock import Mock
+from stage_profiler import StageProfiler, profile_stage
+from configuration_manager import ConfigurationManager
+from time_series_simulator import TimeSeriesGenerator
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__profiler = StageProfiler()
+
+    def test_stage_record(self):
+        with self.__profiler.stage('write', points=10, series='1') as record:
+            record['bytes_written'] = 80
+        self.assertEqual(len(self.__profiler.records), 1)
+        self.assertEqual(record['stage'], 'write')
+        self.assertEqual(record['points'], 10)
+        self.assertEqual(record['bytes_written'], 80)
+        self.assertGreaterEqual(record['seconds'], 0)
+        self.assertIsNone(record['bytes_allocated'], msg="Memory was traced without trace_memory")
+
+    def test_failed_stage_is_not_recorded(self):
+        with self.assertRaises(ValueError):
+            with self.__profiler.stage('write'):
+                raise ValueError
+        self.assertEqual(self.__profiler.records, [])
+
+    def test_trace_memory(self):
+        profiler = StageProfiler(trace_memory=True)
+        with profiler.stage('allocate') as record:
+            data = bytearray(10 ** 6)
+        self.assertGreaterEqual(record['bytes_allocated'], len(data))
+        with profiler.stage('release'):
+            del data
+        self.assertTrue(tracemalloc.is_tracing(), msg="The tracing stopped between the stages")
+        self.assertGreaterEqual(profiler.records[-1]['bytes_allocated'], 0)
+        profiler.stop_tracing()
+        self.assertFalse(tracemalloc.is_tracing(), msg="The tracing was not stopped")
+
+    def test_summary(self):
+        for points in (10, 20):
+            with self.__profiler.stage('noise', points=points):
+                pass
+        self.__profiler.extend([{'stage': 'write', 'series': '1', 'points': 30, 'seconds': 0.5,
+                                 'bytes_allocated': None, 'bytes_written': 100}])
+        noise, write = self.__profiler.summary()
+        self.assertEqual((noise['stage'], noise['calls'], noise['points']), ('noise', 2, 30))
+        self.assertEqual(write['bytes_written'], 100)
+        self.assertEqual(write['points_per_second'], 60)
+
+        path = os.path.join(tempfile.mkdtemp(), 'profile.jsonl')
+        self.__profiler.write_summary(path, include_records=True)
+        with open(path, 'r', encoding='utf-8') as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(len(lines), 2 + 3, msg="Expected a line per stage and per record")
+
+    def test_profile_stage_without_profiler(self):
+        with profile_stage(None, 'noise', 10) as record:
+            record['bytes_written'] = 1
+
+    def test_generator_stages(self):
+        config_manager = Mock(spec=ConfigurationManager)
+        config_manager.start_date = datetime(2021, 7, 1)
+        config_manager.duration = 30
+        config_manager.frequency = "1H"
+        config_manager.daily_seasonality = config_manager.weekly_seasonality = "exist"
+        config_manager.trend_level = config_manager.cyclic_period = "exist"
+        config_manager.data_type = "additive"
+        config_manager.noise_level = "small"
+        config_manager.percentage_outliers = 0.05
+        config_manager.percentage_missing = 0.05
+        TimeSeriesGenerator(config_manager, seed=0, profiler=self.__profiler).generate_time_series()
+        self.assertEqual([record['stage'] for record in self.__profiler.records],
+                         ['date_range', 'components', 'scaling', 'noise', 'anomaly_positions', 'outliers',
+                          'missing_values'])
+        self.assertTrue(all(record['points'] == 30 * 24 + 1 for record in self.__profiler.records))
+
+
+if __name__ == '__main__':
+    unittest.main()
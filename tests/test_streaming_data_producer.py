@@ -0,0 +1,114 @@
+import unittest
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from unittest.mock import Mock
+import numpy as np
+import pandas as pd
+from streaming_data_producer import StreamingDataProducer, FRAME_DTYPE, parse_address
+from configuration_manager import ConfigurationManager
+from parallel_runner import ParallelRunner
+from yaml_configuration_manager import YAMLConfigurationManager
+from tests.test_parallel_runner import CONFIG
+
+
+class TestStreamingDataProducer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__working_directory = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        self.__mock_configuration_manager = Mock(spec=ConfigurationManager)
+        self.__received = bytearray()
+        rng = np.random.default_rng(0)
+        self.__series = {}
+        for series_id, length in (("3", 50), ("8", 20)):
+            date_range = pd.date_range(start=datetime(2021, 7, 1), periods=length, freq='1s')
+            self.__series[series_id] = (pd.Series(rng.random(length)), date_range, rng.random(length) < 0.2)
+
+    def tearDown(self) -> None:
+        os.chdir(self.__working_directory)
+
+    def __receive(self, server: socket.socket, received: bytearray = None) -> None:
+        received = self.__received if received is None else received
+        connection, _ = server.accept()
+        with connection:
+            while data := connection.recv(65536):
+                received.extend(data)
+
+    def __produce(self, **kwargs) -> StreamingDataProducer:
+        with socket.create_server(('127.0.0.1', 0)) as server:
+            reader = threading.Thread(target=self.__receive, args=(server,))
+            reader.start()
+            producer = StreamingDataProducer(address=server.getsockname(), **kwargs)
+            for series_id, (time_series, date_range, anomaly_mask) in self.__series.items():
+                producer.produce_data(time_series, date_range, anomaly_mask, self.__mock_configuration_manager,
+                                      series_id)
+            producer.close()
+            reader.join(timeout=5)
+        return producer
+
+    def test_line_framing(self):
+        producer = self.__produce()
+        lines = self.__received.decode('ascii').splitlines()
+        self.assertEqual(len(lines), 70, msg="Not every point was streamed")
+        self.assertEqual(producer.points_sent, 70)
+        self.assertEqual(producer.bytes_sent, len(self.__received))
+        for channel, (time_series, date_range, anomaly_mask) in self.__series.items():
+            points = [line.split(',') for line in lines if line.startswith(f"{channel},")]
+            np.testing.assert_array_equal([int(point[1]) for point in points], date_range.asi8)
+            np.testing.assert_array_equal([float(point[2]) for point in points], time_series.to_numpy())
+            np.testing.assert_array_equal([point[3] == '1' for point in points], anomaly_mask)
+        self.assertEqual([(record['id'], record['channel']) for record in producer.metadata], [("3", 3), ("8", 8)])
+
+    def test_binary_framing(self):
+        self.__produce(framing='binary')
+        frames = np.frombuffer(bytes(self.__received), dtype=FRAME_DTYPE)
+        self.assertEqual(FRAME_DTYPE.itemsize, 21)
+        time_series, date_range, anomaly_mask = self.__series["3"]
+        points = frames[frames['channel'] == 3]
+        np.testing.assert_array_equal(points['timestamp'], date_range.asi8)
+        np.testing.assert_array_equal(points['value'], time_series.to_numpy())
+        np.testing.assert_array_equal(points['anomaly'], anomaly_mask)
+
+    def test_speedup(self):
+        # the 50 points of "3" span 49 seconds, emitted 100 times faster they take about 0.49 seconds, while the
+        # two series are streamed concurrently
+        start = time.perf_counter()
+        producer = self.__produce(speedup=100)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.45, msg="The points were not paced")
+        self.assertLess(time.perf_counter() - start, 0.45 + 0.19 + 1, msg="The series were not streamed concurrently")
+        self.assertEqual(producer.throughput()['points_sent'], 70)
+
+    def test_channels_across_blocks(self):
+        # every block of a run has its own producer and connection, the channels must still be unique
+        with open("config.yaml", 'w') as file:
+            file.write(CONFIG)
+        with socket.create_server(('127.0.0.1', 0)) as server:
+            server.settimeout(5)
+            connections = [bytearray() for _ in range(4)]
+            readers = [threading.Thread(target=self.__receive, args=(server, received)) for received in connections]
+            for reader in readers:
+                reader.start()
+            producer_class = partial(StreamingDataProducer, address=server.getsockname(), framing='binary')
+            ParallelRunner(YAMLConfigurationManager, producer_class, batch_size=2).run()
+            for reader in readers:
+                reader.join(timeout=5)
+        metadata = pd.read_csv('sample_datasets/meta_data.csv')
+        np.testing.assert_array_equal(metadata['channel'], metadata['id'], err_msg="A channel is not its series id")
+        channels = [np.frombuffer(bytes(received), dtype=FRAME_DTYPE)['channel'] for received in connections]
+        self.assertEqual(sorted(np.concatenate([np.unique(block) for block in channels]).tolist()), list(range(7)),
+                         msg="The channels of the blocks collide")
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("localhost:9999"), ("localhost", 9999))
+        self.assertEqual(parse_address(":9999"), ("127.0.0.1", 9999))
+        self.assertEqual(parse_address("unix:/tmp/stream.sock"), "/tmp/stream.sock")
+        self.assertIsNone(parse_address("-"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,19 @@
 import unittest
+import tracemalloc
+from unittest.mock import Mock
+from configuration_manager import ConfigurationManager
 from yaml_configuration_manager import YAMLConfigurationManager
 from time_series_simulator import TimeSeriesGenerator
+from timestamp_range import TimestampRange
 import pandas as pd
 import numpy as np
 
+# the configuration the tests start from, each of them overriding the options it is about
+YAML_DATA = {"start_date": "1-7-2021", "frequencies": ["1H"], "daily_seasonality_options": ["exist"],
+             "weekly_seasonality_options": ["exist"], "noise_levels": ["no"], "trend_levels": ["exist"],
+             "cyclic_periods": ["exist"], "data_types": ["additive"], "percentage_outliers_options": [0],
+             "data_sizes": [30], "datasets_num": 1}
+
 
 class TestTimeSeriesSimulator(unittest.TestCase):
 
@@ -15,9 +25,162 @@ class TestTimeSeriesSimulator(unittest.TestCase):
         result = self.__generator.generate_time_series()
         self.assertEqual(len(result), 3, "generate_time_series did not return a tuple of length 3")
         self.assertIsInstance(result[0], pd.Series, msg="The time series is not a Pandas Series")
-        self.assertIsInstance(result[1], pd.DatetimeIndex, msg="The date range is not a Pandas DateTimeIndex")
+        self.assertIsInstance(result[1], TimestampRange, msg="The date range is not a TimestampRange")
         self.assertIsInstance(result[2], np.ndarray, msg="The anomaly mask is not a NumPy nd-array")
 
+    def test_add_noise_scale(self):
+        config_manager = Mock(spec=ConfigurationManager)
+        generator = TimeSeriesGenerator(config_manager, seed=0)
+        for noise_level, expected_std in (("small", 0.05), ("large", 0.15), ("no", 0.0)):
+            config_manager.noise_level = noise_level
+            values = np.full(200000, -0.5)
+            generator._TimeSeriesGenerator__time_series = values
+            noisy = generator._TimeSeriesGenerator__add_noise()
+            self.assertIs(noisy, values, msg="The noise was not added in place")
+            self.assertAlmostEqual(noisy.mean(), -0.5, places=2, msg=f"Noise is biased for level {noise_level}")
+            self.assertAlmostEqual(noisy.std(), expected_std, places=2,
+                                   msg=f"Incorrect noise scale for level {noise_level}")
+
+    def test_generate_batch_matches_generate_time_series(self):
+        for data_type in ("additive", "multiplicative", ""):
+            self.__config_manager.yaml_data = YAML_DATA | {
+                "frequencies": ["6H"], "trend_levels": ["no"], "data_types": [data_type], "data_sizes": [60],
+                "datasets_num": 3
+            }
+            self.__config_manager.configure()
+            expected = self.__generator.generate_time_series()[0].to_numpy()
+            batches = self.__generator.generate_batch(3)
+            self.assertEqual(len(batches), 1, msg="Series sharing their timestamps were not grouped together")
+            series_ids, time_series, date_range, anomaly_mask, configs = batches[0]
+            np.testing.assert_array_equal(series_ids, np.arange(3))
+            self.assertEqual(time_series.shape, (3, len(date_range)), msg="Incorrect batch shape")
+            self.assertFalse(anomaly_mask.any(), msg="Outliers were added while none were configured")
+            for row in time_series:
+                present = ~np.isnan(row) & ~np.isnan(expected)
+                np.testing.assert_allclose(row[present], expected[present], atol=1e-12,
+                                           err_msg=f"Batch differs from single generation for '{data_type}' data")
+                self.assertEqual(np.isnan(row).sum(), int(len(row) * 0.05), msg="Incorrect number of missing values")
+
+    def test_generate_time_series_chunks_matches_generate_time_series(self):
+        self.__config_manager.yaml_data = YAML_DATA | {
+            "frequencies": ["30T"], "percentage_outliers_options": [0.05], "data_sizes": [120]
+        }
+        self.__config_manager.configure()
+        time_series, date_range, anomaly_mask = TimeSeriesGenerator(self.__config_manager, seed=5)\
+            .generate_time_series()
+        chunks = list(TimeSeriesGenerator(self.__config_manager, seed=5).generate_time_series_chunks(chunk_size=1000))
+        self.assertTrue(all(len(values) <= 1000 for _, values, _ in chunks), msg="A chunk exceeds the chunk size")
+
+        timestamps = np.concatenate([chunk_timestamps for chunk_timestamps, _, _ in chunks])
+        values = np.concatenate([chunk_values for _, chunk_values, _ in chunks])
+        chunks_anomaly_mask = np.concatenate([chunk_anomaly_mask for _, _, chunk_anomaly_mask in chunks])
+        np.testing.assert_array_equal(timestamps, date_range.to_numpy())
+        np.testing.assert_array_equal(values, time_series.to_numpy())
+        np.testing.assert_array_equal(chunks_anomaly_mask, anomaly_mask)
+
+    def test_generate_time_series_window_matches_generate_batch(self):
+        for frequency, data_type in (("1H", "multiplicative"), ("10T", "additive"), ("7H", ""), ("7T", "additive"),
+                                     ("45s", "multiplicative")):
+            self.__config_manager.yaml_data = YAML_DATA | {
+                "start_date": "14-2-2021", "frequencies": [frequency], "noise_levels": ["large"],
+                "data_types": [data_type], "percentage_outliers_options": [0.05], "data_sizes": [365]
+            }
+            self.__config_manager.configure()
+            config = self.__config_manager.snapshot()
+            _, time_series, date_range, anomaly_mask, _ = self.__generator.generate_batch(1, seeds=[11])[0]
+            num_points = len(date_range)
+            self.assertEqual(TimeSeriesGenerator.series_length(config), num_points, msg="Incorrect series length")
+            for first_point, last_point in ((0, 1), (1, 9000), (num_points // 2, num_points // 2 + 77),
+                                            (num_points - 5, num_points + 10)):
+                values, timestamps, mask = self.__generator.generate_time_series_window(first_point, last_point,
+                                                                                        config, seed=11)
+                np.testing.assert_array_equal(values.to_numpy(), time_series[0, first_point:last_point],
+                                              err_msg=f"Window {first_point}:{last_point} of {frequency} differs")
+                np.testing.assert_array_equal(timestamps, date_range[first_point:last_point])
+                np.testing.assert_array_equal(mask, anomaly_mask[0, first_point:last_point])
+
+    def test_component_cache(self):
+        self.__config_manager.yaml_data = YAML_DATA | {"trend_levels": ["no"]}
+        self.__config_manager.configure()
+        first = self.__generator.generate_time_series()[0].to_numpy()
+        misses = self.__generator.cache_info['misses']
+        second = self.__generator.generate_time_series()[0].to_numpy()
+        self.assertEqual(self.__generator.cache_info['misses'], misses, msg="A cached component was recomputed")
+        self.assertGreaterEqual(self.__generator.cache_info['hits'], 4, msg="The components were not cached")
+        present = ~np.isnan(first) & ~np.isnan(second)
+        np.testing.assert_array_equal(first[present], second[present])
+
+    def test_scaling(self):
+        for trend_level, data_type in (("exist", "multiplicative"), ("no", "additive")):
+            self.__config_manager.yaml_data = YAML_DATA | {
+                "daily_seasonality_options": ["no"], "weekly_seasonality_options": ["no"],
+                "trend_levels": [trend_level], "cyclic_periods": ["no"], "data_types": [data_type]
+            }
+            self.__config_manager.configure()
+            time_series = self.__generator.generate_time_series()[0]
+            present = time_series.notna().to_numpy()
+            values = time_series.to_numpy()[present]
+            if trend_level == "exist":
+                # the missing values can hide the first or last point, the whole ramp is compared instead
+                ramp = np.linspace(-1, 1, len(time_series))
+                ramp = ramp if values[0] < values[-1] else ramp[::-1]
+                np.testing.assert_allclose(values, ramp[present], atol=1e-12,
+                                           err_msg="The scaled time series does not go from -1 to 1")
+            else:
+                self.assertTrue((values == -1).all(), msg="A constant time series was not mapped to -1")
+
+    def test_outliers_and_missing_values_are_disjoint(self):
+        self.__config_manager.yaml_data = YAML_DATA | {
+            "noise_levels": ["small"], "percentage_outliers_options": [0.1], "percentage_missing_options": [0.02],
+            "data_sizes": [100]
+        }
+        self.__config_manager.configure()
+        time_series, date_range, anomaly_mask = self.__generator.generate_time_series()
+        chunks = list(self.__generator.generate_time_series_chunks(chunk_size=500))
+        _, batch, _, batch_mask, _ = self.__generator.generate_batch(3)[0]
+        num_points = len(date_range)
+        for values, mask in [(time_series.to_numpy(), anomaly_mask),
+                             (np.concatenate([chunk[1] for chunk in chunks]),
+                              np.concatenate([chunk[2] for chunk in chunks]))] + list(zip(batch, batch_mask)):
+            self.assertEqual(np.count_nonzero(mask), int(num_points * 0.1), msg="Incorrect number of outliers")
+            self.assertEqual(np.count_nonzero(np.isnan(values)), int(num_points * 0.02),
+                             msg="Incorrect number of missing values")
+            self.assertFalse(np.isnan(values[mask]).any(), msg="A missing value overwrote an outlier")
+
+    def test_generate_time_series_peak_memory(self):
+        self.__config_manager.yaml_data = YAML_DATA | {
+            "frequencies": ["10T"], "noise_levels": ["small"], "percentage_outliers_options": [0.05],
+            "data_sizes": [365]
+        }
+        self.__config_manager.configure()
+        self.__generator.generate_time_series()  # fills the component cache
+        tracemalloc.start()
+        try:
+            time_series = self.__generator.generate_time_series()[0]
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # the returned buffer, a newly cached trend when the other slope is drawn, and one scratch array
+        self.assertLess(peak, 3.5 * time_series.to_numpy().nbytes,
+                        msg="Generating a time series allocates too many copies of it")
+
+    def test_generate_time_series_window_peak_memory(self):
+        self.__config_manager.yaml_data = YAML_DATA | {
+            "frequencies": ["1s"], "noise_levels": ["small"], "data_types": ["multiplicative"],
+            "percentage_outliers_options": [0.05], "data_sizes": [365]
+        }
+        self.__config_manager.configure()
+        config = self.__config_manager.snapshot()
+        tracemalloc.start()
+        try:
+            values = self.__generator.generate_time_series_window(10 ** 7, 10 ** 7 + 1000, config, seed=3)[0]
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # the bounds of the 31 million points are found from a few thousand of them
+        self.assertEqual(len(values), 1000)
+        self.assertLess(peak, 2 ** 20, msg="Generating a window allocates memory growing with the time series")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pandas as pd
+from timestamp_range import TimestampRange, concat_timestamps, to_datetime_index
+
+
+class TestTimestampRange(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__date_range = pd.date_range(start='1969-12-25 03:00', periods=5000, freq='7h')
+        self.__timestamps = TimestampRange('1969-12-25 03:00', '7h', 5000)
+
+    def test_matches_date_range(self):
+        self.assertEqual(len(self.__timestamps), len(self.__date_range))
+        np.testing.assert_array_equal(self.__timestamps.asi8, self.__date_range.asi8)
+        self.assertTrue(self.__timestamps.to_index().equals(self.__date_range), "Incorrect timestamps")
+        self.assertEqual(self.__timestamps.end, self.__date_range[-1])
+        self.assertEqual(TimestampRange.from_index(self.__date_range), self.__timestamps)
+        self.assertTrue(to_datetime_index(self.__timestamps).equals(self.__date_range))
+
+    def test_calendar_features(self):
+        for feature in ('hour', 'dayofweek', 'month', 'quarter'):
+            np.testing.assert_array_equal(getattr(self.__timestamps, feature),
+                                          getattr(self.__date_range, feature).to_numpy(),
+                                          err_msg=f"Incorrect {feature}")
+
+    def test_indexing(self):
+        self.assertEqual(self.__timestamps[17], self.__date_range[17])
+        self.assertEqual(self.__timestamps[-1], self.__date_range[-1])
+        for window in (slice(10, 25), slice(None, 3), slice(4990, None), slice(3, 40, 4), slice(20, 10)):
+            self.assertTrue(self.__timestamps[window].to_index().equals(pd.DatetimeIndex(self.__date_range[window])),
+                            f"Incorrect slice {window}")
+        with self.assertRaises(IndexError):
+            self.__timestamps[5000]
+        self.assertEqual(self.__timestamps.searchsorted(self.__date_range[70]), 70)
+        self.assertEqual(self.__timestamps.searchsorted(self.__date_range[70] + pd.Timedelta(1)), 71)
+
+    def test_hash_matches_equality(self):
+        for first, second in ((self.__timestamps[10:10], self.__timestamps[30:20]),
+                              (self.__timestamps[5:6], TimestampRange(self.__date_range[5], '1h', 1))):
+            self.assertEqual(first, second)
+            self.assertEqual(hash(first), hash(second), msg=f"{first} and {second} are equal but hash differently")
+        self.assertEqual(len({self.__timestamps, TimestampRange.from_index(self.__date_range)}), 1)
+
+    def test_concat_timestamps(self):
+        chunks = [self.__timestamps[first:first + 300] for first in range(0, len(self.__timestamps), 300)]
+        self.assertEqual(concat_timestamps(chunks), self.__timestamps, "Consecutive ranges were not joined")
+        joined = concat_timestamps([chunks[0], chunks[2]])
+        self.assertIsInstance(joined, pd.DatetimeIndex)
+        self.assertEqual(len(joined), 600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -63,6 +63,24 @@ class TestYAMLConfigurationManager(unittest.TestCase):
                          self.__config_manager.yaml_data['datasets_num'],
                          msg="Incorrect dataset number")
 
+    def test_configure_follows_plan(self):
+        self.__config_manager.yaml_data = {
+            "start_date": "1-7-2021", "frequencies": ["1D", "1H"], "daily_seasonality_options": ["no", "exist"],
+            "weekly_seasonality_options": ["exist", "no"], "noise_levels": ["small"], "trend_levels": ["exist", "no"],
+            "cyclic_periods": ["exist", "no"], "data_types": ["", "additive"], "percentage_outliers_options": [0.05],
+            "data_sizes": [60, 90], "datasets_num": 3
+        }
+        plan = self.__config_manager.compile_plan()
+        for position in range(3):
+            self.__config_manager.configure()
+            snapshot = self.__config_manager.snapshot()
+            self.assertEqual((self.__config_manager.duration, self.__config_manager.frequency),
+                             (plan[position].duration, plan[position].frequency),
+                             msg="The configurations do not follow the plan")
+            self.assertEqual(snapshot.data_type, plan[position].data_type)
+        self.__config_manager.configure()
+        self.assertIsNot(self.__config_manager.plan, plan, msg="No new plan was compiled once it was exhausted")
+
 
 if __name__ == '__main__':
     unittest.main()
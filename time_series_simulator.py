@@ -1,185 +1,631 @@
-import random
-import pandas as pd
+from __future__ import annotations
+import math
 import numpy as np
 from datetime import timedelta
+from typing import TYPE_CHECKING
 from configuration_manager import ConfigurationManager
-from sklearn.preprocessing import MinMaxScaler
+from configuration_plan import ConfigurationPlan, NoiseLevel, DataType, SeriesConfig
+from component_cache import ComponentCache
+from component_registry import ComponentRegistry, TimeFeatures
+from counter_rng import CounterRNG
+from index_sampler import IndexSampler
+from stage_profiler import StageProfiler, profile_stage
+from timestamp_range import TimestampRange
 from abstract_time_series_generator import AbstractTimeSeriesGenerator
 
-
-random.seed(22)
+if TYPE_CHECKING:  # pandas is only imported once a time series is generated, to keep this module fast to import
+    import pandas as pd
 
 
 class TimeSeriesGenerator(AbstractTimeSeriesGenerator):
 
-    def __init__(self, config_manager: ConfigurationManager):
+    def __init__(self, config_manager: ConfigurationManager, seed=None, cache_size: int = 64,
+                 profiler: StageProfiler = None, registry: ComponentRegistry = None):
         self.__time_series = None
         self.__date_range = None
         self.__anomaly_mask = None
+        self.__outlier_indices = None
+        self.__missing_indices = None
         self.__config_manager = config_manager
+        self.__rng = np.random.default_rng(seed)
+        self.__series_rng = CounterRNG.from_generator(self.__rng)
+        self.__sampler = IndexSampler(self.__series_rng)
+        self.__cache = ComponentCache(maxsize=cache_size)
+        self.__profiler = profiler
+        self.__registry = registry if registry is not None else ComponentRegistry.default()
 
     @property
     def time_series(self):
         return self.__time_series
 
+    @property
+    def rng(self):
+        return self.__rng
+
+    @rng.setter
+    def rng(self, value):
+        self.__rng = value
+
+    @property
+    def registry(self):
+        return self.__registry
+
+    @property
+    def cache_info(self) -> dict:
+        return self.__cache.info()
+
+    @property
+    def profiler(self):
+        return self.__profiler
+
+    @profiler.setter
+    def profiler(self, value):
+        self.__profiler = value
+
+    @staticmethod
+    def __build_date_range(config_manager: ConfigurationManager) -> TimestampRange | pd.DatetimeIndex:
+        """
+            builds the timestamps described by the start date, duration and frequency of a configuration, as a
+            TimestampRange for fixed frequencies (days, hours, minutes...), which does not store them
+        Args:
+            config_manager (ConfigurationManager): the configuration of the time series.
+
+        Returns:
+            (
+            TimestampRange | pd.DatetimeIndex: the timestamps of the time series.)
+        """
+        import pandas as pd
+        from pandas.tseries.frequencies import to_offset
+        from pandas.tseries.offsets import Tick
+        if isinstance(to_offset(config_manager.frequency), Tick):
+            return TimestampRange(config_manager.start_date, config_manager.frequency,
+                                  TimeSeriesGenerator.series_length(config_manager))
+        return pd.date_range(start=config_manager.start_date,
+                             end=config_manager.start_date + timedelta(days=config_manager.duration),
+                             freq=config_manager.frequency)
+
     def __generate_data_range(self) -> None:
         """
-            generate the DatetimeIndex to be used in the time series generation
+            generate the timestamps to be used in the time series generation
         """
-        date_rng = pd.date_range(start=self.__config_manager.start_date,
-                                 end=self.__config_manager.start_date + timedelta(days=self.__config_manager.duration),
-                                 freq=self.__config_manager.frequency)
+        config_manager = self.__config_manager
+        # the timestamps are immutable, so the cached ones are shared instead of copied
+        date_rng = self.__cache.get(('date_range', config_manager.start_date, config_manager.duration,
+                                     config_manager.frequency), lambda: self.__build_date_range(config_manager))
         self.__time_series = date_rng
-        self.__date_range = date_rng.copy(deep=True)
+        self.__date_range = date_rng
 
-    def __add_daily_seasonality(self) -> pd.Series:
+    def __add_noise(self) -> np.ndarray:
         """
-            creates the daily seasonality component.
-
+            Adds noise to the existing time series, in place.
         Returns:
             (
-            pd.Series: the daily seasonality component of the time series)
+            np.ndarray: the time series with noise added.)
+        """
+        if self.__config_manager.noise_level == "small":
+            noise_level = 0.1
+            # noise = np.random.normal(0, 0.05, len(data))
+        elif self.__config_manager.noise_level == "large":
+            noise_level = 0.3
+            # noise = np.random.normal(0, 0.1, len(data))
+        else:  # No Noise
+            noise_level = 0
+
+        values = self.__time_series
+        if noise_level > 0:
+            # the standard deviation of each point is proportional to its magnitude, the standard normal draw is
+            # symmetric so scaling it by the value instead of its absolute value gives the same distribution
+            noise = self.__series_rng.standard_normal(0, len(values))
+            noise *= noise_level
+            noise *= values
+            values += noise
+        return values
 
+    def __draw_anomaly_positions(self) -> None:
         """
-        if self.__config_manager.daily_seasonality == "exist":  # Daily Seasonality
-            seasonal_component = np.sin(2 * np.pi * self.__time_series.hour / 24)
-            seasonal_component += 1 if self.__config_manager.data_type == 'multiplicative' else 0
-        else:
-            seasonal_component = np.zeros(len(self.__time_series.hour)) \
-                if self.__config_manager.data_type == 'additive' else np.ones(len(self.__time_series))
-        return pd.Series(seasonal_component)
+            Draws the positions of the outliers and of the missing values jointly, so that a missing value never
+            hides an outlier
+        """
+        num_points = len(self.__time_series)
+        self.__outlier_indices, self.__missing_indices = self.__sampler.sample(
+            num_points, [int(num_points * self.__config_manager.percentage_outliers),
+                         int(num_points * self.__config_manager.percentage_missing)])
 
-    def __add_weekly_seasonality(self) -> pd.Series:
+    def __add_outliers(self) -> np.ndarray:
+        """
+            Adds outliers to the time series at the positions drawn by __draw_anomaly_positions, in place
+        Returns:
+            (
+            np.ndarray: a mask indicating whether each point is an outlier or not.)
         """
-            creates the weekly seasonality component.
+        self.__time_series[self.__outlier_indices] = self.__series_rng.uniform(self.__outlier_indices, -1, 1)
+        return self.__sampler.to_mask(self.__outlier_indices, len(self.__time_series))
+
+    def __add_missing_values(self) -> np.ndarray:
+        """
+            Removes the data points at the positions drawn by __draw_anomaly_positions to simulate missing values,
+            in place
 
         Returns:
             (
-            pd.Series: the weekly seasonality component of the time series)
+            np.ndarray: the time series with simulated missing values.)
+        """
+        self.__time_series[self.__missing_indices] = np.nan
+        return self.__time_series
 
+    def __combine_components(self) -> np.ndarray:
         """
-        if self.__config_manager.weekly_seasonality == "exist":  # Weekly Seasonality
-            seasonal_component = np.sin(2 * np.pi * self.__time_series.dayofweek / 7)
-            seasonal_component += 1 if self.__config_manager.data_type == 'multiplicative' else 0
-        else:
-            seasonal_component = np.zeros(len(self.__time_series)) \
-                if self.__config_manager.data_type == 'additive' else np.ones(len(self.__time_series))
-        return pd.Series(seasonal_component)
+            combines the components of the time series into a new buffer, as a group of one time series
 
-    def __add_trend(self) -> pd.Series:
+        Returns:
+            (
+            np.ndarray: the unscaled time series.)
         """
-            creates the trend component.
+        config_manager = self.__config_manager
+        num_points = len(self.__date_range)
+        time_series = np.empty((1, num_points))
+        self.__combine_rows([SeriesConfig.from_config_manager(config_manager)], [self.__series_rng],
+                            TimeFeatures(self.__date_range, num_points), time_series,
+                            range_key=(config_manager.start_date, config_manager.duration, config_manager.frequency))
+        return time_series[0]
+
+    @staticmethod
+    def __min_max_scale(values: np.ndarray, data_min, data_max) -> np.ndarray:
+        """
+            scales the time series to [-1, 1] in place, a constant time series is mapped to -1.
+        Args:
+            values (np.ndarray): the unscaled time series, or a range of it.
+            data_min: the minimum of the whole time series, an array of one minimum per row for a matrix.
+            data_max: the maximum of the whole time series, an array of one maximum per row for a matrix.
 
         Returns:
             (
-            pd.Series: the trend component of the time series)
+            np.ndarray: the scaled values, the same array as values)
+        """
+        data_range = data_max - data_min
+        scale = 2 / np.where(data_range == 0, 1, data_range)
+        values *= scale
+        values += -1 - data_min * scale
+        return values
 
+    def generate_time_series(self) -> (pd.Series, TimestampRange, np.ndarray):
+        """
+            Generates a time series.
+
+        Returns:
+
+        (
+            pd.Series: the generated time series.
+            TimestampRange: the timestamps of each data point in the time series.
+            np.ndarray: indicates whether each data point is an anomaly or not.
+        )
         """
-        if self.__config_manager.trend_level == "exist":
-            slope = random.choice([1, -1])
-            trend_component = np.linspace(0, self.__config_manager.duration / 30 * slope, len(self.__time_series))\
-                if slope == 1 else np.linspace(-1 * self.__config_manager.duration / 30, 0, len(self.__time_series))
-        else:  # No Trend
-            trend_component = np.zeros(len(self.__time_series)) \
-                if self.__config_manager.data_type == 'additive' else np.ones(len(self.__time_series))
+        self.__series_rng = CounterRNG.from_generator(self.__rng)
+        self.__sampler.rng = self.__series_rng
+        with profile_stage(self.__profiler, 'date_range') as record:
+            self.__generate_data_range()
+            record['points'] = num_points = len(self.__date_range)
+        # every step below works in place on the buffer returned by __combine_components
+        with profile_stage(self.__profiler, 'components', num_points):
+            self.__time_series = self.__combine_components()
+        with profile_stage(self.__profiler, 'scaling', num_points):
+            self.__min_max_scale(self.__time_series, self.__time_series.min(), self.__time_series.max())
+        with profile_stage(self.__profiler, 'noise', num_points):
+            self.__add_noise()
+        with profile_stage(self.__profiler, 'anomaly_positions', num_points):
+            self.__draw_anomaly_positions()
+        with profile_stage(self.__profiler, 'outliers', num_points):
+            self.__anomaly_mask = self.__add_outliers()
+        with profile_stage(self.__profiler, 'missing_values', num_points):
+            self.__add_missing_values()
 
-        return pd.Series(trend_component)
+        import pandas as pd
+        self.__time_series = pd.Series(self.__time_series, copy=False)
+        return self.__time_series, self.__date_range, self.__anomaly_mask
 
-    def __add_cycles(self):
+    def generate_time_series_chunks(self, chunk_size: int = 100000):
         """
-            creates the cyclic component.
+            Generates a time series as a stream of fixed-size chunks, holding only one chunk in memory at a time.
+            Each chunk is a window of the time series, generated like generate_time_series_window, so the chunks
+            put together are exactly the time series generate_time_series gives from the same generator state.
+            Only fixed frequencies (days, hours, minutes...) are supported.
+        Args:
+            chunk_size (int): the maximum number of points of a chunk.
+
         Returns:
-            the cyclic component of the time series
+
+        (
+            generator: yields a (TimestampRange, np.ndarray, np.ndarray) tuple per chunk holding the timestamps,
+                the values and the anomaly mask of the chunk.
+        )
         """
-        if self.__config_manager.cyclic_period == "exist":  # Quarterly
-            cycle_component = 1 if self.__config_manager.data_type == 'multiplicative' else 0
-            cycle_component += np.sin(2 * np.pi * (self.__time_series.quarter - 1) / 4)
-        else:  # No Cyclic Periods
-            cycle_component = 0 if self.__config_manager.data_type == 'additive' else 1
+        config = self.__config_manager.snapshot()
+        rngs = [CounterRNG.from_generator(self.__rng)]
+        num_points = self.series_length(config)
+        # the bounds of the scaling are found once for all the chunks
+        bounds = self.__series_bounds([config], rngs, num_points)
+        for first_point in range(0, num_points, chunk_size):
+            time_series, timestamps, anomaly_mask = self.__generate_batch_group(
+                [config], rngs, first_point, min(first_point + chunk_size, num_points), bounds)
+            yield timestamps, time_series[0], anomaly_mask[0]
 
-        return cycle_component
+    @staticmethod
+    def __step(config: ConfigurationManager) -> pd.Timedelta:
+        """
+            the time between two points of a time series of fixed frequency
+        Args:
+            config (ConfigurationManager): the configuration of the time series.
 
-    def __add_noise(self) -> pd.Series:
+        Returns:
+            (
+            pd.Timedelta: the step of the timestamps.)
+        """
+        import pandas as pd
+        from pandas.tseries.frequencies import to_offset
+        return pd.Timedelta(to_offset(config.frequency))
+
+    @staticmethod
+    def series_length(config: ConfigurationManager) -> int:
         """
-            Adds noise to the existing time series.
+            computes the number of points of a time series, without building its timestamps when its frequency is
+            fixed (days, hours, minutes...)
+        Args:
+            config (ConfigurationManager): the configuration of the time series.
+
         Returns:
             (
-            pd.Series: the time series with noise added.)
+            int: the number of points of the time series.)
         """
-        if self.__config_manager.noise_level == "small":
-            noise_level = 0.1
-            # noise = np.random.normal(0, 0.05, len(data))
-        elif self.__config_manager.noise_level == "large":
-            noise_level = 0.3
-            # noise = np.random.normal(0, 0.1, len(data))
-        else:  # No Noise
-            noise_level = 0
+        import pandas as pd
+        from pandas.tseries.frequencies import to_offset
+        from pandas.tseries.offsets import Tick
+        if isinstance(to_offset(config.frequency), Tick):
+            return timedelta(days=config.duration) // TimeSeriesGenerator.__step(config) + 1
+        # e.g. weeks or months, whose number depends on the calendar
+        return len(pd.date_range(start=config.start_date, end=config.start_date + timedelta(days=config.duration),
+                                 freq=config.frequency))
+
+    @staticmethod
+    def __timestamps(config: ConfigurationManager, positions: np.ndarray) -> pd.DatetimeIndex:
+        """
+            builds the timestamps of some points of a time series of fixed frequency
+        Args:
+            config (ConfigurationManager): the configuration of the time series.
+            positions (np.ndarray): the positions of the points.
 
-        noise = np.zeros_like(self.__time_series)
-        for i in range(len(self.__time_series)):
-            noise[i] = np.random.normal(0, abs(self.__time_series[i]) * noise_level) if noise_level > 0 else 0
-        return pd.Series((self.__time_series + noise)[:, 0])
+        Returns:
+            (
+            pd.DatetimeIndex: the timestamps of the points.)
+        """
+        import pandas as pd
+        start = pd.Timestamp(config.start_date).value
+        step = TimeSeriesGenerator.__step(config).value
+        return pd.DatetimeIndex((start + np.asarray(positions, dtype=np.int64) * step).astype('datetime64[ns]'))
 
-    def __add_outliers(self) -> (pd.Series, np.ndarray):
+    @staticmethod
+    def __bound_positions(config: ConfigurationManager, num_points: int) -> np.ndarray:
         """
-            Adds outliers to the time series
+            finds the points that can hold the minimum or the maximum of the components of a time series. The
+            seasonal waves only depend on the hour of the week and the quarter, and the trend is monotonic, so over
+            each quarter the extremes are at the first or the last point of an hour of the week. When the step is
+            at most an hour every hour of the week is met within a week of the boundaries of a quarter, and its
+            first and last points are found from the hour boundaries, else they are among the first and last
+            period points of the quarter (the least common multiple of the step and a week), which is then short.
+        Args:
+            config (ConfigurationManager): the configuration of the time series.
+            num_points (int): the number of points of the time series.
+
         Returns:
             (
-            pd.Series: the time series with added outliers.
-            np.ndarray: a mask indicating whether each point is an outlier or not.)
+            np.ndarray: the positions of the candidate points, increasing.)
         """
-        num_outliers = int(len(self.__time_series) * self.__config_manager.percentage_outliers)
-        outlier_indices = np.random.choice(len(self.__time_series), num_outliers, replace=False)
-        data_with_outliers = self.__time_series.copy()
-        outliers = np.random.uniform(-1, 1, num_outliers)
-        anomaly_mask = np.zeros(len(data_with_outliers), dtype=bool)
-        if len(outliers) > 0:
-            data_with_outliers[outlier_indices] = outliers
-            anomaly_mask[outlier_indices] = True
+        import pandas as pd
+        start, step = pd.Timestamp(config.start_date), TimeSeriesGenerator.__step(config)
+        quarters = pd.date_range(start=start, end=start + (num_points - 1) * step, freq='QS')
+        boundaries = np.unique([0, num_points] + [-((start - quarter) // step) for quarter in quarters])
+        hour, week = pd.Timedelta(hours=1).value, pd.Timedelta(weeks=1).value
+        positions = []
+        for first, last in zip(boundaries[:-1], boundaries[1:]):
+            if step.value <= hour:
+                # the first point of each hour starting within a week after the first point of the quarter and
+                # the last point of each hour ending within a week before its last point
+                first_time, last_time = start.value + first * step.value, start.value + (last - 1) * step.value
+                ends = np.arange(last_time - week + hour - (last_time - week) % hour, last_time + 1, hour)
+                starts = np.arange(first_time + hour - first_time % hour, first_time + week + 1, hour)
+                candidates = np.concatenate([[first, last - 1], first - (first_time - starts) // step.value,
+                                             first - (first_time - ends) // step.value - 1])
+                positions.append(candidates[(candidates >= first) & (candidates < last)])
+            else:
+                period = math.lcm(step.value, week) // step.value
+                positions += [np.arange(first, min(first + period, last)), np.arange(max(last - period, first), last)]
+        return np.unique(np.concatenate(positions)).astype(np.int64)
 
-        return data_with_outliers, anomaly_mask
+    def __combine_rows(self, configs: list, rngs: list, features: TimeFeatures, time_series: np.ndarray,
+                       scratch: np.ndarray = None, range_key=None) -> None:
+        """
+            combines the components of the registry for a group of time series sharing the same timestamps, in
+            place, one row per time series
+        Args:
+            configs (list): the configuration snapshots of the time series.
+            rngs (list): the randomness of each time series.
+            features (TimeFeatures): the features of the points to compute.
+            time_series (np.ndarray): the (number of series, number of points) matrix to fill.
+            scratch (np.ndarray): a matrix of the same shape for the components of each time series, allocated
+                when needed if not given.
+            range_key: the key of the timestamps in the component cache, the shared components are not cached
+                without it.
+        """
+        def column(values, dtype=float):
+            return np.array(values, dtype=dtype)[:, None]
 
-    def __add_missing_values(self, percentage_missing=0.05) -> pd.Series:
+        multiplicative = column([config.data_type_code == DataType.MULTIPLICATIVE for config in configs], bool)
+        # components that do not exist are the identity of the combination, except for the untyped ("") series
+        absent = column([config.data_type_code != DataType.ADDITIVE for config in configs])
+
+        # the combination starts from its identity, 1 for the multiplicative series and 0 for the others
+        time_series[...] = multiplicative
+
+        for component in self.__registry:
+            exists = column([component.enabled(config) for config in configs], bool)
+            if exists.any():
+                if component.shared:
+                    values = self.__cache.get((component.name, *range_key), lambda: component.function(features)) \
+                        if range_key is not None else component.function(features)
+                else:
+                    scratch = np.empty_like(time_series) if scratch is None else scratch
+                    values = component.function(features, configs, rngs, scratch)
+                np.add(time_series, values, out=time_series, where=exists & ~multiplicative)
+                if (exists & multiplicative).any():
+                    np.multiply(time_series, values + component.multiplicative_offset
+                                if component.multiplicative_offset else values,
+                                out=time_series, where=exists & multiplicative)
+            np.add(time_series, absent, out=time_series, where=~exists & ~multiplicative)
+
+    def __series_bounds(self, configs: list, rngs: list, num_points: int,
+                        chunk_size: int = 100000) -> (np.ndarray, np.ndarray):
         """
-            Removes some data points to simulate missing values
+            finds the minimum and the maximum of the components of a group of time series sharing the same
+            timestamps, from the points found by __bound_positions only when all their components allow it,
+            else from all the points, chunk by chunk
         Args:
-            percentage_missing: the percentage of the data points to be removed
+            configs (list): the configuration snapshots of the time series.
+            rngs (list): the randomness of each time series.
+            num_points (int): the number of points of the time series.
+            chunk_size (int): the number of points computed at a time when all the points are.
 
         Returns:
             (
-            pd.Series: the time series with simulated missing values.)
+            np.ndarray: the minimum of each time series, shaped (number of series, 1).
+            np.ndarray: the maximum of each time series, shaped (number of series, 1).)
         """
-        num_missing = int(len(self.__time_series) * percentage_missing)
-        missing_indices = np.random.choice(len(self.__time_series), size=num_missing, replace=False)
+        enabled = [tuple(component for component in self.__registry if component.enabled(config))
+                   for config in configs]
+        boundary_extremes = all(component.boundary_extremes for components in enabled for component in components)
 
-        data_with_missing = self.__time_series.copy()
-        data_with_missing[missing_indices] = np.nan
+        def compute():
+            if boundary_extremes:
+                positions = self.__bound_positions(configs[0], num_points)
+                features = [TimeFeatures(self.__timestamps(configs[0], positions), num_points, positions=positions)]
+            else:
+                # every point is computed, one chunk at a time so that the memory does not grow with the duration
+                date_range = self.__build_date_range(configs[0])
+                features = (TimeFeatures(date_range[first_point:first_point + chunk_size], num_points, first_point)
+                            for first_point in range(0, num_points, chunk_size))
+            bounds = np.full((len(configs), 1), np.inf), np.full((len(configs), 1), -np.inf)
+            for chunk_features in features:
+                values = np.empty((len(configs), len(chunk_features)))
+                self.__combine_rows(configs, rngs, chunk_features, values)
+                np.minimum(bounds[0], values.min(axis=1, keepdims=True), out=bounds[0])
+                np.maximum(bounds[1], values.max(axis=1, keepdims=True), out=bounds[1])
+            return bounds
 
-        return data_with_missing
+        if not boundary_extremes:
+            return compute()
+        # the bounds only depend on the components, so the windows of a time series share them
+        components = tuple((config.data_type_code, tuple(component.name for component in components),
+                            rng.slope() if any(not component.shared for component in components) else None)
+                           for config, rng, components in zip(configs, rngs, enabled))
+        return self.__cache.get(('bounds', configs[0].start_date, configs[0].duration, configs[0].frequency,
+                                 components), compute)
 
-    def generate_time_series(self) -> (pd.Series, pd.DatetimeIndex, np.ndarray):
+    def __generate_batch_group(self, configs: list, rngs: list, first_point: int = 0, last_point: int = None,
+                               bounds: tuple = None) -> (np.ndarray, TimestampRange, np.ndarray):
         """
-            Generates a time series.
+            Generates a group of time series sharing the same start date, duration and frequency as one matrix,
+            or the same window of each of them. Each time series draws its randomness from its own CounterRNG,
+            so a time series does not depend on the others of its group, and a window holds exactly the points
+            the whole time series has at its positions.
+        Args:
+            configs (list): the configuration snapshots of the time series in the group.
+            rngs (list): the randomness of each time series of the group.
+            first_point (int): the position of the first point of the window.
+            last_point (int): the position after the last point of the window, None for the whole time series.
+            bounds (tuple): the minimum and maximum of each time series, as returned by __series_bounds, found
+                from the time series itself or by __series_bounds when not given.
+
+        Returns:
+            (
+            np.ndarray: the generated time series, shaped (number of series, number of points).
+            TimestampRange: the timestamps shared by all the time series of the group.
+            np.ndarray: indicates whether each data point of each time series is an anomaly or not.)
+        """
+        range_key = (configs[0].start_date, configs[0].duration, configs[0].frequency)
+        whole = first_point == 0 and last_point is None
+        with profile_stage(self.__profiler, 'batch_date_range') as record:
+            if whole:
+                date_range = self.__cache.get(('date_range', *range_key),
+                                              lambda: self.__build_date_range(configs[0]))
+                num_points = last_point = len(date_range)
+            else:
+                num_points = self.series_length(configs[0])
+                last_point = num_points if last_point is None else min(max(last_point, 0), num_points)
+                first_point = min(max(first_point, 0), last_point)
+                date_range = self.__build_date_range(configs[0])[first_point:last_point]
+            record['points'] = len(date_range)
+        num_series, width = len(configs), last_point - first_point
+        group_points = num_series * width
+
+        # the whole group is built in place in one buffer, with one scratch matrix for the intermediate values
+        with profile_stage(self.__profiler, 'batch_components', group_points):
+            time_series = np.empty((num_series, width))
+            scratch = np.empty_like(time_series)
+            self.__combine_rows(configs, rngs, TimeFeatures(date_range, num_points, first_point), time_series,
+                                scratch, range_key if whole else None)
+
+        with profile_stage(self.__profiler, 'batch_scaling', group_points):
+            if bounds is None:
+                bounds = (time_series.min(axis=1, keepdims=True), time_series.max(axis=1, keepdims=True)) if whole \
+                    else self.__series_bounds(configs, rngs, num_points)
+            self.__min_max_scale(time_series, *bounds)
+
+        # as in __add_noise, the symmetric standard normal draw is scaled by the value itself
+        with profile_stage(self.__profiler, 'batch_noise', group_points):
+            noise_scales = np.array([NoiseLevel(config.noise_level_code).scale for config in configs])
+            for row, (noise_scale, rng) in enumerate(zip(noise_scales, rngs)):
+                if noise_scale > 0:
+                    rng.standard_normal(first_point, last_point, out=scratch[row])
+                else:
+                    scratch[row] = 0
+            scratch *= noise_scales[:, None]
+            scratch *= time_series
+            time_series += scratch
+
+        with profile_stage(self.__profiler, 'batch_anomaly_positions', group_points):
+            num_outliers = (num_points * np.array([config.percentage_outliers for config in configs])).astype(int)
+            num_missing = (num_points * np.array([config.percentage_missing for config in configs])).astype(int)
+            outlier_indices, missing_indices = self.__sampler.sample_rows(
+                num_points, np.column_stack([num_outliers, num_missing]), rngs, first_point, last_point)
+
+        # the positions index the flattened matrix, which is a view as the matrix is contiguous; the value of an
+        # outlier is drawn from its position in its time series
+        with profile_stage(self.__profiler, 'batch_outliers', group_points):
+            rows, columns = np.divmod(outlier_indices, max(width, 1))
+            row_starts = np.searchsorted(rows, np.arange(num_series + 1))
+            time_series.reshape(-1)[outlier_indices] = np.concatenate(
+                [rng.uniform(columns[start:stop] + first_point, -1, 1)
+                 for rng, start, stop in zip(rngs, row_starts[:-1], row_starts[1:])])
+            anomaly_mask = self.__sampler.to_mask(outlier_indices, time_series.shape)
+
+        with profile_stage(self.__profiler, 'batch_missing_values', group_points):
+            time_series.reshape(-1)[missing_indices] = np.nan
+
+        return time_series, date_range, anomaly_mask
+
+    def generate_components(self, configs: list, rngs: list) -> (np.ndarray, TimestampRange):
+        """
+            Combines the components of a group of time series sharing the same start date, duration and frequency,
+            before their scaling, noise and anomalies, e.g. to mix them into the channels of a multivariate time
+            series
+        Args:
+            configs (list): the configuration snapshots of the time series in the group.
+            rngs (list): the randomness of each time series of the group, which draws the slope of its trend.
+
+        Returns:
+            (
+            np.ndarray: the unscaled time series, shaped (number of series, number of points).
+            TimestampRange: the timestamps shared by all the time series of the group.)
+        """
+        range_key = (configs[0].start_date, configs[0].duration, configs[0].frequency)
+        date_range = self.__cache.get(('date_range', *range_key), lambda: self.__build_date_range(configs[0]))
+        time_series = np.empty((len(configs), len(date_range)))
+        self.__combine_rows(configs, rngs, TimeFeatures(date_range, len(date_range)), time_series,
+                            range_key=range_key)
+        return time_series, date_range
+
+    def generate_time_series_window(self, first_point: int, last_point: int, config=None,
+                                    seed=None) -> (pd.Series, TimestampRange, np.ndarray):
+        """
+            Generates the points first_point to last_point (excluded) of a time series without generating the
+            points before them. Besides the window, only the bounds of the time series are computed, from a few
+            hundred points per quarter when all its components have boundary_extremes, else from all its points,
+            a chunk at a time. The window is exactly the same range of the time series generate_batch gives with the
+            same configuration and seed. Only fixed frequencies (days, hours, minutes...) are supported.
+        Args:
+            first_point (int): the position of the first point of the window.
+            last_point (int): the position after the last point of the window, clipped to the time series.
+            config: the configuration of the time series, e.g. a SeriesConfig, the current configuration of the
+                configuration manager by default.
+            seed: the seed of the time series, drawn from the generator of this TimeSeriesGenerator by default.
 
         Returns:
 
         (
-            pd.Series: the generated time series.
-            pd.DatetimeIndex: the timestamps of each data point in the time series.
-            np.ndarray: indicates whether each data point is an anomaly or not.
+            pd.Series: the points of the window.
+            TimestampRange: the timestamps of the points of the window.
+            np.ndarray: indicates whether each point of the window is an anomaly or not.
         )
         """
-        self.__generate_data_range()
-        if self.__config_manager.data_type == "multiplicative":
-            self.__time_series = (self.__add_daily_seasonality() * self.__add_weekly_seasonality() *
-                                  self.__add_trend() * self.__add_cycles())
-        else:
-            self.__time_series = (self.__add_daily_seasonality() + self.__add_weekly_seasonality() +
-                                  self.__add_trend() + self.__add_cycles())
-
-        scaler = MinMaxScaler(feature_range=(-1, 1))
-        self.__time_series = scaler.fit_transform(self.__time_series.values.reshape(-1, 1))
-        self.__time_series = self.__add_noise()
-        self.__time_series, self.__anomaly_mask = self.__add_outliers()
-        self.__time_series = self.__add_missing_values()
-        return self.__time_series, self.__date_range, self.__anomaly_mask
+        import pandas as pd
+        config = self.__config_manager.snapshot() if config is None else config
+        rng = CounterRNG(seed) if seed is not None else CounterRNG.from_generator(self.__rng)
+        time_series, date_range, anomaly_mask = self.__generate_batch_group([config], [rng], first_point, last_point)
+        return pd.Series(time_series[0], copy=False), date_range, anomaly_mask[0]
+
+    @staticmethod
+    def series_seed(seed: int, series_num: int) -> np.random.SeedSequence:
+        """
+            derives the seed of a time series from the seed of a corpus
+        Args:
+            seed (int): the seed of the corpus.
+            series_num (int): the position of the time series in the corpus.
+
+        Returns:
+            (
+            np.random.SeedSequence: the time series' child of the corpus seed sequence.)
+        """
+        return np.random.SeedSequence(seed, spawn_key=(series_num,))
+
+    def iter_batch(self, n: int, plan: ConfigurationPlan = None, seeds: list = None):
+        """
+            Generates n time series like generate_batch, but yields each group as soon as it is computed so that
+            it can be consumed while the next group is generated. The configurations of all n time series are
+            drawn before the first group is yielded, or taken from a plan, in which case the configuration
+            manager is left untouched.
+        Args:
+            n (int): the number of time series to generate.
+            plan (ConfigurationPlan): the configurations of the time series, at least n of them.
+            seeds (list): the seed of each time series, they are drawn from the generator of this
+                TimeSeriesGenerator by default.
+
+        Returns:
+            (
+            generator: yields a (series_ids, time_series, date_range, anomaly_mask, configs) tuple for each group,
+                as described in generate_batch.)
+        """
+        rngs = [CounterRNG(seed) for seed in seeds] if seeds is not None \
+            else [CounterRNG.from_generator(self.__rng) for _ in range(n)]
+        groups = {}
+        for series_id in range(n):
+            if plan is not None:
+                config = plan.config(series_id)
+            else:
+                config = self.__config_manager.snapshot()
+                self.__config_manager.configure()
+            groups.setdefault((config.start_date, config.duration, config.frequency), []).append((series_id, config))
+
+        for members in groups.values():
+            series_ids = np.array([series_id for series_id, _ in members])
+            configs = [config for _, config in members]
+            time_series, date_range, anomaly_mask = self.__generate_batch_group(configs, [rngs[i] for i in series_ids])
+            yield series_ids, time_series, date_range, anomaly_mask, configs
+
+    def generate_batch(self, n: int, plan: ConfigurationPlan = None, seeds: list = None) -> list:
+        """
+            Generates n time series, computing the ones that share the same start date, duration and frequency
+            together as (number of series x number of points) matrices. The configuration manager is
+            re-configured after each time series, exactly like a loop over generate_time_series would, unless
+            the configurations are taken from a plan.
+        Args:
+            n (int): the number of time series to generate.
+            plan (ConfigurationPlan): the configurations of the time series, at least n of them.
+            seeds (list): the seed of each time series, they are drawn from the generator of this
+                TimeSeriesGenerator by default.
+
+        Returns:
+            (
+            list: a (series_ids, time_series, date_range, anomaly_mask, configs) tuple for each group, where
+                series_ids (np.ndarray) are the positions of the group's series among the n generated,
+                time_series (np.ndarray) and anomaly_mask (np.ndarray) have one row per series, date_range
+                (TimestampRange) is shared by the group and configs (list) holds the configuration of each row.)
+        """
+        return list(self.iter_batch(n, plan, seeds))
@@ -0,0 +1,240 @@
+from __future__ import annotations
+import numpy as np
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NANOSECONDS_PER_HOUR = 3600 * 10 ** 9
+NANOSECONDS_PER_DAY = 24 * NANOSECONDS_PER_HOUR
+
+
+class TimestampRange:
+    """
+        The timestamps of a time series of fixed frequency, described by their start, step and length instead of
+        being stored: a DatetimeIndex takes 8 bytes per point, a TimestampRange a few scalars whatever its length.
+        The timestamps are only computed when asked for, as epoch nanoseconds (asi8), datetime64 values (NumPy
+        array protocol) or a pd.DatetimeIndex (to_index), and the calendar features the components need (hour,
+        day of the week, month, quarter) are computed directly from the epoch nanoseconds.
+        Indexing a point gives its pd.Timestamp and slicing gives another TimestampRange.
+    """
+    __slots__ = ('__start', '__step', '__length')
+
+    def __init__(self, start, step, length: int):
+        """
+        Args:
+            start: the first timestamp, anything pd.Timestamp accepts.
+            step: the time between two points, a frequency string such as "10T" or anything pd.Timedelta accepts.
+            length (int): the number of points.
+        """
+        import pandas as pd
+        from pandas.tseries.frequencies import to_offset
+        self.__start = pd.Timestamp(start)
+        self.__step = pd.Timedelta(to_offset(step)) if isinstance(step, str) else pd.Timedelta(step)
+        if self.__step <= pd.Timedelta(0):
+            raise ValueError("The step of a TimestampRange must be positive")
+        self.__length = max(int(length), 0)
+
+    @classmethod
+    def from_index(cls, date_range: pd.DatetimeIndex) -> 'TimestampRange':
+        """
+            Describes evenly spaced timestamps by their start, step and length
+        Args:
+            date_range (pd.DatetimeIndex): the timestamps, at least two of them, evenly spaced.
+
+        Returns:
+            (
+            TimestampRange: the same timestamps.)
+        """
+        values = np.asarray(date_range.asi8)
+        steps = np.diff(values)
+        if len(values) < 2 or steps[0] <= 0 or (steps != steps[0]).any():
+            raise ValueError("Only at least two evenly spaced timestamps can be described as a TimestampRange")
+        return cls(date_range[0], int(steps[0]), len(values))
+
+    @property
+    def start(self):
+        return self.__start
+
+    @property
+    def step(self):
+        return self.__step
+
+    @property
+    def freq(self) -> str:
+        """
+            the step as a frequency string, e.g. "10min", which TimestampRange accepts back as its step
+        """
+        from pandas.tseries.frequencies import to_offset
+        return to_offset(self.__step).freqstr
+
+    @property
+    def end(self):
+        """
+            the last timestamp, None when the range is empty
+        """
+        return self.__start + (self.__length - 1) * self.__step if self.__length > 0 else None
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __repr__(self) -> str:
+        return f"TimestampRange(start='{self.__start}', step='{self.__step}', length={self.__length})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TimestampRange):
+            return NotImplemented
+        if self.__length == 0 or other.__length == 0:
+            return self.__length == other.__length
+        return (self.__start, self.__length) == (other.__start, other.__length) \
+            and (self.__length == 1 or self.__step == other.__step)
+
+    def __hash__(self) -> int:
+        # hashed as compared: all the empty ranges are equal, and the step of a single point does not matter
+        if self.__length == 0:
+            return hash(0)
+        return hash((self.__start, self.__length) if self.__length == 1 else (self.__start, self.__step, self.__length))
+
+    def __getitem__(self, key):
+        """
+            Returns the timestamp of a point, or the TimestampRange of a slice of the points with a positive step
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.__length)
+            if step < 1:
+                raise ValueError("A TimestampRange can only be sliced with a positive step")
+            return TimestampRange(self.__start + start * self.__step, step * self.__step,
+                                  len(range(start, stop, step)))
+        position = int(key)
+        if not -self.__length <= position < self.__length:
+            raise IndexError(f"Point {position} is out of a TimestampRange of {self.__length}")
+        return self.__start + (position % self.__length) * self.__step
+
+    @property
+    def asi8(self) -> np.ndarray:
+        """
+            the timestamps as epoch nanoseconds, computed on each access
+        """
+        values = np.arange(self.__length, dtype=np.int64)
+        values *= self.__step.value
+        values += self.__start.value
+        return values
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.asi8.view('datetime64[ns]')
+        return values if dtype is None else values.astype(dtype)
+
+    def to_numpy(self) -> np.ndarray:
+        """
+            Computes the timestamps as datetime64[ns] values
+
+        Returns:
+            (
+            np.ndarray: the timestamps.)
+        """
+        return np.asarray(self)
+
+    def to_index(self) -> pd.DatetimeIndex:
+        """
+            Computes the timestamps as a DatetimeIndex
+
+        Returns:
+            (
+            pd.DatetimeIndex: the timestamps.)
+        """
+        import pandas as pd
+        return pd.DatetimeIndex(self.to_numpy())
+
+    def searchsorted(self, timestamp) -> int:
+        """
+            Finds the position of the first point at or after a timestamp, without computing the timestamps
+        Args:
+            timestamp: the timestamp, anything pd.Timestamp accepts.
+
+        Returns:
+            (
+            int: the position, between 0 and the length of the range.)
+        """
+        import pandas as pd
+        offset = pd.Timestamp(timestamp) - self.__start
+        return min(max(-(-offset // self.__step), 0), self.__length)
+
+    @property
+    def hour(self) -> np.ndarray:
+        """
+            the hour of each timestamp
+        """
+        return self.asi8 // NANOSECONDS_PER_HOUR % 24
+
+    @property
+    def dayofweek(self) -> np.ndarray:
+        """
+            the day of the week of each timestamp, Monday being 0 (the epoch was a Thursday)
+        """
+        return (self.asi8 // NANOSECONDS_PER_DAY + 3) % 7
+
+    @property
+    def month(self) -> np.ndarray:
+        """
+            the month of each timestamp, from 1 to 12
+        """
+        return self.asi8.view('datetime64[ns]').astype('datetime64[M]').astype(np.int64) % 12 + 1
+
+    @property
+    def quarter(self) -> np.ndarray:
+        """
+            the quarter of each timestamp, from 1 to 4
+        """
+        return (self.month - 1) // 3 + 1
+
+
+def to_datetime_index(timestamps) -> pd.DatetimeIndex:
+    """
+        Returns timestamps as a pd.DatetimeIndex, computing them if they are a TimestampRange
+    Args:
+        timestamps: a TimestampRange, a pd.DatetimeIndex or an array of datetime64 values.
+
+    Returns:
+        (
+        pd.DatetimeIndex: the timestamps.)
+    """
+    import pandas as pd
+    if isinstance(timestamps, TimestampRange):
+        return timestamps.to_index()
+    return pd.DatetimeIndex(timestamps)
+
+
+def to_timestamp_range(timestamps) -> TimestampRange:
+    """
+        Returns timestamps as a TimestampRange, describing them by their start, step and length if they are stored
+    Args:
+        timestamps: a TimestampRange, or a pd.DatetimeIndex of at least two evenly spaced timestamps.
+
+    Returns:
+        (
+        TimestampRange: the timestamps.)
+    """
+    return timestamps if isinstance(timestamps, TimestampRange) else TimestampRange.from_index(timestamps)
+
+
+def concat_timestamps(chunks: list) -> TimestampRange | pd.DatetimeIndex:
+    """
+        Puts the timestamps of consecutive chunks of a time series together, as a TimestampRange when every chunk
+        is a TimestampRange continuing the previous one
+    Args:
+        chunks (list): the timestamps of each chunk.
+
+    Returns:
+        (
+        TimestampRange | pd.DatetimeIndex: the timestamps of the chunks.)
+    """
+    import pandas as pd
+    chunks = [chunk for chunk in chunks if len(chunk) > 0]
+    if chunks and all(isinstance(chunk, TimestampRange) for chunk in chunks):
+        first = chunks[0]
+        length = sum(len(chunk) for chunk in chunks)
+        if all(chunk.start == first.start + offset * first.step and (len(chunk) == 1 or chunk.step == first.step)
+               for chunk, offset in zip(chunks, np.cumsum([0] + [len(chunk) for chunk in chunks[:-1]]).tolist())):
+            return TimestampRange(first.start, first.step, length)
+    return pd.DatetimeIndex(np.concatenate([np.asarray(chunk, dtype='datetime64[ns]') for chunk in chunks])) \
+        if chunks else pd.DatetimeIndex([])
@@ -1,14 +1,27 @@
-import random
-from datetime import datetime
 from configuration_manager import ConfigurationManager
+from configuration_plan import ConfigurationPlan, SeriesConfig, FIELDS
 import yaml
 
 
 class YAMLConfigurationManager(ConfigurationManager):
 
-    def __init__(self):
+    def __init__(self, config_path: str = "config.yaml", datasets_num: int = None):
+        """
+        Args:
+            config_path (str): the path of the YAML configuration file.
+            datasets_num (int): the number of datasets to generate, instead of the datasets_num of the file.
+        """
         super().__init__()
+        self.__config_path = config_path
+        self.__datasets_num = datasets_num
         self.__yaml_data = None
+        self.__plan = None
+        self.__position = 0
+        self.__current = None
+
+    @property
+    def config_path(self):
+        return self.__config_path
 
     @property
     def yaml_data(self):
@@ -17,26 +30,65 @@ class YAMLConfigurationManager(ConfigurationManager):
     @yaml_data.setter
     def yaml_data(self, value):
         self.__yaml_data = value
+        self.__plan = None
+
+    @property
+    def plan(self):
+        return self.__plan
+
+    @plan.setter
+    def plan(self, value: ConfigurationPlan):
+        self.__plan = value
+        self.__position = 0
+
+    @property
+    def position(self):
+        return self.__position
 
     def load_config(self):
         """
-            loads configuration options from config.yaml
+            loads configuration options from the configuration file, config.yaml by default
         """
-        with open("config.yaml", 'r') as file:
+        with open(self.__config_path, 'r') as file:
             self.__yaml_data = yaml.safe_load(file)
+        if self.__datasets_num is not None:
+            self.__yaml_data["datasets_num"] = self.__datasets_num
+        self.__plan = None
+
+    def compile_plan(self, num_series: int = None) -> ConfigurationPlan:
+        """
+            compiles config.yaml and draws the configurations of the next time series with the configuration
+            manager's generator, configure then goes through them
+        Args:
+            num_series (int): the number of configurations to draw, defaults to datasets_num.
+
+        Returns:
+            (
+            ConfigurationPlan: the configurations.)
+        """
+        self.plan = ConfigurationPlan.compile(self.__yaml_data, self._rng, num_series)
+        return self.__plan
 
     def configure(self):
         """
-            chooses the configuration to be used for the generation of a time series
-        """
-        self._start_date = datetime.strptime(self.__yaml_data['start_date'], "%d-%m-%Y")
-        self._duration = random.choice(self.__yaml_data['data_sizes'])
-        self._frequency = random.choice(self.__yaml_data['frequencies'])
-        self._daily_seasonality = random.choice(self.__yaml_data['daily_seasonality_options'])
-        self._weekly_seasonality = random.choice(self.__yaml_data['weekly_seasonality_options'])
-        self._noise_level = random.choice(self.__yaml_data['noise_levels'])
-        self._trend_level = random.choice(self.__yaml_data['trend_levels'])
-        self._cyclic_period = random.choice(self.__yaml_data['cyclic_periods'])
-        self._data_type = random.choice(self.__yaml_data["data_types"])
-        self._percentage_outliers = random.choice(self.__yaml_data["percentage_outliers_options"])
+            chooses the configuration to be used for the generation of a time series, the next one of the plan,
+            a new plan being compiled when there is none or it is exhausted
+        """
+        if self.__plan is None or self.__position >= len(self.__plan):
+            self.compile_plan()
+        self.__current = self.__plan.config(self.__position)
+        self.__position += 1
+        self._start_date = self.__current.start_date
+        for field in FIELDS:
+            setattr(self, f'_{field}', getattr(self.__current, field))
         self._datasets_num = self.__yaml_data["datasets_num"]
+
+    def snapshot(self) -> SeriesConfig:
+        """
+            returns the current configuration, which later calls to configure do not modify
+
+        Returns:
+            (
+            SeriesConfig: the current configuration.)
+        """
+        return self.__current if self.__current is not None else super().snapshot()